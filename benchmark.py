@@ -0,0 +1,405 @@
+from argparse import ArgumentParser, Namespace
+import json
+from os import environ
+import os
+import platform
+import socket
+import sys
+from tempfile import mkdtemp
+from time import monotonic, perf_counter, sleep, time
+from typing import Any, Callable
+
+
+def findFreePort() -> int:
+    """
+    로컬에서 사용할 수 있는 TCP 포트 번호.
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# 벤치마크는 항상 임시 캐시, 로컬 스텁 서버, 가상 포트를 사용하므로, 설정을 불러오기 전에 환경 변수를 정함.
+benchDir: str = mkdtemp(prefix="recyclehelper-bench-")
+stubPort: int = findFreePort()
+environ.update({
+    "CACHE_BACKEND": "sqlite",
+    "CACHE_PATH": os.path.join(benchDir, "crawl_cache.sqlite3"),
+    "LEGACY_CACHE_PATH": os.path.join(benchDir, "missing.json"),
+    "RESOLVER_BACKENDS": "http",
+    "PRODUCT_SEARCH_URL": f"http://127.0.0.1:{stubPort}/products/search",
+    "FOOD_SAFETY_API_URL": f"http://127.0.0.1:{stubPort}/api",
+    "FOOD_SAFETY_KR_API_KEY": "sample",
+    "SERIAL_PORT": os.path.join(benchDir, "scanner"),
+    "BLUETOOTH_PORTS": ",".join(
+        f"{name}={os.path.join(benchDir, f'bin-{name}')}" for name in ("NORMAL", "PAPER", "PLASTIC", "CAN", "GLASS")
+    ),
+    "BLUETOOTH_DEBOUNCE": "0",     # 분리수거함별 명령 수로 완료를 판단하므로, 같은 바코드를 연달아 스캔해도 명령을 모두 보냄.
+    "SCAN_DEADLINE": "0",          # 조회가 느려 대체 분리수거함을 연 명령이 완료로 집계되지 않도록 끝까지 기다림.
+    "PIPELINE_ENABLED": environ.get("PIPELINE_ENABLED", "0")
+})
+
+from models.barcode import withCheckDigit
+from models.material import classifyMaterial, Material, parseMaterial
+from models.product import LookupResult
+from models.response import LazyProductResponse, ProductResponse
+from sim.stub_server import StubServer, StubServices
+from storage.backend import CacheEntry
+from storage.compact_index import buildIndex, CompactIndex
+from storage.json_backend import JsonCacheBackend, loadJsonCache
+from storage.sqlite_backend import SqliteCacheBackend
+from utils import CachedBarcodeCrawler
+
+BenchResultsT = dict[str, dict[str, Any]]
+percentiles: tuple[int, ...] = (50, 90, 95, 99)
+sampleTexts: tuple[str, ...] = (   # 식품안전나라 API 응답에서 흔히 보이는 포장재질 표기
+    "폴리프로필렌(PP), 폴리에틸렌(PE)",
+    "PET",
+    "용기: 폴리프로필렌(PP), 뚜껑: 폴리에틸렌(PE)",
+    "종이, 폴리프로필렌",
+    "알루미늄 캔",
+    "유리병, 금속 뚜껑",
+    "내포장: PE, 외포장: 종이박스",
+    "",
+    "해당없음",
+    "OTHER(PET/AL/PE)"
+)
+
+
+def summarize(samples: list[float], **extra: Any) -> dict[str, Any]:
+    """측정값(초) 목록을 밀리초 단위의 요약 통계로 정리합니다.
+
+    Args:
+        samples (list[float]): 측정값 목록. 단위는 초.
+        extra (Any): 결과에 함께 기록할 값.
+
+    Returns:
+        dict[str, Any]: 표본 수, 평균, 백분위수, 최대 값. 표본이 없으면 표본 수만 기록합니다.
+    """
+    if not samples:
+        return {"unit": "ms", "n": 0, **extra}
+    ordered: list[float] = sorted(samples)
+    result: dict[str, Any] = {"unit": "ms", "n": len(ordered), "mean": sum(ordered) / len(ordered) * 1000}
+    for p in percentiles:
+        rank: int = max(1, -(-p * len(ordered) // 100))     # nearest-rank
+        result[f"p{p}"] = ordered[rank - 1] * 1000
+    result["max"] = ordered[-1] * 1000
+    result.update(extra)
+    return result
+
+
+def timeBatches(fn: Callable[[], Any], iterations: int, batch: int) -> tuple[list[float], float]:
+    """아주 짧은 호출을 batch 번씩 묶어 재고, 호출 한 번의 평균 시간을 표본으로 삼습니다.
+
+    Args:
+        fn (Callable[[], Any]): 잴 함수.
+        iterations (int): 전체 호출 횟수.
+        batch (int): 한 번에 묶어 잴 호출 횟수.
+
+    Returns:
+        tuple[list[float], float]: (호출 한 번의 시간 표본 목록, 초당 호출 수)
+    """
+    samples: list[float] = []
+    total: float = 0.0
+    for _ in range(max(1, iterations // batch)):
+        started: float = perf_counter()
+        for _ in range(batch):
+            fn()
+        elapsed: float = perf_counter() - started
+        samples.append(elapsed / batch)
+        total += elapsed
+    return samples, len(samples) * batch / total if total else 0.0
+
+
+def syntheticProducts(services: StubServices, start: int, count: int) -> list[tuple[str, Material]]:
+    """스텁 서버에 가상의 상품을 추가합니다. 서버는 추가된 상품에 바로 응답합니다.
+
+    Args:
+        services (StubServices): 스텁 서버의 데이터.
+        start (int): 가상 바코드 번호의 시작 값. 벤치마크마다 겹치지 않게 정합니다.
+        count (int): 추가할 상품 수.
+
+    Returns:
+        list[tuple[str, Material]]: (바코드, 분류될 재질) 목록.
+    """
+    products: list[tuple[str, Material]] = []
+    for i in range(start, start + count):
+        barcode: str = withCheckDigit(f"880{i:09d}")
+        prdReportNo: str = f"{20000000000000 + i}"
+        text: str = sampleTexts[i % len(sampleTexts)]
+        services.products[barcode] = {"name": f"벤치마크 상품 {i}", "prdReportNos": [prdReportNo]}
+        services.i0030[prdReportNo] = [{
+            "PRDLST_REPORT_NO": prdReportNo, "PRDLST_NM": f"벤치마크 상품 {i}",
+            "FRMLC_MTRQLT": text, "LAST_UPDT_DTM": "2022-01-01 00:00:00"
+        }]
+        products.append((barcode, classifyMaterial(text)[0]))
+    return products
+
+
+def fullRow(text: str) -> dict[str, str]:
+    """
+    ProductResponse.from_json 에 넘길 수 있는, 모든 필드가 채워진 I0030 응답 행.
+    """
+    row: dict[str, str] = {
+        name: "" for name in (
+            "LCNS_NO", "BSSH_NM", "PRDLST_NM", "POG_DAYCNT", "DISPOS", "NTK_MTHD", "PRIMARY_FNCLTY",
+            "IFTKN_ATNT_MATR_CN", "CSTDY_MTHD", "PRDLST_CDNM", "STDR_STND", "HIENG_LNTRT_DVS_NM", "PRODUCTION",
+            "CHILD_CRTFC_YN", "PRDT_SHAP_CD_NM", "RAWMTRL_NM", "INDUTY_CD_NM", "INDIV_RAWMTRL_NM", "ETC_RAWMTRL_NM",
+            "CAP_RAWMTRL_NM"
+        )
+    }
+    row.update(PRDLST_REPORT_NO="20000000000001", PRMS_DT="20220101", FRMLC_MTRQLT=text, LAST_UPDT_DTM="2022-01-01 00:00:00")
+    return row
+
+
+def benchParseMaterial(args: Namespace, stub: StubServer) -> BenchResultsT:
+    """
+    재질 표기 분류(parseMaterial) 한 번의 시간과 처리량.
+    """
+    index: list[int] = [0]
+
+    def parseNext() -> None:
+        parseMaterial(sampleTexts[index[0] % len(sampleTexts)])
+        index[0] += 1
+
+    samples, opsPerSec = timeBatches(parseNext, args.iterations, 100)
+    return {"parse_material": summarize(samples, ops_per_sec=opsPerSec, texts=len(sampleTexts))}
+
+
+def benchFromJson(args: Namespace, stub: StubServer) -> BenchResultsT:
+    """
+    API 응답 행 하나를 ProductResponse로 변환하는 시간과, 재질 분류에 필요한 필드만 꺼내는 시간.
+    """
+    row: dict[str, str] = fullRow(sampleTexts[0])
+    full, fullOps = timeBatches(lambda: ProductResponse.from_json(**row), args.iterations, 100)
+    lazy, lazyOps = timeBatches(lambda: LazyProductResponse(row).frmlc_mtrqlt, args.iterations, 100)
+    return {
+        "product_from_json": summarize(full, ops_per_sec=fullOps),
+        "lazy_product_field": summarize(lazy, ops_per_sec=lazyOps)
+    }
+
+
+def benchCacheHit(args: Namespace, stub: StubServer) -> BenchResultsT:
+    """
+    캐시 적중 시 조회 시간. 메모리에 있는 경우와, 메모리에서 밀려나 저장소에서 읽는 경우를 따로 잽니다.
+    """
+    def crawlerMustNotRun(_, barcode: str) -> LookupResult:
+        raise AssertionError(f"캐시 적중 벤치마크에서 크롤링이 실행되었습니다: {barcode}")
+
+    backend: SqliteCacheBackend = SqliteCacheBackend(os.path.join(benchDir, "hit.sqlite3"))
+    crawler: CachedBarcodeCrawler = CachedBarcodeCrawler(crawlerMustNotRun, backend, maxEntries=args.iterations)
+    codes: list[str] = [withCheckDigit(f"881{i:09d}") for i in range(min(args.iterations, 1000))]
+    for code in codes:
+        crawler.put(code, LookupResult(Material.PLASTIC, "20000000000001", sampleTexts[0]))
+
+    memory: list[float] = []
+    stored: list[float] = []
+    for i in range(args.iterations):
+        code: str = codes[i % len(codes)]
+        crawler.cache.clear()
+        started: float = perf_counter()
+        crawler(code)       # 저장소에서 읽어 메모리에 올림.
+        stored.append(perf_counter() - started)
+        started = perf_counter()
+        crawler(code)
+        memory.append(perf_counter() - started)
+    backend.close()
+    return {"cache_hit_memory": summarize(memory), "cache_hit_backend": summarize(stored)}
+
+
+def benchCacheLoad(args: Namespace, stub: StubServer) -> BenchResultsT:
+    """
+    캐시 크기에 따른 저장소 여는 시간. json 파일 전체 읽기와, sqlite/색인 파일 열기/단건 조회, sqlite 전체 순회를 잽니다.
+    """
+    results: BenchResultsT = {}
+    for size in (int(s) for s in args.cache_sizes.split(",")):
+        jsonPath: str = os.path.join(benchDir, f"load-{size}.json")
+        sqlitePath: str = os.path.join(benchDir, f"load-{size}.sqlite3")
+        jsonBackend: JsonCacheBackend = JsonCacheBackend(jsonPath)
+        for i in range(size):
+            jsonBackend.put(f"882{i:010d}", CacheEntry(Material(i % len(Material)), time(), f"{20000000000000 + i}", sampleTexts[i % len(sampleTexts)]))
+        jsonBackend.close()
+        sqliteBackend: SqliteCacheBackend = SqliteCacheBackend(sqlitePath)
+        sqliteBackend.importJson(jsonPath)
+        indexPath: str = os.path.join(benchDir, f"load-{size}.idx")
+        buildIndex(sqliteBackend.items(), indexPath)
+        sqliteBackend.close()
+
+        loads: list[float] = []
+        opens: list[float] = []
+        scans: list[float] = []
+        gets: list[float] = []
+        indexOpens: list[float] = []
+        indexGets: list[float] = []
+        for _ in range(args.repeat):
+            started: float = perf_counter()
+            loadJsonCache(jsonPath)
+            loads.append(perf_counter() - started)
+
+            started = perf_counter()
+            backend: SqliteCacheBackend = SqliteCacheBackend(sqlitePath)
+            backend.open()
+            opens.append(perf_counter() - started)
+            for i in range(0, size, max(1, size // 100)):
+                started = perf_counter()
+                backend.get(f"882{i:010d}")
+                gets.append(perf_counter() - started)
+            started = perf_counter()
+            for _ in backend.entries():
+                pass
+            scans.append(perf_counter() - started)
+            backend.close()
+
+            started = perf_counter()
+            index: CompactIndex = CompactIndex(indexPath)
+            index.open()
+            indexOpens.append(perf_counter() - started)
+            for i in range(0, size, max(1, size // 100)):
+                started = perf_counter()
+                index.get(f"882{i:010d}")
+                indexGets.append(perf_counter() - started)
+            index.close()
+        results[f"cache_load_json_{size}"] = summarize(loads, entries=size)
+        results[f"cache_open_sqlite_{size}"] = summarize(opens, entries=size)
+        results[f"cache_get_sqlite_{size}"] = summarize(gets, entries=size)
+        results[f"cache_scan_sqlite_{size}"] = summarize(scans, entries=size)
+        results[f"cache_open_index_{size}"] = summarize(indexOpens, entries=size, file_bytes=os.path.getsize(indexPath))
+        results[f"cache_get_index_{size}"] = summarize(indexGets, entries=size)
+    return results
+
+
+def benchLookup(args: Namespace, stub: StubServer) -> BenchResultsT:
+    """
+    BarcodeHandler.search 의 캐시 미스(스텁 서버 조회 + 분류 + 캐시 기록)와 캐시 적중 시간.
+    """
+    from handlers.barcode_api import BarcodeHandler
+    products: list[tuple[str, Material]] = syntheticProducts(stub.services, 0, args.lookups)
+    barcode_api: BarcodeHandler = BarcodeHandler()
+    barcode_api.warmUp()
+    misses: list[float] = []
+    hits: list[float] = []
+    for samples in (misses, hits):
+        for barcode, expected in products:
+            started: float = perf_counter()
+            mat: Material = barcode_api.search(barcode)
+            samples.append(perf_counter() - started)
+            assert mat == expected, f"{barcode}: {mat.name} != {expected.name}"
+    barcode_api.teardown()
+    return {
+        "lookup_miss": summarize(misses, stub_latency=stub.services.latency),
+        "lookup_hit": summarize(hits)
+    }
+
+
+def benchScanToBin(args: Namespace, stub: StubServer) -> BenchResultsT:
+    """
+    시리얼로 바코드가 들어온 때부터 분리수거함 모듈이 열림 명령을 받을 때까지의 시간과 지속 처리량.
+    가상 스캐너/모듈을 연결한 BarcodeSearcher를 그대로 실행하고, 같은 바코드를 두 번 보내 캐시 미스/적중을 나눠 잽니다.
+    """
+    from threading import Thread
+    from program import BarcodeSearcher
+    from sim.devices import BinModuleSimulator, PtyLink, ScannerSimulator
+
+    products: list[tuple[str, Material]] = syntheticProducts(stub.services, 1_000_000, args.scans)
+    scannerLink: PtyLink = PtyLink(environ["SERIAL_PORT"])
+    bins: dict[Material, BinModuleSimulator] = {
+        mat: BinModuleSimulator(mat, PtyLink(os.path.join(benchDir, f"bin-{mat.name}")), latency=0.0)
+        for mat in Material
+    }
+    for module in bins.values():
+        module.start()
+    searcher: BarcodeSearcher = BarcodeSearcher()
+    Thread(target=searcher.run, name="bench-station", daemon=True).start()
+    for mat in Material:
+        searcher.bluetooth_handler.supervisor.waitConnected(mat, 10)
+
+    results: BenchResultsT = {}
+    for name in ("scan_to_bin_miss", "scan_to_bin_hit"):
+        received: dict[Material, int] = {mat: len(module.stats.receivedAt) for mat, module in bins.items()}
+        scanner: ScannerSimulator = ScannerSimulator(scannerLink, [(None, f"bc:{code}") for code, _ in products], args.scan_rate)
+        scanner.run()
+        deadline: float = monotonic() + args.timeout
+        while monotonic() < deadline and sum(
+            len(module.stats.receivedAt) - received[mat] for mat, module in bins.items()
+        ) < len(products):
+            sleep(0.05)
+        latencies: list[float] = []
+        lastAt: float = scanner.startedAt
+        seen: dict[Material, int] = dict(received)
+        for i, (_, mat) in enumerate(products):   # 분리수거함별로 j번째 명령은 그 재질로 분류될 j번째 바코드에 대한 것.
+            times: list[float] = bins[mat].stats.receivedAt
+            if seen[mat] < len(times):
+                latencies.append(times[seen[mat]] - scanner.sentAt[i])
+                lastAt = max(lastAt, times[seen[mat]])
+                seen[mat] += 1
+        window: float = lastAt - scanner.startedAt
+        results[name] = summarize(
+            latencies,
+            offered_rate=args.scan_rate,
+            scans_per_sec=len(latencies) / window if window > 0 else 0.0,
+            completed=len(latencies),
+            sent=len(products)
+        )
+    for module in bins.values():
+        module.stop()
+    return results
+
+
+benchmarks: dict[str, Callable[[Namespace, StubServer], BenchResultsT]] = {
+    "parse_material": benchParseMaterial,
+    "from_json": benchFromJson,
+    "cache_hit": benchCacheHit,
+    "cache_load": benchCacheLoad,
+    "lookup": benchLookup,
+    "scan_to_bin": benchScanToBin
+}
+
+
+def main():
+    """
+    스캔부터 분리수거함 열림까지 단계별 소요 시간을 재고, 백분위수를 json으로 출력하는 벤치마크 명령.
+    외부 서비스 대신 로컬 스텁 서버를, 실제 장치 대신 가상 포트를 사용합니다.
+    """
+    parser: ArgumentParser = ArgumentParser(description="단계별 소요 시간을 재서 json으로 출력합니다.")
+    parser.add_argument("--only", default=",".join(benchmarks), help=f"실행할 벤치마크 목록. ({', '.join(benchmarks)})")
+    parser.add_argument("--output", default=None, help="결과를 저장할 json 파일. 기본은 표준 출력")
+    parser.add_argument("--iterations", type=int, default=10000, help="짧은 연산을 반복할 횟수")
+    parser.add_argument("--repeat", type=int, default=5, help="캐시 불러오기를 반복할 횟수")
+    parser.add_argument("--cache-sizes", default="1000,10000,100000", help="캐시 불러오기 시간을 잴 항목 수 목록")
+    parser.add_argument("--lookups", type=int, default=50, help="캐시 미스 조회 횟수")
+    parser.add_argument("--scans", type=int, default=50, help="스캔부터 열림까지 잴 때 보낼 바코드 수")
+    parser.add_argument("--scan-rate", type=float, default=5.0, help="초당 바코드 입력 수. 0 이면 최대한 빠르게")
+    parser.add_argument("--timeout", type=float, default=60.0, help="보낸 바코드가 모두 처리되기를 기다리는 최대 시간(초)")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="스텁 서버의 평균 응답 지연(초)")
+    parser.add_argument("--seed", type=int, default=0, help="스텁 서버의 난수 시드")
+    args: Namespace = parser.parse_args()
+
+    from threading import Thread
+    stub: StubServer = StubServer(("127.0.0.1", stubPort), StubServices(latency=args.stub_latency, seed=args.seed))
+    Thread(target=stub.serve_forever, name="bench-stub", daemon=True).start()
+
+    results: BenchResultsT = {}
+    try:
+        for name in args.only.split(","):
+            print(f"[bench] {name}", file=sys.stderr)
+            results.update(benchmarks[name.strip()](args, stub))
+    finally:
+        stub.shutdown()
+        stub.server_close()
+    report: dict[str, Any] = {
+        "timestamp": time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": results
+    }
+    if args.output is None:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        with open(args.output, mode="wt", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from argparse import ArgumentParser, Namespace
+from time import monotonic
+
+from config import CACHE_BACKEND, CACHE_INDEX_PATH, CACHE_NEGATIVE, CACHE_NEGATIVE_TTL, CACHE_PATH, CACHE_POSITIVE_TTL, LEGACY_CACHE_PATH
+from models.material import Material, parseMaterials
+from storage.backend import CacheBackend
+from storage.compact_index import buildIndex
+from storage.sqlite_backend import SqliteCacheBackend
+from utils import createCacheBackend
+
+
+def importJson(args: Namespace) -> None:
+    """
+    기존 json 캐시 파일을 sqlite 저장소로 가져옵니다.
+    """
+    backend: SqliteCacheBackend = SqliteCacheBackend(args.path)
+    count: int = backend.importJson(args.json)
+    backend.close()
+    print(f"{args.json} 에서 {count}개 항목을 가져왔습니다.")
+
+
+def compact(args: Namespace) -> None:
+    """
+    유효 기간(CACHE_POSITIVE_TTL, CACHE_NEGATIVE_TTL)이 지난 항목과, CACHE_NEGATIVE를 끈 경우 조회 불가 결과를 지우고, 캐시 저장소의 불필요한 공간을 정리합니다.
+    """
+    backend: CacheBackend = createCacheBackend(args.backend, args.path)
+    removed: int = backend.compact(CACHE_POSITIVE_TTL, CACHE_NEGATIVE_TTL, CACHE_NEGATIVE)
+    backend.close()
+    print(f"만료된 항목 {removed}개를 지우고 캐시 저장소를 정리했습니다.")
+
+
+def stats(args: Namespace) -> None:
+    """
+    캐시 저장소의 항목 수를 출력합니다.
+    """
+    backend: CacheBackend = createCacheBackend(args.backend, args.path)
+    print(f"{args.path}: {len(backend)}개 항목")
+    backend.close()
+
+
+def buildIndexCmd(args: Namespace) -> None:
+    """
+    캐시 저장소의 조회 결과로 메모리 매핑용 색인 파일을 만듭니다.
+    """
+    backend: CacheBackend = createCacheBackend(args.backend, args.path)
+    started: float = monotonic()
+    count: int = buildIndex(backend.items(), args.output)
+    backend.close()
+    print(f"{monotonic() - started:.2f}초 동안 {count}개 항목으로 {args.output} 색인을 만들었습니다.")
+
+
+def reclassify(args: Namespace) -> None:
+    """
+    저장된 원본 포장재질 표기를 현재 분류 기준으로 다시 분류하고, 분류가 바뀐 바코드를 보고합니다.
+    """
+    backend: CacheBackend = createCacheBackend(args.backend, args.path)
+    started: float = monotonic()
+    barcodes: list[str] = []
+    oldMaterials: list[Material] = []
+    texts: list[str] = []
+    skipped: int = 0
+    for barcode, entry in backend.entries():
+        if entry.material is None:
+            continue    # 조회 불가 결과는 분류할 내용이 없음.
+        if entry.rawMaterial is None:
+            skipped += 1    # 원본 표기를 저장하기 전에 캐시된 항목.
+            continue
+        barcodes.append(barcode)
+        oldMaterials.append(entry.material)
+        texts.append(entry.rawMaterial)
+
+    changes: dict[str, Material] = {}
+    for barcode, old, new in zip(barcodes, oldMaterials, parseMaterials(texts)):
+        if old != new:
+            changes[barcode] = new
+            print(f"{barcode}: {old.name} -> {new.name}")
+
+    if not args.dry_run and changes:
+        backend.updateMaterials(changes)
+    backend.close()
+    print(
+        f"{monotonic() - started:.2f}초 동안 {len(texts)}개 항목을 재분류해 {len(changes)}개의 분류가 바뀌었습니다"
+        f"{' (저장하지 않음)' if args.dry_run else ''}. 원본 표기가 없어 건너뛴 항목: {skipped}개."
+    )
+
+
+def main():
+    """
+    캐시 관리 도구.
+    """
+    parser: ArgumentParser = ArgumentParser(description="바코드 캐시 저장소 관리 도구")
+    parser.add_argument("--path", default=CACHE_PATH, help="캐시 저장소 파일 경로")
+    parser.add_argument("--backend", default=CACHE_BACKEND, choices=("sqlite", "json", "remote"), help="캐시 저장소 종류")
+    commands = parser.add_subparsers(required=True)
+
+    importCmd = commands.add_parser("import-json", help="기존 json 캐시 파일을 sqlite 저장소로 가져옵니다.")
+    importCmd.add_argument("json", nargs="?", default=LEGACY_CACHE_PATH, help="가져올 json 캐시 파일 경로")
+    importCmd.set_defaults(func=importJson)
+
+    commands.add_parser("compact", help="만료된 항목을 지우고 캐시 저장소를 정리합니다.").set_defaults(func=compact)
+    commands.add_parser("stats", help="캐시 저장소의 항목 수를 출력합니다.").set_defaults(func=stats)
+
+    indexCmd = commands.add_parser("build-index", help="조회 결과로 제품 목록 색인 파일(CACHE_INDEX_PATH)을 만듭니다.")
+    indexCmd.add_argument("--output", default=CACHE_INDEX_PATH or "./catalog.idx", help="만들 색인 파일 경로")
+    indexCmd.set_defaults(func=buildIndexCmd)
+
+    reclassifyCmd = commands.add_parser("reclassify", help="저장된 원본 표기로 재질을 다시 분류합니다. 네트워크 조회는 하지 않습니다.")
+    reclassifyCmd.add_argument("--dry-run", action="store_true", help="바뀌는 항목만 보고하고 저장하지 않습니다.")
+    reclassifyCmd.set_defaults(func=reclassify)
+
+    args: Namespace = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
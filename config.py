@@ -0,0 +1,114 @@
+from os import environ
+from typing import Final
+
+
+def _env_int(name: str, default: int) -> int:
+    """환경 변수 값을 정수로 읽어옵니다. 값이 없으면 기본 값을 사용합니다.
+
+    Args:
+        name (str): 환경 변수 이름.
+        default (int): 환경 변수가 없을 때 사용할 기본 값.
+
+    Returns:
+        int: 환경 변수의 정수 값.
+    """
+    value: str | None = environ.get(name)
+    return default if value is None or value == "" else int(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """환경 변수 값을 참/거짓으로 읽어옵니다. "1", "true", "yes", "on" 을 참으로 취급합니다.
+
+    Args:
+        name (str): 환경 변수 이름.
+        default (bool): 환경 변수가 없을 때 사용할 기본 값.
+
+    Returns:
+        bool: 환경 변수의 참/거짓 값.
+    """
+    value: str | None = environ.get(name)
+    return default if value is None or value == "" else value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_ports(name: str, default: str) -> dict[str, str]:
+    """"재질 이름=포트 경로" 를 쉼표로 이어 적은 환경 변수 값을 읽어옵니다.
+
+    Args:
+        name (str): 환경 변수 이름.
+        default (str): 환경 변수가 없을 때 사용할 기본 값.
+
+    Returns:
+        dict[str, str]: 재질 이름 -> 포트 경로.
+    """
+    value: str = environ.get(name) or default
+    return {
+        mat.strip(): port.strip()
+        for mat, _, port in (item.partition("=") for item in value.split(",") if item.strip())
+    }
+
+
+# 바코드 스캐너 / 분리수거함 모듈 포트
+SERIAL_PORT: Final[str] = environ.get("SERIAL_PORT", "/dev/ttyUSB0")   # 바코드 스캐너가 연결된 시리얼 포트
+SERIAL_BAUDRATE: Final[int] = _env_int("SERIAL_BAUDRATE", 9600)
+SERIAL_TIMEOUT: Final[float] = float(environ.get("SERIAL_TIMEOUT", "0.5"))   # 스캐너 입력을 한 번 기다리는 최대 시간(초). 종료 요청을 확인하는 주기
+SERIAL_MAX_FRAME: Final[int] = _env_int("SERIAL_MAX_FRAME", 64)         # 프레임 하나의 최대 길이(바이트). 넘으면 잡음으로 보고 버림
+SERIAL_CHECKSUM: Final[bool] = _env_bool("SERIAL_CHECKSUM", False)      # 체크섬("*XX")이 없는 프레임도 버릴지 여부
+BLUETOOTH_PORTS: Final[dict[str, str]] = _env_ports("BLUETOOTH_PORTS", "")   # 시작할 때 연결할 모듈. 예) "NORMAL=/dev/rfcomm0,GLASS=/dev/rfcomm1"
+
+# 유통상품지식뱅크 크롤링
+PRODUCT_SEARCH_URL: Final[str] = environ.get("PRODUCT_SEARCH_URL", "http://www.allproductkorea.or.kr/products/search")
+PRODUCT_SEARCH_PARAM: Final[str] = environ.get("PRODUCT_SEARCH_PARAM", "q")    # HTTP 조회 시 검색어를 넘기는 쿼리 이름
+RESOLVER_BACKENDS: Final[list[str]] = environ.get("RESOLVER_BACKENDS", "http,playwright").split(",")   # 앞에서부터 시도, 실패하면 다음 방식으로
+PAGE_MAX_USES: Final[int] = _env_int("PAGE_MAX_USES", 50)         # 이 횟수만큼 사용한 페이지는 컨텍스트째 폐기 후 새로 생성
+CRAWL_TIMEOUT: Final[float] = float(environ.get("CRAWL_TIMEOUT", "10"))   # 페이지 요청, 브라우저 동작 하나의 제한 시간(초)
+
+# 바코드 조회 파이프라인
+PIPELINE_ENABLED: Final[bool] = _env_bool("PIPELINE_ENABLED", False)   # 시리얼 입력과 조회를 분리한 비동기 파이프라인 사용 여부
+PIPELINE_QUEUE_SIZE: Final[int] = _env_int("PIPELINE_QUEUE_SIZE", 16)  # 단계 사이 큐의 최대 길이
+CRAWL_WORKERS: Final[int] = _env_int("CRAWL_WORKERS", 2)               # 크롤링 단계 스레드 수 (스레드마다 브라우저 1개)
+API_WORKERS: Final[int] = _env_int("API_WORKERS", 4)                   # 식품안전나라 API 호출 단계 스레드 수
+PREWARM: Final[bool] = _env_bool("PREWARM", True)                      # 시리얼 입력 대기를 시작한 뒤 조회 자원을 백그라운드에서 미리 준비할지 여부
+SCAN_DEADLINE: Final[float] = float(environ.get("SCAN_DEADLINE", "3"))  # 스캔부터 분리수거함을 열 때까지 기다리는 최대 시간(초). 0 이면 조회가 끝날 때까지 기다림
+SCAN_FALLBACK: Final[str] = environ.get("SCAN_FALLBACK", "NORMAL")      # 시간 안에 조회하지 못했거나 조회 불가한 제품일 때 열 분리수거함
+
+# 바코드 캐시
+CACHE_BACKEND: Final[str] = environ.get("CACHE_BACKEND", "sqlite")                  # "sqlite", 기존 방식의 "json" 또는 캐시 서버를 함께 쓰는 "remote"
+CACHE_PATH: Final[str] = environ.get("CACHE_PATH", "./crawl_cache.sqlite3")
+LEGACY_CACHE_PATH: Final[str] = environ.get("LEGACY_CACHE_PATH", "./crawl_cache.json")   # sqlite 저장소를 처음 만들 때 가져올 파일
+CACHE_POSITIVE_TTL: Final[int] = _env_int("CACHE_POSITIVE_TTL", 30 * 24 * 60 * 60)   # 재질 조회 결과 유효 기간(초). 0 이면 만료되지 않음
+CACHE_NEGATIVE_TTL: Final[int] = _env_int("CACHE_NEGATIVE_TTL", 24 * 60 * 60)        # 조회 불가 결과 유효 기간(초). 0 이면 만료되지 않음
+CACHE_NEGATIVE: Final[bool] = _env_bool("CACHE_NEGATIVE", True)                       # 조회 불가 결과를 저장할지 여부. 끄면 매번 다시 크롤링함
+CACHE_MAX_ENTRIES: Final[int] = _env_int("CACHE_MAX_ENTRIES", 10000)                 # 메모리에 유지할 최대 항목 수 (오래 안 쓴 것부터 제외)
+CACHE_INDEX_PATH: Final[str] = environ.get("CACHE_INDEX_PATH", "")   # 저장소에 없을 때 확인할 제품 목록 색인 파일. 비어 있으면 사용하지 않음
+CACHE_SERVER: Final[str] = environ.get("CACHE_SERVER", "unix:/tmp/recyclehelper-cache.sock")   # "unix:<소켓 경로>" 또는 "tcp:127.0.0.1:<포트>"
+CACHE_SERVER_POOL: Final[int] = _env_int("CACHE_SERVER_POOL", 4)                      # 캐시 서버에 동시에 열어둘 최대 연결 수
+CACHE_SERVER_TIMEOUT: Final[float] = float(environ.get("CACHE_SERVER_TIMEOUT", "1"))  # 캐시 서버 요청 한 번의 제한 시간(초)
+
+# 실행 지표
+METRICS_EXPORT: Final[str] = environ.get("METRICS_EXPORT", "")           # "prometheus", "json" 또는 내보내지 않는 ""
+METRICS_HOST: Final[str] = environ.get("METRICS_HOST", "127.0.0.1")       # prometheus: /metrics 를 제공할 주소. 다른 기기에서 수집하려면 "0.0.0.0"
+METRICS_PORT: Final[int] = _env_int("METRICS_PORT", 9108)                # prometheus: /metrics 를 제공할 포트
+METRICS_PATH: Final[str] = environ.get("METRICS_PATH", "./metrics.json") # json: 지표를 덮어쓸 파일 경로
+METRICS_INTERVAL: Final[float] = float(environ.get("METRICS_INTERVAL", "15"))   # json: 파일을 다시 쓰는 주기(초)
+
+# 식품안전나라 API
+FOOD_SAFETY_API_URL: Final[str] = environ.get("FOOD_SAFETY_API_URL", "http://openapi.foodsafetykorea.go.kr/api")   # 인증키 앞까지의 주소
+API_PAGE_SIZE: Final[int] = _env_int("API_PAGE_SIZE", 100)       # 한 번의 요청으로 받을 최대 행 수
+I0030_MIRROR_PATH: Final[str] = environ.get("I0030_MIRROR_PATH", "")   # 내려받아 둔 I0030 데이터셋 파일 (mirror_sync.py). 비어 있으면 항상 API 조회
+I0030_SYNC_PAGE_SIZE: Final[int] = _env_int("I0030_SYNC_PAGE_SIZE", 1000)   # 데이터셋을 내려받을 때 한 번에 요청할 행 수
+API_RETRIES: Final[int] = _env_int("API_RETRIES", 3)             # 연결 오류, 5xx/429 응답 시 재시도 횟수
+API_BACKOFF: Final[float] = float(environ.get("API_BACKOFF", "0.5"))   # 재시도 간격의 기준 값(초). 재시도마다 두 배로 늘어남
+API_TIMEOUT: Final[float] = float(environ.get("API_TIMEOUT", "10"))    # 요청 한 번의 제한 시간(초)
+
+# 분리수거함 블루투스 모듈
+BLUETOOTH_ACK: Final[str] = environ.get("BLUETOOTH_ACK", "")           # 모듈이 명령을 수행한 뒤 보내는 응답. 비워두면 응답을 기다리지 않음
+BLUETOOTH_TIMEOUT: Final[float] = float(environ.get("BLUETOOTH_TIMEOUT", "2"))   # 응답을 기다리는 시간(초)
+BLUETOOTH_RETRIES: Final[int] = _env_int("BLUETOOTH_RETRIES", 2)       # 응답이 없을 때 명령을 다시 보내는 횟수
+BLUETOOTH_QUEUE_SIZE: Final[int] = _env_int("BLUETOOTH_QUEUE_SIZE", 8) # 모듈별로 쌓아 둘 수 있는 최대 명령 수
+BLUETOOTH_HOLD: Final[float] = float(environ.get("BLUETOOTH_HOLD", "3"))         # 연결이 끊긴 모듈에 보낼 명령을 다시 연결될 때까지 보관하는 시간(초)
+BLUETOOTH_DEBOUNCE: Final[float] = float(environ.get("BLUETOOTH_DEBOUNCE", "2"))   # 같은 바코드로 같은 분리수거함을 다시 열지 않고 무시하는 시간(초). 0 이면 끔
+BLUETOOTH_HEARTBEAT: Final[str] = environ.get("BLUETOOTH_HEARTBEAT", "")         # 연결 상태 확인용 명령. 비워두면 포트 상태만 확인
+BLUETOOTH_HEARTBEAT_INTERVAL: Final[float] = float(environ.get("BLUETOOTH_HEARTBEAT_INTERVAL", "5"))   # 연결 상태 확인 주기(초)
+BLUETOOTH_BACKOFF: Final[float] = float(environ.get("BLUETOOTH_BACKOFF", "1"))   # 첫 재연결 대기 시간(초). 실패할 때마다 두 배로 늘어남
+BLUETOOTH_MAX_BACKOFF: Final[float] = float(environ.get("BLUETOOTH_MAX_BACKOFF", "30"))   # 재연결 대기 시간의 최대 값(초)
+BLUETOOTH_READY_TIMEOUT: Final[float] = float(environ.get("BLUETOOTH_READY_TIMEOUT", "30"))   # 모듈 연결과 페어링을 기다리는 최대 시간(초)
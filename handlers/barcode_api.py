@@ -1,100 +1,294 @@
+from concurrent.futures import ThreadPoolExecutor
 from os import environ
-from pprint import pprint
-import re
-from typing import cast, Final
+from threading import Lock
+from typing import cast, Final, Iterable, TYPE_CHECKING
 
-import requests
-from playwright.sync_api import sync_playwright, Playwright, Browser, Page, Locator
-from playwright.sync_api._context_manager import PlaywrightContextManager
+from config import (
+    API_BACKOFF, API_PAGE_SIZE, API_RETRIES, API_TIMEOUT, API_WORKERS, FOOD_SAFETY_API_URL, I0030_MIRROR_PATH, RESOLVER_BACKENDS
+)
+from metrics import metrics
+from models.material import classifyMaterial, Material
+from models.product import LookupResult
+from models.response import LazyProductResponse
+from storage.i0030_mirror import I0030Mirror
+from utils import cacheIt, startupTimer
 
-from models.material import parseMaterial, Material
-from models.response import ProductResponse
-from utils import cacheIt
+if TYPE_CHECKING:   # requests, playwright 등 무거운 모듈은 첫 조회 때 불러옴.
+    import requests
+    from handlers.resolvers import PrdReportNoResolver, ResolverError
 
-prdNoPattern = re.compile(r"(?:(\d{14})+[\w_, \(\)]{0,})+")
+
+def chooseProductRow(rows: Iterable[LazyProductResponse]) -> tuple[LazyProductResponse, Material] | None:
+    """여러 API 응답 행 중 재질 분류에 사용할 행을 고릅니다.
+    알 수 있는 재질 표기가 있는 행을 우선하고, 그 중 가장 최근에 수정된 행을 고릅니다.
+
+    Args:
+        rows (Iterable[LazyProductResponse]): 후보 행 목록.
+
+    Returns:
+        tuple[LazyProductResponse, Material] | None: 고른 행과 그 재질 분류. 후보가 없으면 None.
+    """
+    best: tuple[tuple[bool, str], LazyProductResponse, Material] | None = None
+    for row in rows:
+        mat, score = classifyMaterial(row.frmlc_mtrqlt)
+        key: tuple[bool, str] = (score > 0, row.last_updt_dtm)
+        if best is None or key > best[0]:
+            best = (key, row, mat)
+    return None if best is None else (best[1], best[2])
 
 
 class BarcodeHandler:
     def __init__(self):
-        self.session: requests.Session = requests.Session()
         self.__key: Final[str] = environ["FOOD_SAFETY_KR_API_KEY"]
-        self.playwright: Playwright = sync_playwright().start()
-        self.browser: Browser = self.playwright.chromium.launch()
+        self._session: requests.Session | None = None
+        self._resolvers: list[PrdReportNoResolver] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self.initLock: Lock = Lock()    # 여러 조회 스레드가 동시에 지연 초기화하지 않도록.
+        # 내려받아 둔 I0030 데이터셋. 있으면 API보다 먼저 확인함.
+        self.mirror: I0030Mirror | None = I0030Mirror(I0030_MIRROR_PATH) if I0030_MIRROR_PATH else None
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        API 호출에 사용할 세션. 처음 접근할 때 만듭니다.
+        """
+        with self.initLock:
+            if self._session is None:
+                with startupTimer.section("requests session"):
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+                    session: requests.Session = requests.Session()
+                    adapter: HTTPAdapter = HTTPAdapter(
+                        pool_maxsize=API_WORKERS,   # 여러 조회 스레드가 연결을 재사용할 수 있도록.
+                        max_retries=Retry(
+                            total=API_RETRIES,
+                            backoff_factor=API_BACKOFF,
+                            status_forcelist=(429, 500, 502, 503, 504),
+                            allowed_methods=("GET", "HEAD")
+                        )
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+            return self._session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        여러 품목보고번호를 동시에 조회할 때 사용할 스레드 풀. 처음 접근할 때 만들고, 모든 조회가 함께 사용합니다.
+        """
+        with self.initLock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api")
+            return self._executor
+
+    @property
+    def resolvers(self) -> "list[PrdReportNoResolver]":
+        """
+        설정된 순서의 품목보고번호 조회 방식 목록. 처음 접근할 때 만듭니다.
+        """
+        session: requests.Session = self.session
+        with self.initLock:
+            if self._resolvers is None:
+                from handlers.resolvers import createResolver
+                self._resolvers = [createResolver(name.strip(), session) for name in RESOLVER_BACKENDS]
+            return self._resolvers
+
+    def warmUp(self):
+        """
+        캐시 저장소를 열고, 현재 스레드에서 사용할 1순위 품목보고번호 조회 방식을 미리 준비합니다.
+        2순위 이후의 조회 방식(예: 브라우저)은 실제로 필요해질 때 준비합니다.
+        """
+        self.search.open()
+        self.resolvers[0].warmUp()
+
+    def closeBrowser(self):
+        """
+        현재 스레드에서 실행한 브라우저와 Playwright를 종료합니다. 브라우저를 실행한 스레드에서 호출해야 합니다.
+        """
+        if self._resolvers is None:
+            return
+        for resolver in self._resolvers:
+            resolver.close()
 
     def teardown(self):
         """
         teardown
         """
-        if self.session is not None:
-            self.session.close()
-        self.playwright.stop()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._session is not None:
+            self._session.close()
+        self.closeBrowser()
+        if self.mirror is not None:
+            self.mirror.close()
 
     @cacheIt()
-    def search(self, barcode: str) -> Material:
+    def search(self, barcode: str) -> LookupResult:
         """바코드에 해당하는 제품 정보를 크롤링 해옵니다.
+        캐시 데코레이터가 조회 결과 전체를 저장하고, 호출한 쪽에는 재질만 돌려줍니다.
 
         Args:
             barcode (str): 바코드 번호 값.
 
         Returns:
-            Material : 제품의 포장 재질에 대응하는 Material 객체.
+            LookupResult : 제품의 포장 재질과 품목보고번호, 원본 재질 표기.
         """
         # init
-        prdReportNo: str | None = self.getPrdReportNo(barcode)
-        if prdReportNo is None:
+        prdReportNos: list[str] = self.getPrdReportNos(barcode)
+        if not prdReportNos:
             raise ValueError("바코드 번호에 해당하는 상품을 찾을 수 없습니다.")
-        material: Material | None = self.product_search(prdReportNo)
-        if material is None:
+        result: LookupResult | None = self.product_lookup_many(prdReportNos)
+        if result is None:
             raise ValueError("품목보고번호에 해당하는 상품을 찾을 수 없습니다.")
-        return material
+        return result
     
+    def getPrdReportNos(self, barcode: str) -> list[str]:
+        """바코드 번호를 사용해 품목 보고 번호 후보를 얻습니다. 유통상품지식뱅크를 설정된 순서의 조회 방식으로 조회합니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+
+        Raises:
+            ResolverError: 모든 조회 방식이 실패한 경우.
+
+        Returns:
+            list[str]: 품목 보고 번호 후보 목록. 없을 경우 빈 목록.
+        """
+        from handlers.resolvers import ResolverError
+        error: ResolverError | None = None
+        for resolver in self.resolvers:
+            name: str = type(resolver).__name__
+            try:
+                with metrics.span("crawl", resolver=name):
+                    return resolver.resolve(barcode)
+            except ResolverError as e:
+                metrics.inc("resolver_errors", resolver=name)
+                print(f"{name} 조회 실패, 다음 방식으로 재시도: {e.msg}")
+                error = e
+        raise cast(ResolverError, error)     # 모든 방식이 실패. 상품이 없는 것과 구분하기 위해 ValueError가 아닌 오류로 전달.
+
     def getPrdReportNo(self, barcode: str) -> str | None:
-        """바코드 번호를 사용해 품목 보고 번호를 얻습니다. 유통상품지식뱅크를 크롤링합니다.
+        """바코드 번호를 사용해 첫 번째 품목 보고 번호를 얻습니다.
 
         Args:
-            browser (Browser): Playwright의 브라우저 객체.
             barcode (str): 바코드 번호 값.
 
         Returns:
             str | None: 품목 보고 번호. 없을 경우 None, 있을 경우 품목 보고 번호의 문자열
         """
-        page: Page = self.browser.new_page()
-        page.goto("http://www.allproductkorea.or.kr/products/search")
-        
-        # search
-        searchElem: Locator = page.locator(selector=".header_searchV2")
-        searchElem.locator(selector="#searchText").fill(barcode)
-        searchElem.locator(selector="button").click()
-        
-        # get result
-        items: Locator = page.locator(selector=".spl_list")
-        items.click()
-        prdReportNoLoc: Locator = page.locator(selector="body > div.sub_content2 > div > div.pdv_korcharDetail > div.pdv_wrap_korcham > table > tbody > tr:nth-child(10) > td")
-        prdReportNoStr = prdReportNoLoc.inner_text()
-        print(prdReportNoStr)
-        mat: re.Match | None = prdNoPattern.match(prdReportNoStr)
-        
-        prdReporNo: str | None = None
-        if (mat is not None):
-            grp = mat.groups()
-            pprint(grp)
-            prdReporNo = grp[0]
-        
-        return prdReporNo
+        prdReportNos: list[str] = self.getPrdReportNos(barcode)
+        return prdReportNos[0] if prdReportNos else None
+
+    def api_page(self, start: int, end: int, condition: str = "") -> tuple[list[dict[str, str]], int]:
+        """I0030 API의 한 페이지를 받아옵니다.
+
+        Args:
+            start (int): 받을 첫 행 번호. 1부터 시작합니다.
+            end (int): 받을 마지막 행 번호.
+            condition (str, optional): 검색 조건. (예: "PRDLST_REPORT_NO=...", "CHNG_DT=20240101") 비어 있으면 전체 데이터셋.
+
+        Returns:
+            tuple[list[dict[str, str]], int]: 응답 행 목록과 조건에 맞는 전체 행 수.
+        """
+        url: str = f"{FOOD_SAFETY_API_URL}/{self.__key}/I0030/json/{start}/{end}"
+        if condition:
+            url += f"/{condition}"
+        try:
+            with metrics.span("api_call"), self.session.get(url, timeout=API_TIMEOUT) as resp:
+                resp.raise_for_status()
+                body: dict = resp.json()["I0030"]
+        except Exception:
+            metrics.inc("api_errors")
+            raise
+        if body["RESULT"]["CODE"] == "INFO-200":
+            return [], 0    # 결과 없음
+        return body.get("row") or [], int(body.get("total_count") or 0)
+
+    def product_rows(self, prdReportNo: str) -> list[LazyProductResponse]:
+        """품목보고번호에 해당하는 API 응답 행을 모두 받아옵니다.
+        내려받아 둔 데이터셋에 있으면 그 행을 사용하고, 없으면(마지막 동기화 이후 등록된 제품 등) API를 페이지 단위로 조회합니다.
+
+        Args:
+            prdReportNo (str): 품목보고번호.
+
+        Returns:
+            list[LazyProductResponse]: 응답 행 목록. 결과가 없으면 빈 목록.
+        """
+        if self.mirror is not None:
+            with metrics.span("mirror_lookup"):
+                local: list[dict[str, str]] = self.mirror.rows(prdReportNo)
+            metrics.inc("mirror_lookups", result="hit" if local else "miss")
+            if local:
+                return [LazyProductResponse(r) for r in local]
+        rows: list[LazyProductResponse] = []
+        start: int = 1
+        while True:
+            end: int = start + API_PAGE_SIZE - 1
+            page, total = self.api_page(start, end, f"PRDLST_REPORT_NO={prdReportNo}")
+            rows.extend(LazyProductResponse(r) for r in page)
+            if not page or end >= total:
+                break
+            start = end + 1
+        return rows
+
+    def product_rows_many(self, prdReportNos: Iterable[str]) -> dict[str, list[LazyProductResponse]]:
+        """여러 품목보고번호의 API 응답 행을 동시에 받아옵니다. 세션의 연결을 재사용합니다.
+
+        Args:
+            prdReportNos (Iterable[str]): 품목보고번호 목록.
+
+        Returns:
+            dict[str, list[LazyProductResponse]]: 품목보고번호 -> 응답 행 목록.
+        """
+        unique: list[str] = list(dict.fromkeys(prdReportNos))
+        if len(unique) <= 1:
+            return {no: self.product_rows(no) for no in unique}
+        return dict(zip(unique, self.executor.map(self.product_rows, unique)))
+
+    def product_lookup_many(self, prdReportNos: Iterable[str]) -> LookupResult | None:
+        """여러 품목보고번호 후보를 모두 조회해, 재질 분류에 가장 적합한 행의 결과를 얻습니다.
+
+        Args:
+            prdReportNos (Iterable[str]): 품목보고번호 후보 목록.
+
+        Returns:
+            LookupResult | None: 분류 결과와 원본 재질 표기. 결과가 없으면 None.
+        """
+        rows: list[LazyProductResponse] = [
+            row for candidates in self.product_rows_many(prdReportNos).values() for row in candidates
+        ]
+        with metrics.span("classify"):
+            chosen: tuple[LazyProductResponse, Material] | None = chooseProductRow(rows)
+        if chosen is None:
+            return None
+        row, mat = chosen
+        return LookupResult(mat, row.prdlst_report_no, row.frmlc_mtrqlt)
+
+    def product_lookup(self, prdReportNo: str) -> LookupResult | None:
+        """품목보고번호로 식품안전나라 API를 조회해, 포장재질을 분류한 결과를 얻습니다.
+
+        Args:
+            prdReportNo (str): 품목보고번호.
+
+        Returns:
+            LookupResult | None: 분류 결과와 원본 재질 표기. 결과가 없으면 None.
+        """
+        return self.product_lookup_many((prdReportNo,))
 
     def product_search(self, prdReportNo: str) -> Material | None:
-        url: str = f"http://openapi.foodsafetykorea.go.kr/api/{self.__key}/I0030/json/1/5/"\
-                   f"PRDLST_REPORT_NO={prdReportNo}"
-                   # f"&BSSH_NM={barcode_resp.bssh_nm}"\
-                   # f"&PRDLST_NM={barcode_resp.prdlst_nm}"\
-        print(f"품목보고번호 사용해 제품 정보 조회 -> {url}")
-        with self.session.get(url) as resp:
-            json = resp.json()
-            pprint(json)
-            if json["I0030"]["RESULT"]["CODE"] == "INFO-200":
-                return None   # 결과 없음
-            wrapped: list[ProductResponse] = [ProductResponse.from_json(**r) for r in json["I0030"]["row"]]
-            return parseMaterial(wrapped[0].frmlc_mtrqlt)
+        """품목보고번호로 제품의 포장재질 분류를 얻습니다.
+
+        Args:
+            prdReportNo (str): 품목보고번호.
+
+        Returns:
+            Material | None: 포장재질 분류. 결과가 없으면 None.
+        """
+        result: LookupResult | None = self.product_lookup(prdReportNo)
+        return None if result is None else result.material
 
     def __del__(self):
         self.teardown()
\ No newline at end of file
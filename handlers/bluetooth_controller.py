@@ -0,0 +1,372 @@
+from collections import deque
+from dataclasses import dataclass
+import os
+from queue import SimpleQueue
+import selectors
+from threading import Lock, Thread
+from time import monotonic
+from typing import Callable, TYPE_CHECKING
+
+from metrics import metrics
+from models.material import Material
+
+if TYPE_CHECKING:
+    from handlers.bluetooth_handler import Module
+
+CommandCallbackT = Callable[[Material, bool], None]
+LinkDownCallbackT = Callable[[Material, OSError], None]
+
+
+@dataclass(slots=True)
+class BinCommand:
+    """
+    분리수거함 모듈에 보낼 명령 하나.
+    """
+    mat: Material                           # 대상 분리수거함
+    data: str                               # 보낼 명령 문자열
+    onDone: CommandCallbackT | None = None  # 성공/실패가 확정되면 컨트롤러 스레드에서 호출
+    attempts: int = 0                       # 지금까지 보낸 횟수
+    deadline: float = 0.0                   # 응답을 기다리는 기한 (monotonic 값)
+    queuedAt: float = 0.0                   # 대기열에 들어간 시각 (monotonic 값)
+
+
+class BluetoothController:
+    """
+    모든 분리수거함 모듈의 시리얼 포트를 하나의 이벤트 루프 스레드에서 관리합니다.
+    명령은 모듈별 대기열에 넣기만 하고 바로 반환하므로, 한 모듈의 연결이 멈춰도 바코드 처리는 막히지 않습니다.
+    """
+    def __init__(
+            self,
+            ackToken: str = "",
+            ackTimeout: float = 2.0,
+            retries: int = 2,
+            queueSize: int = 8,
+            holdTime: float = 3.0,
+            onLinkDown: LinkDownCallbackT | None = None
+    ) -> None:
+        self.ackToken: str = ackToken       # 모듈이 명령을 수행했다고 알리는 응답. 빈 문자열이면 쓰기만 성공하면 완료로 취급
+        self.ackTimeout: float = ackTimeout
+        self.retries: int = retries         # 응답이 없을 때 다시 보내는 횟수
+        self.queueSize: int = queueSize     # 모듈별 대기열 최대 길이
+        self.holdTime: float = holdTime     # 연결이 끊긴 모듈에 보낼 명령을 다시 연결될 때까지 보관하는 시간
+        self.onLinkDown: LinkDownCallbackT | None = onLinkDown   # 모듈 연결이 끊겼을 때 컨트롤러 스레드에서 호출
+        self.selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self.modules: dict[Material, Module] = {}
+        self.fds: dict[Material, int] = {}                  # 등록한 파일 디스크립터 (포트가 닫힌 뒤에도 등록 해제할 수 있도록 보관)
+        self.down: set[Material] = set()                    # 다시 연결되기를 기다리는 모듈
+        self.queues: dict[Material, deque[BinCommand]] = {}
+        self.inflight: dict[Material, BinCommand] = {}      # 응답을 기다리는 명령
+        self.received: dict[Material, str] = {}             # 응답 토큰을 찾기 위해 모아 둔 수신 내용
+        self.posted: SimpleQueue[Callable[[], None]] = SimpleQueue()   # 다른 스레드에서 루프 스레드로 넘긴 작업
+        self.wakeReader, self.wakeWriter = os.pipe()
+        os.set_blocking(self.wakeReader, False)
+        os.set_blocking(self.wakeWriter, False)     # 루프가 늦어져 파이프가 차도 보내는 스레드가 멈추지 않도록 함.
+        self.wakeLock: Lock = Lock()                # 깨우기 파이프를 닫는 중에 다른 스레드가 쓰지 않도록 함.
+        self.closed: bool = False                   # stop()으로 깨우기 파이프를 닫았는지 여부
+        self.selector.register(self.wakeReader, selectors.EVENT_READ, None)
+        self.running: bool = False
+        self.thread: Thread = Thread(target=self.run, name="bluetooth", daemon=True)
+
+    def start(self) -> None:
+        """
+        이벤트 루프 스레드를 시작합니다.
+        """
+        self.running = True
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        이벤트 루프 스레드를 멈추고, 남은 명령을 실패로 처리합니다.
+        """
+        def stopLoop() -> None:
+            self.running = False
+        if not self.post(stopLoop):
+            return  # 이미 멈춤.
+        if self.thread.is_alive():
+            self.thread.join()
+        with self.wakeLock:
+            self.closed = True
+            os.close(self.wakeReader)
+            os.close(self.wakeWriter)
+        while not self.posted.empty():
+            self.posted.get()()     # 루프가 끝나기 직전에 넘어온 작업. 남은 명령은 아래에서 실패로 처리됨.
+        for mat in list(self.queues):
+            self.failAll(mat)
+
+    def post(self, fn: Callable[[], None]) -> bool:
+        """다른 스레드에서 루프 스레드로 작업을 넘기고, 루프를 깨웁니다.
+
+        Args:
+            fn (Callable[[], None]): 루프 스레드에서 실행할 작업.
+
+        Returns:
+            bool: 작업을 넘겼으면 True. stop() 이후라서 넘기지 못했으면 False.
+        """
+        with self.wakeLock:
+            if self.closed:
+                return False
+            self.posted.put(fn)
+            try:
+                os.write(self.wakeWriter, b"\0")
+            except BlockingIOError:
+                pass    # 이미 깨울 신호가 충분히 쌓여 있음.
+            return True
+
+    def attach(self, mat: Material, module: "Module") -> None:
+        """모듈을 루프에 등록합니다. 연결이 끊긴 동안 보관한 명령이 있으면 이어서 보냅니다.
+
+        Args:
+            mat (Material): 모듈이 담당하는 분리수거함.
+            module (Module): 연결된 모듈.
+        """
+        def register() -> None:
+            self.dropModule(mat)
+            self.queues.setdefault(mat, deque())
+            try:
+                fd: int = module.fileno()
+            except OSError as e:
+                self.down.add(mat)  # 등록하기 전에 포트가 다시 닫힘. 연결 감시가 다시 열면 다시 등록됨.
+                if self.onLinkDown is not None:
+                    self.onLinkDown(mat, e)
+                return
+            self.down.discard(mat)
+            self.modules[mat] = module
+            self.fds[mat] = fd
+            self.received[mat] = ""
+            self.selector.register(fd, selectors.EVENT_READ, mat)
+        self.post(register)
+
+    def expect(self, mat: Material) -> None:
+        """아직 연결되지 않은 모듈을 연결 대기 상태로 둡니다. 연결될 때까지 명령을 잠시 보관합니다.
+
+        Args:
+            mat (Material): 연결을 기다릴 분리수거함.
+        """
+        def markDown() -> None:
+            if mat not in self.modules:
+                self.down.add(mat)
+                self.queues.setdefault(mat, deque())
+        self.post(markDown)
+
+    def linkDown(self, mat: Material) -> None:
+        """모듈 연결이 끊긴 것으로 보고 루프에서 빼냅니다. 남은 명령은 다시 연결될 때까지 잠시 보관합니다.
+
+        Args:
+            mat (Material): 연결이 끊긴 분리수거함.
+        """
+        self.post(lambda: self.suspend(mat))
+
+    def detach(self, mat: Material) -> None:
+        """모듈을 루프에서 제외합니다. 대기 중인 명령은 실패로 처리합니다.
+
+        Args:
+            mat (Material): 제외할 분리수거함.
+        """
+        self.post(lambda: self.unregister(mat))
+
+    def send(self, mat: Material, data: str, onDone: CommandCallbackT | None = None) -> None:
+        """명령을 모듈의 대기열에 넣고 바로 반환합니다.
+
+        Args:
+            mat (Material): 대상 분리수거함.
+            data (str): 보낼 명령 문자열.
+            onDone (CommandCallbackT | None, optional): 성공/실패가 확정되면 호출할 함수.
+        """
+        cmd: BinCommand = BinCommand(mat, data, onDone)
+
+        def enqueue() -> None:
+            queue: deque[BinCommand] | None = self.queues.get(mat)
+            cmd.queuedAt = monotonic()
+            if (mat not in self.modules and mat not in self.down) or queue is None:
+                self.finish(cmd, False)
+            elif len(queue) >= self.queueSize:
+                self.finish(cmd, False)     # 모듈이 명령을 처리하지 못하고 있음.
+            else:
+                queue.append(cmd)
+        if not self.post(enqueue):
+            self.finish(cmd, False)     # 컨트롤러가 멈춤.
+
+    def run(self) -> None:
+        """
+        이벤트 루프. 쓰기 가능한 모듈에 명령을 보내고, 응답을 읽고, 응답 기한을 확인합니다.
+        """
+        while self.running:
+            self.updateInterest()
+            for key, events in self.selector.select(self.nextTimeout()):
+                if key.data is None:
+                    self.runPosted()
+                    continue
+                mat: Material = key.data
+                if events & selectors.EVENT_READ and mat in self.modules:
+                    self.onReadable(mat)
+                if events & selectors.EVENT_WRITE and mat in self.modules:
+                    self.onWritable(mat)
+            self.checkTimeouts()
+
+    def runPosted(self) -> None:
+        """
+        깨우기 신호를 비우고, 다른 스레드에서 넘긴 작업을 실행합니다.
+        """
+        try:
+            while os.read(self.wakeReader, 512):
+                pass
+        except BlockingIOError:
+            pass
+        while not self.posted.empty():
+            self.posted.get()()
+
+    def updateInterest(self) -> None:
+        """
+        보낼 명령이 있고 응답을 기다리는 명령이 없는 모듈만 쓰기 이벤트를 감시합니다.
+        등록할 때 보관한 파일 디스크립터를 사용하며, 포트를 다시 열지 않습니다. (포트는 연결 감시 스레드만 엶)
+        """
+        for mat in self.modules:
+            fd: int | None = self.fds.get(mat)
+            if fd is None:
+                continue
+            events: int = selectors.EVENT_READ
+            if self.queues[mat] and mat not in self.inflight:
+                events |= selectors.EVENT_WRITE
+            try:
+                if self.selector.get_key(fd).events != events:
+                    self.selector.modify(fd, events, mat)
+            except KeyError:
+                continue    # 등록되지 않은 모듈.
+
+    def nextTimeout(self) -> float | None:
+        """
+        가장 가까운 응답 기한 또는 보관 기한까지 남은 시간. 기다릴 것이 없으면 None.
+        """
+        deadlines: list[float] = [cmd.deadline for cmd in self.inflight.values()]
+        deadlines.extend(self.queues[mat][0].queuedAt + self.holdTime for mat in self.down if self.queues.get(mat))
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - monotonic())
+
+    def onWritable(self, mat: Material) -> None:
+        """
+        모듈의 대기열에서 명령을 하나 꺼내 보냅니다.
+        """
+        cmd: BinCommand = self.queues[mat].popleft()
+        cmd.attempts += 1
+        try:
+            self.modules[mat].send(cmd.data)
+        except OSError as e:
+            cmd.attempts -= 1   # 보내지 못했으므로 다시 연결된 뒤 처음부터 시도.
+            self.queues[mat].appendleft(cmd)
+            self.onDeviceError(mat, e)
+            return
+        if not self.ackToken:
+            self.finish(cmd, True)
+            return
+        cmd.deadline = monotonic() + self.ackTimeout
+        self.inflight[mat] = cmd
+        self.received[mat] = ""
+
+    def onReadable(self, mat: Material) -> None:
+        """
+        모듈이 보낸 내용을 읽어, 응답을 기다리는 명령이 있으면 응답 토큰을 찾습니다.
+        """
+        try:
+            text: str = self.modules[mat].receive()
+        except UnicodeDecodeError:
+            return  # 잡음.
+        except OSError as e:
+            self.onDeviceError(mat, e)
+            return
+        cmd: BinCommand | None = self.inflight.get(mat)
+        if cmd is None or not self.ackToken:
+            return
+        buffered: str = self.received[mat] + text
+        if self.ackToken in buffered:
+            del self.inflight[mat]
+            self.received[mat] = ""
+            self.finish(cmd, True)
+        else:
+            self.received[mat] = buffered[-len(self.ackToken):]     # 토큰이 나눠 들어오는 경우를 위해 끝부분만 보관.
+
+    def checkTimeouts(self) -> None:
+        """
+        응답 기한이 지난 명령을 다시 보내거나, 재시도 횟수를 넘겼으면 실패로 처리합니다.
+        """
+        now: float = monotonic()
+        for mat, cmd in list(self.inflight.items()):
+            if cmd.deadline > now:
+                continue
+            del self.inflight[mat]
+            if cmd.attempts <= self.retries:
+                self.queues[mat].appendleft(cmd)
+            else:
+                self.finish(cmd, False)
+        for mat in self.down:
+            queue: deque[BinCommand] | None = self.queues.get(mat)
+            while queue and queue[0].queuedAt + self.holdTime <= now:
+                self.finish(queue.popleft(), False)     # 제때 다시 연결되지 않았으므로 포기.
+
+    def onDeviceError(self, mat: Material, error: OSError) -> None:
+        """
+        읽기/쓰기에 실패한 모듈을 연결이 끊긴 것으로 처리하고 알립니다.
+        """
+        if mat not in self.modules:
+            return
+        metrics.inc("device_errors", bin=mat.name)
+        self.suspend(mat)
+        if self.onLinkDown is not None:
+            self.onLinkDown(mat, error)
+        else:
+            print(f"{mat.name} 분리수거함 모듈 오류: {error!r}")
+
+    def suspend(self, mat: Material) -> None:
+        """
+        모듈을 루프에서 빼내고, 응답을 기다리던 명령을 대기열 앞으로 되돌려 다시 연결될 때까지 보관합니다.
+        """
+        if mat not in self.modules:
+            return
+        self.dropModule(mat)
+        cmd: BinCommand | None = self.inflight.pop(mat, None)
+        if cmd is not None:
+            self.queues[mat].appendleft(cmd)
+        self.down.add(mat)
+
+    def dropModule(self, mat: Material) -> None:
+        """
+        모듈의 포트를 루프의 감시 대상에서 제외합니다.
+        """
+        self.modules.pop(mat, None)
+        fd: int | None = self.fds.pop(mat, None)
+        if fd is not None:
+            try:
+                self.selector.unregister(fd)
+            except (KeyError, ValueError, OSError):
+                pass
+
+    def unregister(self, mat: Material) -> None:
+        """
+        모듈을 루프에서 제외하고, 남은 명령을 실패로 처리합니다.
+        """
+        self.dropModule(mat)
+        self.down.discard(mat)
+        self.failAll(mat)
+
+    def failAll(self, mat: Material) -> None:
+        """
+        모듈의 대기 중인 명령과 응답을 기다리는 명령을 모두 실패로 처리합니다.
+        """
+        pending: list[BinCommand] = list(self.queues.pop(mat, ()))
+        cmd: BinCommand | None = self.inflight.pop(mat, None)
+        if cmd is not None:
+            pending.insert(0, cmd)
+        for cmd in pending:
+            self.finish(cmd, False)
+
+    def finish(self, cmd: BinCommand, ok: bool) -> None:
+        """
+        명령의 성공/실패를 확정하고 알립니다.
+        """
+        metrics.inc("bluetooth_commands", bin=cmd.mat.name, result="ok" if ok else "failed")
+        if cmd.queuedAt:
+            metrics.observe("bluetooth_command", monotonic() - cmd.queuedAt, bin=cmd.mat.name)
+        if cmd.onDone is not None:
+            cmd.onDone(cmd.mat, ok)
+        elif not ok:
+            print(f"{cmd.mat.name} 분리수거함에 명령 '{cmd.data}' 을(를) 전달하지 못했습니다. ({cmd.attempts}회 시도)")
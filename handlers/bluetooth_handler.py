@@ -1,4 +1,13 @@
-from typing import cast
+from threading import Event
+from time import monotonic
+
+from config import (
+    BLUETOOTH_ACK, BLUETOOTH_BACKOFF, BLUETOOTH_HEARTBEAT, BLUETOOTH_HEARTBEAT_INTERVAL, BLUETOOTH_HOLD,
+    BLUETOOTH_MAX_BACKOFF, BLUETOOTH_QUEUE_SIZE, BLUETOOTH_RETRIES, BLUETOOTH_TIMEOUT
+)
+from handlers.bluetooth_controller import BluetoothController, CommandCallbackT
+from handlers.bluetooth_supervisor import LinkSupervisor
+from metrics import metrics
 from models.material import Material
 
 import serial
@@ -37,58 +46,161 @@ class AlreadyConnectedException(ChangongBluetoothException):
 
 
 class Module:
-    ser: serial.Serial
+    port: str
+    ser: serial.Serial | None
 
     data: str
 
     def __init__(self, port: str) -> None:
-        self.ser: serial.Serial = serial.Serial(port, 9600, timeout=1)
+        self.port = port
+        self.ser = None     # 포트는 연결 감시 스레드가 open()으로 엶. 다시 열 수 있도록 포트 경로만 보관.
+
+    def open(self) -> serial.Serial:
+        """시리얼 포트를 엽니다. 이미 열려 있으면 그대로 사용합니다.
+
+        Raises:
+            serial.SerialException: 포트를 열지 못한 경우.
+
+        Returns:
+            serial.Serial: 열린 시리얼 포트.
+        """
+        if self.ser is None:
+            self.ser = serial.Serial(self.port, 9600, timeout=1, write_timeout=0)   # 쓰기는 컨트롤러가 쓰기 가능할 때만 하므로 막히지 않게 함.
+        return self.ser
+
+    def close(self) -> None:
+        """
+        시리얼 포트를 닫습니다.
+        """
+        if self.ser is not None:
+            self.ser.close()
+            self.ser = None
+
+    def opened(self) -> serial.Serial:
+        """열려 있는 시리얼 포트를 가져옵니다. 포트는 연결 감시 스레드만 열고, 닫혀 있으면 다시 열지 않습니다.
+
+        Raises:
+            ConnectionError: 포트가 닫혀 있는 경우.
+
+        Returns:
+            serial.Serial: 열린 시리얼 포트.
+        """
+        if self.ser is None:
+            raise ConnectionError(f"{self.port} 포트가 닫혀 있습니다.")
+        return self.ser
+
+    def fileno(self) -> int:
+        """
+        이벤트 루프에서 감시할 시리얼 포트의 파일 디스크립터.
+        """
+        return self.opened().fileno()
 
     def send(self, data: str) -> None:
-        self.ser.write(str.encode(data, 'ASCII'))
+        self.opened().write(str.encode(data, 'ASCII'))
 
     def receive(self) -> str:
-        return self.ser.read(self.ser.in_waiting or 1).decode('ASCII')
+        ser: serial.Serial = self.opened()
+        return ser.read(ser.in_waiting or 1).decode('ASCII')
     
     def __del__(self) -> None:
-       self.ser.close()
+       self.close()
 
 
 class BluetoothHandler:
     """
     블루투스 모듈 연결 관리
+    모듈로 보내는 명령은 컨트롤러의 대기열에 넣기만 하므로, 호출한 스레드는 모듈 응답을 기다리지 않습니다.
+    연결한 모듈은 감시되며, 연결이 끊기면 백그라운드에서 다시 연결합니다.
     """
     def __init__(self) -> None:
         self.devices: dict[Material, Module | None] = {
             mat: None
             for mat in Material
         }
+        self.paired: dict[Material, Event] = {
+            mat: Event()
+            for mat in Material
+        }
+        self.controller: BluetoothController = BluetoothController(
+            BLUETOOTH_ACK, BLUETOOTH_TIMEOUT, BLUETOOTH_RETRIES, BLUETOOTH_QUEUE_SIZE, BLUETOOTH_HOLD
+        )
+        self.supervisor: LinkSupervisor = LinkSupervisor(
+            self.controller, BLUETOOTH_HEARTBEAT, BLUETOOTH_HEARTBEAT_INTERVAL, BLUETOOTH_BACKOFF, BLUETOOTH_MAX_BACKOFF
+        )
+        self.controller.onLinkDown = self.supervisor.onLinkDown
+        self.controller.start()
+        self.supervisor.start()
 
     def connect(self, mat: Material, mod: Module):
         if self.devices[mat] is not None:
             raise AlreadyConnectedException(mat)
         self.devices[mat] = mod
+        self.supervisor.watch(mat, mod)     # 포트는 감시 스레드에서 엶.
     
     def disconnect(self, mat: Material):
         if self.devices[mat] is None:
             raise NotConnectedException(mat)
 
+        self.supervisor.unwatch(mat)
+        self.paired[mat].clear()
+
         del self.devices[mat]
 
         self.devices[mat] = None
 
-    def pair(self, mat: Material):
+    def pair(self, mat: Material, onDone: CommandCallbackT | None = None):
+        if self.devices[mat] is None:
+            raise NotConnectedException(mat)
+
+        self.paired[mat].clear()
+
+        def paired(mat: Material, ok: bool) -> None:
+            if ok:
+                self.paired[mat].set()
+            if onDone is not None:
+                onDone(mat, ok)
+
+        self.controller.send(mat, 'y', paired)
+
+    def waitReady(self, mat: Material, timeout: float | None = None) -> bool:
+        """모듈이 연결되고 페어링 명령이 전달될 때까지 기다립니다.
+
+        Args:
+            mat (Material): 기다릴 분리수거함.
+            timeout (float | None, optional): 최대 대기 시간(초). None 이면 준비될 때까지 기다림.
+
+        Raises:
+            NotConnectedException: 모듈을 연결하지 않은 경우.
+
+        Returns:
+            bool: 시간 안에 준비되었는지 여부.
+        """
         if self.devices[mat] is None:
             raise NotConnectedException(mat)
+        deadline: float | None = None if timeout is None else monotonic() + timeout
+        if not self.supervisor.waitConnected(mat, timeout):
+            return False
+        return self.paired[mat].wait(None if deadline is None else max(0.0, deadline - monotonic()))
 
-        device: Module = cast(Module, self.devices[mat])
+    def call(self, mat: Material, onDone: CommandCallbackT | None = None) -> None:
+        """분리수거함을 엽니다.
 
-        device.send('y')
+        Args:
+            mat (Material): 열 분리수거함.
+            onDone (CommandCallbackT | None, optional): 명령 전달 결과를 받을 함수.
 
-    def call(self, mat: Material):
+        Raises:
+            NotConnectedException: 모듈을 연결하지 않은 경우.
+        """
         if self.devices[mat] is None:
             raise NotConnectedException(mat)
 
-        device: Module = cast(Module, self.devices[mat])
+        with metrics.span("bluetooth_dispatch", bin=mat.name):
+            self.controller.send(mat, '1', onDone)
 
-        device.send('1')
+    def close(self) -> None:
+        """
+        연결 감시와 컨트롤러를 멈춥니다. 아직 보내지 못한 명령은 실패로 처리됩니다.
+        """
+        self.supervisor.stop()
+        self.controller.stop()
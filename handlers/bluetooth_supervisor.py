@@ -0,0 +1,203 @@
+from dataclasses import dataclass, field
+import os
+from threading import Condition, Event, Thread
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from handlers.bluetooth_controller import BluetoothController
+from metrics import metrics
+from models.material import Material
+
+if TYPE_CHECKING:
+    from handlers.bluetooth_handler import Module
+
+
+@dataclass(slots=True)
+class Link:
+    """
+    감시 중인 분리수거함 모듈 연결 하나.
+    """
+    module: "Module"
+    up: Event = field(default_factory=Event)   # 연결되어 컨트롤러에 등록된 상태
+    retryAt: float = 0.0                        # 다음 연결 시도 시각 (monotonic 값)
+    delay: float = 0.0                          # 다음 연결 실패 시 기다릴 시간
+    heartbeatAt: float = 0.0                    # 다음 상태 확인 시각 (monotonic 값)
+
+
+class LinkSupervisor:
+    """
+    분리수거함 모듈 연결을 감시하고, 끊어진 연결을 백그라운드에서 다시 맺습니다.
+    연결을 다시 맺는 동안 모듈에 보낼 명령은 컨트롤러가 잠시 보관했다가 연결되면 이어서 보냅니다.
+    """
+    def __init__(
+            self,
+            controller: BluetoothController,
+            heartbeat: str = "",
+            heartbeatInterval: float = 5.0,
+            backoff: float = 1.0,
+            maxBackoff: float = 30.0
+    ) -> None:
+        self.controller: BluetoothController = controller
+        self.heartbeat: str = heartbeat                 # 상태 확인용으로 보낼 명령. 빈 문자열이면 포트 상태만 확인
+        self.heartbeatInterval: float = heartbeatInterval
+        self.backoff: float = backoff                   # 첫 재연결 대기 시간(초). 실패할 때마다 두 배로 늘어남
+        self.maxBackoff: float = maxBackoff
+        self.links: dict[Material, Link] = {}
+        self.cond: Condition = Condition()
+        self.running: bool = False
+        self.thread: Thread = Thread(target=self.run, name="bluetooth-supervisor", daemon=True)
+
+    def start(self) -> None:
+        """
+        감시 스레드를 시작합니다.
+        """
+        self.running = True
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        감시 스레드를 멈추고 모든 모듈의 포트를 닫습니다.
+        """
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread.is_alive():
+            self.thread.join()
+        for link in self.links.values():
+            link.module.close()
+
+    def watch(self, mat: Material, module: "Module") -> None:
+        """모듈 연결 감시를 시작합니다. 연결은 감시 스레드에서 바로 시도합니다.
+
+        Args:
+            mat (Material): 모듈이 담당하는 분리수거함.
+            module (Module): 감시할 모듈. 포트가 열려 있지 않아도 됩니다.
+        """
+        self.controller.expect(mat)
+        with self.cond:
+            self.links[mat] = Link(module)
+            self.cond.notify()
+
+    def unwatch(self, mat: Material) -> None:
+        """모듈 연결 감시를 그만두고 포트를 닫습니다.
+
+        Args:
+            mat (Material): 감시를 그만둘 분리수거함.
+        """
+        with self.cond:
+            link: Link | None = self.links.pop(mat, None)
+        self.controller.detach(mat)
+        if link is not None:
+            link.up.clear()
+            link.module.close()
+
+    def waitConnected(self, mat: Material, timeout: float | None = None) -> bool:
+        """모듈이 연결될 때까지 기다립니다.
+
+        Args:
+            mat (Material): 기다릴 분리수거함.
+            timeout (float | None, optional): 최대 대기 시간(초). None 이면 연결될 때까지 기다림.
+
+        Returns:
+            bool: 연결되었는지 여부.
+        """
+        link: Link | None = self.links.get(mat)
+        return link is not None and link.up.wait(timeout)
+
+    def onLinkDown(self, mat: Material, error: OSError | None = None) -> None:
+        """연결이 끊긴 모듈을 바로 다시 연결하도록 예약합니다. 컨트롤러 스레드에서도 호출됩니다.
+
+        Args:
+            mat (Material): 연결이 끊긴 분리수거함.
+            error (OSError | None, optional): 연결이 끊긴 원인.
+        """
+        with self.cond:
+            link: Link | None = self.links.get(mat)
+            if link is None or not link.up.is_set():
+                return
+            link.up.clear()
+            link.retryAt = monotonic()
+            link.delay = self.backoff
+            self.cond.notify()
+        print(f"{mat.name} 분리수거함 모듈 연결이 끊겼습니다. 다시 연결합니다. ({error!r})")
+
+    def onHeartbeat(self, mat: Material, ok: bool) -> None:
+        """
+        상태 확인 명령의 결과. 전달하지 못했으면 연결이 끊긴 것으로 봅니다.
+        """
+        if not ok:
+            self.controller.linkDown(mat)
+            self.onLinkDown(mat)
+
+    def run(self) -> None:
+        """
+        감시 루프. 끊긴 모듈은 다시 연결하고, 연결된 모듈은 주기적으로 상태를 확인합니다.
+        """
+        while True:
+            with self.cond:
+                if not self.running:
+                    return
+                now: float = monotonic()
+                reconnects: list[tuple[Material, Link]] = []
+                checks: list[tuple[Material, Link]] = []
+                for mat, link in self.links.items():
+                    if not link.up.is_set():
+                        if link.retryAt <= now:
+                            link.retryAt = float("inf")     # 연결을 시도하는 동안 다시 예약되지 않도록 함.
+                            reconnects.append((mat, link))
+                    elif link.heartbeatAt <= now:
+                        link.heartbeatAt = now + self.heartbeatInterval
+                        checks.append((mat, link))
+                if not reconnects and not checks:
+                    self.cond.wait(self.nextWake())
+                    continue
+            # 포트를 여는 데 시간이 걸릴 수 있으므로, 잠금 밖에서 처리해 컨트롤러 스레드의 알림을 막지 않음.
+            for mat, link in reconnects:
+                self.reconnect(mat, link)
+            for mat, link in checks:
+                self.checkLink(mat, link)
+
+    def nextWake(self) -> float:
+        """
+        다음에 할 일까지 남은 시간.
+        """
+        wakeAt: float = min(
+            (link.heartbeatAt if link.up.is_set() else link.retryAt for link in self.links.values()),
+            default=monotonic() + self.heartbeatInterval
+        )
+        return max(0.0, wakeAt - monotonic())
+
+    def reconnect(self, mat: Material, link: Link) -> None:
+        """
+        모듈 포트를 다시 열어 컨트롤러에 등록합니다. 실패하면 대기 시간을 늘려 다시 시도하도록 예약합니다.
+        """
+        link.module.close()
+        try:
+            link.module.open()
+        except OSError as e:
+            metrics.inc("reconnects", bin=mat.name, result="failed")
+            with self.cond:
+                link.delay = min(max(link.delay * 2, self.backoff), self.maxBackoff)
+                link.retryAt = monotonic() + link.delay
+            print(f"{mat.name} 분리수거함 모듈 연결 실패, {link.delay:.1f}초 후 다시 시도합니다. ({e!r})")
+            return
+        with self.cond:
+            if self.links.get(mat) is not link:
+                link.module.close()     # 연결하는 동안 감시를 그만둠.
+                return
+            self.controller.attach(mat, link.module)
+            metrics.inc("reconnects", bin=mat.name, result="ok")
+            link.delay = 0.0
+            link.heartbeatAt = monotonic() + self.heartbeatInterval
+            link.up.set()
+
+    def checkLink(self, mat: Material, link: Link) -> None:
+        """
+        연결된 모듈의 상태를 확인합니다. 포트 장치가 사라졌으면 연결이 끊긴 것으로 봅니다.
+        """
+        if link.module.port.startswith("/dev/") and not os.path.exists(link.module.port):
+            self.controller.linkDown(mat)
+            self.onLinkDown(mat, FileNotFoundError(link.module.port))
+            return
+        if self.heartbeat:
+            self.controller.send(mat, self.heartbeat, self.onHeartbeat)
@@ -0,0 +1,151 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from playwright.sync_api import Browser, BrowserContext, Page, Error as PlaywrightError
+
+
+class PooledPage:
+    """
+    풀에서 관리하는 브라우저 컨텍스트/페이지 한 쌍.
+    """
+    __slots__ = ("context", "page", "uses", "home")
+
+    def __init__(self, context: BrowserContext, page: Page) -> None:
+        self.context: BrowserContext = context
+        self.page: Page = page
+        self.uses: int = 0
+        self.home: str = page.url   # 검색 페이지로 이동한 직후의 주소 (리다이렉트 반영)
+
+
+class PagePool:
+    """
+    검색 페이지에 미리 접속해 둔 브라우저 페이지를 재사용하기 위한 풀.
+    Playwright의 sync API는 생성한 스레드에서만 사용할 수 있으므로, 풀도 한 스레드 안에서만 사용해야 합니다.
+    한 스레드는 한 번에 한 페이지만 빌리므로, 크기를 1보다 크게 해도 남는 페이지는 대기만 합니다.
+    """
+    def __init__(self, browser: Browser, url: str, size: int = 1, maxUses: int = 50, timeout: float = 10.0) -> None:
+        if size < 1:
+            raise ValueError("페이지 풀의 크기는 1 이상이어야 합니다.")
+        self.browser: Browser = browser
+        self.url: str = url
+        self.size: int = size
+        self.maxUses: int = maxUses
+        self.timeout: float = timeout   # 페이지 이동과 요소 조작 하나의 제한 시간(초). Playwright 기본 값은 30초
+        self.idle: deque[PooledPage] = deque()
+        self.live: int = 0     # 대기 중인 페이지와 사용 중인 페이지를 합친 수
+
+    def warmUp(self) -> None:
+        """
+        풀의 크기만큼 페이지를 미리 만들어 검색 페이지에 대기시킵니다.
+        """
+        while self.live < self.size:
+            self.idle.append(self.spawn())
+
+    def spawn(self) -> PooledPage:
+        """새 브라우저 컨텍스트와 페이지를 만들어 검색 페이지로 이동시킵니다.
+
+        Returns:
+            PooledPage: 검색 페이지에 대기 중인 새 페이지.
+        """
+        context: BrowserContext = self.browser.new_context()
+        context.set_default_timeout(self.timeout * 1000)
+        context.set_default_navigation_timeout(self.timeout * 1000)
+        try:
+            page: Page = context.new_page()
+            page.goto(self.url)
+        except PlaywrightError:
+            context.close()
+            raise
+        self.live += 1
+        return PooledPage(context, page)
+
+    def retire(self, item: PooledPage) -> None:
+        """페이지를 컨텍스트째 닫고 풀에서 제외합니다.
+
+        Args:
+            item (PooledPage): 폐기할 페이지.
+        """
+        self.live -= 1
+        try:
+            item.context.close()
+        except PlaywrightError:
+            pass    # 이미 닫혔거나 브라우저가 죽은 경우.
+
+    def isHealthy(self, item: PooledPage) -> bool:
+        """페이지가 재사용 가능한 상태인지 확인합니다.
+
+        Args:
+            item (PooledPage): 확인할 페이지.
+
+        Returns:
+            bool: 닫히지 않았고 사용 횟수가 한도 미만이면 True.
+        """
+        return not item.page.is_closed() and item.uses < self.maxUses
+
+    def park(self, item: PooledPage) -> None:
+        """사용이 끝난 페이지를 다시 검색 페이지로 돌려놓습니다.
+
+        Args:
+            item (PooledPage): 대기시킬 페이지.
+        """
+        if item.page.url != item.home:     # 검색 결과나 상세 페이지에 머물러 있으면 처음 상태로 되돌림.
+            item.page.goto(self.url)
+            item.home = item.page.url
+
+    def acquire(self) -> PooledPage:
+        """대기 중인 페이지를 하나 꺼냅니다. 없으면 풀의 크기 안에서 새로 만듭니다.
+
+        Raises:
+            RuntimeError: 풀의 모든 페이지가 이미 사용 중인 경우.
+
+        Returns:
+            PooledPage: 검색 페이지에 대기 중인 페이지.
+        """
+        while self.idle:
+            item: PooledPage = self.idle.popleft()
+            if self.isHealthy(item):
+                return item
+            self.retire(item)
+        if self.live >= self.size:
+            raise RuntimeError("페이지 풀의 모든 페이지가 사용 중입니다.")
+        return self.spawn()
+
+    def release(self, item: PooledPage, healthy: bool = True) -> None:
+        """사용한 페이지를 풀에 반납합니다. 문제가 있었거나 사용 횟수를 넘긴 페이지는 폐기합니다.
+
+        Args:
+            item (PooledPage): 반납할 페이지.
+            healthy (bool, optional): 사용 중 오류가 없었는지 여부. 기본 값은 True 입니다.
+        """
+        item.uses += 1
+        if not healthy or not self.isHealthy(item):
+            self.retire(item)
+            return
+        try:
+            self.park(item)
+        except PlaywrightError:
+            self.retire(item)
+            return
+        self.idle.append(item)
+
+    @contextmanager
+    def page(self) -> Iterator[Page]:
+        """
+        with 문으로 페이지를 빌려 쓰고, 블록이 끝나면 자동으로 반납합니다.
+        블록 안에서 예외가 발생하면 해당 페이지는 폐기됩니다.
+        """
+        item: PooledPage = self.acquire()
+        healthy: bool = False
+        try:
+            yield item.page
+            healthy = True
+        finally:
+            self.release(item, healthy)
+
+    def close(self) -> None:
+        """
+        대기 중인 모든 페이지를 닫습니다.
+        """
+        while self.idle:
+            self.retire(self.idle.popleft())
@@ -0,0 +1,297 @@
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+import re
+from threading import local
+from urllib.parse import urljoin
+
+from typing import TYPE_CHECKING
+
+import requests
+
+from config import CRAWL_TIMEOUT, PAGE_MAX_USES, PRODUCT_SEARCH_PARAM, PRODUCT_SEARCH_URL
+from utils import startupTimer
+
+if TYPE_CHECKING:   # playwright는 무거우므로, 실제로 브라우저가 필요할 때만 불러옴.
+    from playwright.sync_api import Playwright, Browser, Locator
+    from handlers.page_pool import PagePool
+
+prdNoPattern = re.compile(r"(?:(\d{14})+[\w_, \(\)]{0,})+")
+prdNoFindPattern = re.compile(r"(?<!\d)\d{14}(?!\d)")
+noResultTexts: tuple[str, ...] = ("검색결과가 없습니다", "검색 결과가 없습니다")   # 검색 결과가 없을 때 페이지에 표시되는 문구
+
+
+class ResolverError(Exception):
+    """
+    품목보고번호 조회 방식 자체가 실패했을 때 발생시킵니다. (페이지 구조 변경, 통신 오류 등)
+    제품이 없는 경우와 달리, 다음 조회 방식으로 다시 시도할 수 있습니다.
+    """
+    msg: str
+
+    def __init__(self, msg: str):
+        self.msg = msg
+        super().__init__(msg)
+
+
+def parsePrdReportNos(prdReportNoStr: str) -> list[str]:
+    """상세 페이지의 품목보고번호 칸 내용에서 품목보고번호를 모두 추려냅니다. 한 칸에 여러 번호가 적혀 있을 수 있습니다.
+
+    Args:
+        prdReportNoStr (str): 품목보고번호 칸의 텍스트.
+
+    Returns:
+        list[str]: 적힌 순서대로의 품목 보고 번호 목록. 형식에 맞지 않을 경우 빈 목록.
+    """
+    if prdNoPattern.match(prdReportNoStr) is None:
+        return []
+    return list(dict.fromkeys(prdNoFindPattern.findall(prdReportNoStr)))    # 순서를 유지하며 중복 제거.
+
+
+class PrdReportNoResolver(ABC):
+    """
+    바코드 번호로 유통상품지식뱅크의 품목보고번호를 알아내는 방식의 공통 인터페이스.
+    """
+
+    @abstractmethod
+    def resolve(self, barcode: str) -> list[str]:
+        """바코드 번호에 해당하는 품목보고번호 후보를 조회합니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+
+        Raises:
+            ResolverError: 조회 방식 자체가 실패해 결과를 판단할 수 없는 경우.
+
+        Returns:
+            list[str]: 품목 보고 번호 후보 목록. 해당하는 상품이 없으면 빈 목록.
+        """
+
+    def warmUp(self) -> None:
+        """
+        첫 조회가 빠르도록 필요한 자원을 미리 준비합니다.
+        """
+
+    def close(self) -> None:
+        """
+        현재 스레드에서 사용한 자원을 정리합니다.
+        """
+
+
+class PlaywrightResolver(PrdReportNoResolver):
+    """
+    Chromium으로 검색 페이지를 직접 조작해 품목보고번호를 읽어옵니다.
+    """
+    def __init__(self) -> None:
+        self.browserLocal: local = local()   # Playwright sync API는 스레드에 묶이므로, 브라우저를 스레드별로 따로 띄움.
+
+    @property
+    def pagePool(self) -> "PagePool":
+        """
+        현재 스레드의 페이지 풀. 스레드에서 처음 접근할 때 Playwright와 브라우저를 실행합니다.
+        sync API의 브라우저는 스레드 사이에 공유할 수 없고, 한 스레드는 한 번에 한 페이지만 사용하므로 풀에는 페이지를 하나만 둡니다.
+        동시에 여러 바코드를 크롤링하려면 스레드(CRAWL_WORKERS)를 늘리며, 스레드마다 브라우저가 하나씩 실행됩니다.
+        """
+        pool: PagePool | None = getattr(self.browserLocal, "pagePool", None)
+        if pool is None:
+            with startupTimer.section("playwright import"):
+                from playwright.sync_api import sync_playwright
+                from handlers.page_pool import PagePool
+            with startupTimer.section("chromium launch"):
+                playwright: Playwright = sync_playwright().start()
+                browser: Browser = playwright.chromium.launch()
+            pool = PagePool(browser, PRODUCT_SEARCH_URL, 1, PAGE_MAX_USES, CRAWL_TIMEOUT)
+            self.browserLocal.playwright = playwright
+            self.browserLocal.browser = browser
+            self.browserLocal.pagePool = pool
+        return pool
+
+    def resolve(self, barcode: str) -> list[str]:
+        pool: PagePool = self.pagePool
+        from playwright.sync_api import Error as PlaywrightError    # pagePool에서 이미 불러왔으므로 비용 없음. (TimeoutError 포함)
+        try:
+            with pool.page() as page:   # 검색 페이지에 미리 대기 중인 페이지를 빌려 사용.
+                # search
+                searchElem: Locator = page.locator(selector=".header_searchV2")
+                searchElem.locator(selector="#searchText").fill(barcode)
+                with page.expect_navigation():
+                    searchElem.locator(selector="button").click()
+
+                # get result
+                items: Locator = page.locator(selector=".spl_list")
+                if items.count() == 0:
+                    if any(text in page.content() for text in noResultTexts):
+                        return []       # 검색 결과 없음.
+                    raise ResolverError("검색 결과 페이지에서 상품 목록을 찾지 못했습니다.")
+                items.first.click()
+                prdReportNoLoc: Locator = page.locator(selector="body > div.sub_content2 > div > div.pdv_korcharDetail > div.pdv_wrap_korcham > table > tbody > tr:nth-child(10) > td")
+                prdReportNoStr = prdReportNoLoc.inner_text()
+        except PlaywrightError as e:
+            raise ResolverError(f"브라우저로 검색하지 못했습니다: {e.message}") from e
+        return parsePrdReportNos(prdReportNoStr)
+
+    def warmUp(self) -> None:
+        """
+        현재 스레드의 브라우저를 실행하고, 페이지 풀을 검색 페이지에 미리 대기시킵니다.
+        """
+        pool: PagePool = self.pagePool
+        with startupTimer.section("page pool warm-up"):
+            pool.warmUp()
+
+    def close(self) -> None:
+        """
+        현재 스레드에서 실행한 브라우저와 Playwright를 종료합니다. 브라우저를 실행한 스레드에서 호출해야 합니다.
+        """
+        pool: PagePool | None = getattr(self.browserLocal, "pagePool", None)
+        if pool is None:
+            return
+        pool.close()
+        self.browserLocal.browser.close()
+        self.browserLocal.playwright.stop()
+        del self.browserLocal.pagePool, self.browserLocal.browser, self.browserLocal.playwright
+
+
+class SearchResultParser(HTMLParser):
+    """
+    검색 결과 페이지에서 첫 번째 상품(.spl_list)의 상세 페이지 링크를 찾습니다.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.resultTag: str | None = None   # 현재 들어와 있는 .spl_list 요소의 태그 이름
+        self.depth: int = 0                 # .spl_list 요소와 같은 태그의 중첩 깊이
+        self.href: str | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self.href is not None:
+            return
+        attrMap: dict[str, str | None] = dict(attrs)
+        if self.resultTag is None:
+            if "spl_list" in (attrMap.get("class") or "").split():
+                self.resultTag, self.depth = tag, 1
+                if tag == "a" and attrMap.get("href"):
+                    self.href = attrMap["href"]
+            return
+        if tag == self.resultTag:
+            self.depth += 1
+        if tag == "a" and attrMap.get("href"):
+            self.href = attrMap["href"]
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == self.resultTag:
+            self.depth -= 1
+            if self.depth == 0:
+                self.resultTag = None
+
+
+class DetailTableParser(HTMLParser):
+    """
+    상품 상세 페이지의 표를 행 단위로 읽어, 각 행의 칸 텍스트 목록으로 모읍니다.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: list[list[str]] = []
+        self.cell: list[str] | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        match tag:
+            case "tr":
+                self.rows.append([])
+            case "th" | "td" if self.rows:
+                self.cell = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in ("th", "td") and self.cell is not None:
+            self.rows[-1].append("".join(self.cell).strip())
+            self.cell = None
+
+    def handle_data(self, data: str) -> None:
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def find(self, label: str) -> str | None:
+        """첫 칸에 label이 들어있는 행의 마지막 칸 텍스트를 찾습니다.
+
+        Args:
+            label (str): 찾을 항목 이름.
+
+        Returns:
+            str | None: 해당 행의 값. 없으면 None.
+        """
+        for row in self.rows:
+            if len(row) >= 2 and label in row[0]:
+                return row[-1]
+        return None
+
+
+class HttpResolver(PrdReportNoResolver):
+    """
+    브라우저 없이 검색/상세 페이지 HTML을 직접 받아 품목보고번호를 읽어옵니다.
+    """
+    def __init__(self, session: requests.Session) -> None:
+        self.session: requests.Session = session
+
+    def fetch(self, url: str, params: dict[str, str] | None = None) -> tuple[str, str]:
+        """페이지를 받아옵니다.
+
+        Args:
+            url (str): 페이지 주소.
+            params (dict[str, str] | None, optional): 쿼리 문자열 값.
+
+        Raises:
+            ResolverError: 통신에 실패한 경우.
+
+        Returns:
+            tuple[str, str]: (리다이렉트를 반영한 최종 주소, 페이지 HTML)
+        """
+        try:
+            with self.session.get(url, params=params, timeout=CRAWL_TIMEOUT) as resp:
+                resp.raise_for_status()
+                return resp.url, resp.text
+        except requests.RequestException as e:
+            raise ResolverError(f"페이지를 받아오지 못했습니다: {url} ({e!r})") from e
+
+    def warmUp(self) -> None:
+        """
+        검색 페이지 서버와 연결을 미리 맺어 둡니다.
+        """
+        with startupTimer.section("product search connection"):
+            try:
+                self.session.head(PRODUCT_SEARCH_URL, timeout=CRAWL_TIMEOUT).close()
+            except requests.RequestException:
+                pass    # 첫 조회 때 다시 연결을 시도함.
+
+    def resolve(self, barcode: str) -> list[str]:
+        searchUrl, searchHtml = self.fetch(PRODUCT_SEARCH_URL, {PRODUCT_SEARCH_PARAM: barcode})
+        results: SearchResultParser = SearchResultParser()
+        results.feed(searchHtml)
+        if results.href is None:
+            if any(text in searchHtml for text in noResultTexts):
+                return []       # 검색 결과 없음.
+            raise ResolverError("검색 결과 페이지에서 상품 링크를 찾지 못했습니다.")
+
+        _, detailHtml = self.fetch(urljoin(searchUrl, results.href))
+        detail: DetailTableParser = DetailTableParser()
+        detail.feed(detailHtml)
+        prdReportNoStr: str | None = detail.find("품목보고번호")
+        if prdReportNoStr is None:
+            raise ResolverError("상세 페이지에서 품목보고번호 항목을 찾지 못했습니다.")
+        return parsePrdReportNos(prdReportNoStr)
+
+
+def createResolver(name: str, session: requests.Session) -> PrdReportNoResolver:
+    """설정 이름에 맞는 품목보고번호 조회 방식을 만듭니다.
+
+    Args:
+        name (str): 조회 방식 이름. "http" 또는 "playwright" 입니다.
+        session (requests.Session): HTTP 조회에 사용할 세션.
+
+    Raises:
+        ValueError: 알 수 없는 조회 방식인 경우.
+
+    Returns:
+        PrdReportNoResolver: 조회 방식 객체.
+    """
+    match name:
+        case "http":
+            return HttpResolver(session)
+        case "playwright":
+            return PlaywrightResolver()
+    raise ValueError(f"알 수 없는 품목보고번호 조회 방식입니다: {name}")
@@ -0,0 +1,153 @@
+from dataclasses import dataclass
+from typing import Callable, Iterator, Protocol
+
+from metrics import metrics
+
+FrameHandlerT = Callable[[str], None]
+FrameValidatorT = Callable[[str], bool]
+
+
+class SerialPort(Protocol):
+    """
+    FrameReader가 사용하는 시리얼 포트 기능. serial.Serial 이 이 형태를 따릅니다.
+    """
+    in_waiting: int
+
+    def read(self, size: int = 1) -> bytes:
+        ...
+
+
+def checksum(frame: bytes) -> int:
+    """프레임 내용의 체크섬. 모든 바이트의 XOR 값입니다.
+
+    Args:
+        frame (bytes): "<header>:<body>" 부분.
+
+    Returns:
+        int: 0 ~ 255 사이의 체크섬.
+    """
+    value: int = 0
+    for byte in frame:
+        value ^= byte
+    return value
+
+
+@dataclass(slots=True, frozen=True)
+class FrameRoute:
+    """
+    프레임 머리말 하나에 연결된 처리 함수와 본문 검사 함수.
+    """
+    handler: FrameHandlerT
+    validator: FrameValidatorT | None = None
+
+
+class FrameReader:
+    """
+    스캐너 아두이노가 보내는 "<header>:<body>[*<체크섬 16진수 2자리>]\\r\\n" 형식의 프레임을 읽습니다.
+    포트 버퍼에 쌓인 내용을 한 번에 읽어 프레임 단위로 나누므로, 한 번의 읽기에 여러 프레임이 들어와도 모두 처리합니다.
+    형식이 맞지 않는 프레임은 버리고 개수만 셉니다.
+    """
+    def __init__(self, port: SerialPort, maxFrame: int = 64, requireChecksum: bool = False) -> None:
+        self.port: SerialPort = port
+        self.maxFrame: int = maxFrame                   # 줄바꿈 없이 이 길이를 넘으면 잡음으로 보고 버림
+        self.requireChecksum: bool = requireChecksum    # 체크섬이 없는 프레임도 버릴지 여부
+        self.routes: dict[str, FrameRoute] = {}
+        self.buffer: bytearray = bytearray()
+        self.discarding: bool = False                   # 너무 긴 프레임을 다음 줄바꿈까지 버리는 중
+        self.malformed: int = 0
+
+    def register(self, header: str, handler: FrameHandlerT, validator: FrameValidatorT | None = None) -> None:
+        """프레임 머리말에 처리 함수를 연결합니다.
+
+        Args:
+            header (str): 프레임 머리말. (예: "bc")
+            handler (FrameHandlerT): 프레임 본문을 받아 처리할 함수.
+            validator (FrameValidatorT | None, optional): 본문 형식을 검사할 함수. 거짓을 반환하면 프레임을 버립니다.
+        """
+        self.routes[header] = FrameRoute(handler, validator)
+
+    def drop(self, reason: str) -> None:
+        self.malformed += 1
+        metrics.inc("malformed_frames", reason=reason)
+
+    def feed(self, data: bytes) -> Iterator[tuple[str, str]]:
+        """받은 내용을 버퍼에 붙이고, 완성된 프레임을 순서대로 꺼냅니다. 완성되지 않은 끝부분은 다음 호출까지 보관합니다.
+
+        Args:
+            data (bytes): 포트에서 읽은 내용.
+
+        Yields:
+            Iterator[tuple[str, str]]: 형식 검사를 통과한 (머리말, 본문).
+        """
+        buffer: bytearray = self.buffer
+        buffer += data
+        start: int = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            if self.discarding:
+                self.discarding = False     # 너무 긴 프레임의 끝. 다음 프레임부터 다시 읽음.
+            else:
+                frame: tuple[str, str] | None = self.parse(bytes(buffer[start:end]).rstrip(b"\r"))
+                if frame is not None:
+                    yield frame
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > self.maxFrame:
+            buffer.clear()
+            if not self.discarding:
+                self.discarding = True
+                self.drop("too_long")
+
+    def parse(self, raw: bytes) -> tuple[str, str] | None:
+        """프레임 하나의 형식을 검사합니다.
+
+        Args:
+            raw (bytes): 줄바꿈을 뺀 프레임.
+
+        Returns:
+            tuple[str, str] | None: (머리말, 본문). 형식이 맞지 않으면 None.
+        """
+        if not raw.strip():
+            return None     # 빈 줄은 잡음으로 세지 않음.
+        if len(raw) > self.maxFrame:
+            self.drop("too_long")
+            return None
+        body: bytes = raw
+        if len(raw) >= 3 and raw[-3] == ord("*"):
+            body = raw[:-3]
+            try:
+                expected: int = int(raw[-2:], 16)
+            except ValueError:
+                self.drop("checksum")
+                return None
+            if checksum(body) != expected:
+                self.drop("checksum")
+                return None
+        elif self.requireChecksum:
+            self.drop("checksum")
+            return None
+        try:
+            text: str = body.decode("ascii").strip()
+        except UnicodeDecodeError:
+            self.drop("encoding")
+            return None
+        header, sep, value = text.partition(":")
+        route: FrameRoute | None = self.routes.get(header)
+        if not sep or route is None:
+            self.drop("header")
+            return None
+        if route.validator is not None and not route.validator(value):
+            self.drop("body")
+            return None
+        return header, value
+
+    def read(self) -> Iterator[tuple[str, str]]:
+        """
+        포트 버퍼에 쌓인 내용을 한 번에 읽어 완성된 프레임을 꺼냅니다. 쌓인 내용이 없으면 포트의 읽기 제한 시간만큼 기다립니다.
+        """
+        return self.feed(self.port.read(self.port.in_waiting or 1))
+
+    def dispatch(self, header: str, body: str) -> None:
+        """
+        프레임을 머리말에 연결된 처리 함수로 넘깁니다.
+        """
+        self.routes[header].handler(body)
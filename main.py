@@ -1,4 +1,9 @@
-from program import BarcodeSearcher, BluetoothTester
+import signal
+
+from utils import startupTimer
+
+with startupTimer.section("import program"):
+    from program import BarcodeSearcher, BluetoothTester
 
 
 def test():
@@ -12,6 +17,9 @@ def main():
     main func.
     """
     instance = BarcodeSearcher()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        # 현재 읽기가 끝나면 run 이 teardown(파이프라인, 블루투스, 미러 정리) 후 반환됨.
+        signal.signal(signum, lambda signum, frame: instance.stop())
     instance.run()
 
 
@@ -0,0 +1,255 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from threading import Event, Lock, Thread
+from time import perf_counter, time
+from typing import Final, Iterator
+
+from config import METRICS_EXPORT, METRICS_HOST, METRICS_INTERVAL, METRICS_PATH, METRICS_PORT
+
+MetricKeyT = tuple[str, tuple[tuple[str, str], ...]]    # (이름, 정렬된 (라벨, 값) 목록)
+
+NAMESPACE: Final[str] = "recyclehelper"
+SPAN_BUCKETS: Final[tuple[float, ...]] = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)   # 초
+
+
+def metricKey(name: str, labels: dict[str, object]) -> MetricKeyT:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def escapeLabel(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def formatLabels(labels: tuple[tuple[str, str], ...], **extra: str) -> str:
+    """
+    Prometheus 텍스트 형식의 라벨 표기. 라벨이 없으면 빈 문자열.
+    """
+    items: list[tuple[str, str]] = [*labels, *extra.items()]
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{escapeLabel(value)}"' for key, value in items) + "}"
+
+
+class SpanStats:
+    """
+    한 구간의 소요 시간 분포. Prometheus 히스토그램과 같은 누적 버킷으로 보관합니다.
+    """
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.buckets: list[int] = [0] * (len(SPAN_BUCKETS) + 1)     # 마지막 칸은 +Inf
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(SPAN_BUCKETS, seconds)] += 1
+
+
+class Metrics:
+    """
+    스테이션 실행 중의 카운터와 구간별 소요 시간을 모읍니다. 여러 스레드에서 함께 사용할 수 있습니다.
+    """
+    def __init__(self) -> None:
+        self.counters: dict[MetricKeyT, float] = {}
+        self.spans: dict[MetricKeyT, SpanStats] = {}
+        self.lock: Lock = Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: object) -> None:
+        """카운터를 늘립니다.
+
+        Args:
+            name (str): 카운터 이름. 내보낼 때 "_total" 이 붙습니다.
+            value (float, optional): 늘릴 값. 기본 값은 1 입니다.
+        """
+        key: MetricKeyT = metricKey(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: object) -> None:
+        """구간 소요 시간을 기록합니다.
+
+        Args:
+            name (str): 구간 이름.
+            seconds (float): 소요 시간(초).
+        """
+        key: MetricKeyT = metricKey(name, labels)
+        with self.lock:
+            stats: SpanStats | None = self.spans.get(key)
+            if stats is None:
+                stats = self.spans[key] = SpanStats()
+            stats.observe(seconds)
+
+    @contextmanager
+    def span(self, name: str, **labels: object) -> Iterator[None]:
+        """
+        with 문 블록의 소요 시간을 name 구간으로 기록합니다. 블록에서 예외가 발생해도 기록합니다.
+        """
+        started: float = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - started, **labels)
+
+    def prometheus(self) -> str:
+        """
+        Prometheus 텍스트 형식으로 변환한 현재 값.
+        """
+        lines: list[str] = []
+        with self.lock:
+            counters: list[tuple[MetricKeyT, float]] = sorted(self.counters.items())
+            spans: list[tuple[MetricKeyT, SpanStats]] = sorted(self.spans.items(), key=lambda item: item[0])
+            for name in dict.fromkeys(key[0] for key, _ in counters):
+                lines.append(f"# TYPE {NAMESPACE}_{name}_total counter")
+                for (counterName, labels), value in counters:
+                    if counterName == name:
+                        lines.append(f"{NAMESPACE}_{name}_total{formatLabels(labels)} {value:g}")
+            if spans:
+                lines.append(f"# TYPE {NAMESPACE}_span_seconds histogram")
+            for (name, labels), stats in spans:
+                spanLabels: tuple[tuple[str, str], ...] = (("span", name), *labels)
+                cumulative: int = 0
+                for bound, count in zip((*map(str, SPAN_BUCKETS), "+Inf"), stats.buckets):
+                    cumulative += count
+                    lines.append(f"{NAMESPACE}_span_seconds_bucket{formatLabels(spanLabels, le=bound)} {cumulative}")
+                lines.append(f"{NAMESPACE}_span_seconds_sum{formatLabels(spanLabels)} {stats.total:.6f}")
+                lines.append(f"{NAMESPACE}_span_seconds_count{formatLabels(spanLabels)} {stats.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        """
+        json으로 저장할 수 있는 현재 값. 구간마다 횟수, 합계, 평균, 최대 값(초)과 버킷별 누적 횟수를 담습니다.
+        """
+        def label(key: MetricKeyT) -> str:
+            return key[0] + formatLabels(key[1])
+
+        with self.lock:
+            return {
+                "timestamp": time(),
+                "counters": {label(key): value for key, value in sorted(self.counters.items())},
+                "spans": {
+                    label(key): {
+                        "count": stats.count,
+                        "sum": stats.total,
+                        "mean": stats.total / stats.count if stats.count else 0.0,
+                        "max": stats.max,
+                        "buckets": dict(zip((*map(str, SPAN_BUCKETS), "+Inf"), stats.buckets))
+                    }
+                    for key, stats in sorted(self.spans.items(), key=lambda item: item[0])
+                }
+            }
+
+
+metrics: Metrics = Metrics()
+
+
+class MetricsExporter(ABC):
+    """
+    수집한 값을 밖으로 내보내는 방식의 공통 인터페이스.
+    """
+
+    @abstractmethod
+    def start(self) -> None:
+        """
+        백그라운드에서 내보내기를 시작합니다.
+        """
+
+    @abstractmethod
+    def stop(self) -> None:
+        """
+        내보내기를 멈춥니다.
+        """
+
+
+class PrometheusExporter(MetricsExporter):
+    """
+    /metrics 주소로 Prometheus 텍스트 형식의 값을 제공하는 HTTP 서버.
+    """
+    def __init__(self, registry: Metrics, port: int, host: str = "127.0.0.1") -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body: bytes = registry.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread: Thread = Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class JsonFileExporter(MetricsExporter):
+    """
+    일정 주기마다 현재 값을 json 파일로 덮어씁니다. 파일은 항상 완전한 내용으로 바뀝니다.
+    """
+    def __init__(self, registry: Metrics, path: str, interval: float) -> None:
+        self.registry: Metrics = registry
+        self.path: str = path
+        self.interval: float = interval
+        self.stopped: Event = Event()
+        self.thread: Thread = Thread(target=self.run, name="metrics-json", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.write()
+
+    def write(self) -> None:
+        """
+        현재 값을 임시 파일에 쓴 뒤 교체합니다.
+        """
+        tmpPath: str = self.path + ".tmp"
+        with open(tmpPath, mode="wt", encoding="utf-8") as f:
+            json.dump(self.registry.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmpPath, self.path)
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+        self.write()    # 종료 직전까지의 값을 남김.
+
+
+def createExporter(kind: str = METRICS_EXPORT) -> MetricsExporter | None:
+    """설정에 맞는 내보내기 방식을 만듭니다.
+
+    Args:
+        kind (str, optional): 내보내기 방식. "prometheus", "json" 또는 내보내지 않는 "" 입니다.
+
+    Raises:
+        ValueError: 알 수 없는 내보내기 방식인 경우.
+
+    Returns:
+        MetricsExporter | None: 내보내기 객체. 내보내지 않으면 None.
+    """
+    match kind:
+        case "":
+            return None
+        case "prometheus":
+            return PrometheusExporter(metrics, METRICS_PORT, METRICS_HOST)
+        case "json":
+            return JsonFileExporter(metrics, METRICS_PATH, METRICS_INTERVAL)
+    raise ValueError(f"알 수 없는 지표 내보내기 방식입니다: {kind}")
@@ -0,0 +1,43 @@
+from argparse import ArgumentParser, Namespace
+from time import monotonic
+
+from config import I0030_MIRROR_PATH, I0030_SYNC_PAGE_SIZE
+from handlers.barcode_api import BarcodeHandler
+from storage.i0030_mirror import I0030Mirror, syncMirror
+
+
+def main():
+    """
+    식품안전나라 I0030 데이터셋을 내려받아, 품목보고번호 조회를 API 없이 할 수 있게 하는 동기화 명령.
+    """
+    parser: ArgumentParser = ArgumentParser(description="식품안전나라 I0030 데이터셋을 내려받거나, 지난 동기화 이후 수정된 행만 받습니다.")
+    parser.add_argument("--path", default=I0030_MIRROR_PATH or "./i0030.sqlite3", help="데이터셋을 저장할 파일 경로")
+    parser.add_argument("--page-size", type=int, default=I0030_SYNC_PAGE_SIZE, help="한 번에 요청할 행 수")
+    parser.add_argument("--full", action="store_true", help="진행 상황을 무시하고 전체 데이터셋을 처음부터 받습니다.")
+    args: Namespace = parser.parse_args()
+
+    barcode_api: BarcodeHandler = BarcodeHandler()
+    mirror: I0030Mirror = I0030Mirror(args.path)
+    resumed: str | None = None if args.full else mirror.state("cursor")
+    if resumed is not None:
+        print(f"중단된 동기화를 {resumed}번째 행부터 이어받습니다.")
+    else:
+        print(f"{mirror.state('synced_until') or '처음'} 이후 수정된 행을 받습니다.")
+
+    def progress(done: int, total: int) -> None:
+        print(f"{done}/{total}개 행 기록")
+
+    started: float = monotonic()
+    try:
+        received: int = syncMirror(mirror, barcode_api.api_page, args.page_size, args.full, progress)
+    finally:
+        barcode_api.teardown()
+    print(
+        f"{monotonic() - started:.1f}초 동안 {received}개 행을 받았습니다. "
+        f"저장된 행 {len(mirror)}개, 최신 수정 시각 {mirror.state('synced_until')}."
+    )
+    mirror.close()
+
+
+if __name__ == "__main__":
+    main()
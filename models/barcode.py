@@ -0,0 +1,45 @@
+from typing import Final
+
+GTIN_LENGTHS: Final[tuple[int, ...]] = (8, 12, 13, 14)     # EAN-8, UPC-A, EAN-13, GTIN-14
+
+
+def checkDigit(body: str) -> int:
+    """GTIN의 검증 숫자를 계산합니다. 오른쪽 끝 자리부터 3, 1을 번갈아 곱해 더한 값을 10의 배수로 맞춥니다.
+
+    Args:
+        body (str): 검증 숫자를 뺀 숫자열.
+
+    Returns:
+        int: 검증 숫자 (0 ~ 9).
+    """
+    total: int = 0
+    for i, digit in enumerate(reversed(body)):
+        total += int(digit) * (3 if i % 2 == 0 else 1)
+    return -total % 10
+
+
+def withCheckDigit(body: str) -> str:
+    """
+    검증 숫자를 뺀 숫자열 뒤에 검증 숫자를 붙입니다.
+    """
+    return body + str(checkDigit(body))
+
+
+def normalizeBarcode(code: str) -> str | None:
+    """EAN-8, UPC-A, EAN-13, GTIN-14 바코드의 검증 숫자를 확인하고, 하나의 캐시 키 형식으로 바꿉니다.
+    모든 형식을 앞에 0을 채운 GTIN-14로 맞춘 뒤, 맨 앞자리가 0이면(낱개 상품) 떼어낸 13자리를 키로 사용합니다.
+    그래서 같은 상품의 UPC-A와 EAN-13 표기는 같은 키가 되고, 기존 EAN-13 키는 그대로 유지됩니다.
+
+    Args:
+        code (str): 스캐너가 읽은 바코드.
+
+    Returns:
+        str | None: 13자리(묶음 상품은 14자리) 키. 숫자가 아니거나, 길이나 검증 숫자가 맞지 않으면 None.
+    """
+    code = code.strip()
+    if not code.isascii() or not code.isdigit() or len(code) not in GTIN_LENGTHS:
+        return None
+    if checkDigit(code[:-1]) != int(code[-1]):
+        return None
+    gtin14: str = code.zfill(14)
+    return gtin14[1:] if gtin14[0] == "0" else gtin14
@@ -1,4 +1,6 @@
 from enum import IntEnum
+import re
+from typing import Iterable
 
 
 class Material(IntEnum):
@@ -17,17 +19,128 @@ class Material(IntEnum):
 
 
 CountMap: dict[str, Material] = {
+    # 캔류 / 금속
     "CAN": Material.CAN,
     "금속": Material.CAN,
     "캔": Material.CAN,
+    "캔류": Material.CAN,
+    "알루미늄": Material.CAN,
+    "알루미늄캔": Material.CAN,
+    "알미늄": Material.CAN,
+    "알미늄캔": Material.CAN,
+    "ALUMINIUM": Material.CAN,
+    "ALUMINUM": Material.CAN,
+    "AL": Material.CAN,
+    "철": Material.CAN,
+    "철제": Material.CAN,
+    "철캔": Material.CAN,
+    "스틸": Material.CAN,
+    "스틸캔": Material.CAN,
+    "STEEL": Material.CAN,
+    # 플라스틱
     "PET": Material.PLASTIC,
+    "페트": Material.PLASTIC,
+    "페트병": Material.PLASTIC,
+    "PETE": Material.PLASTIC,
     "PVC": Material.PLASTIC,
     "PE": Material.PLASTIC,
+    "HDPE": Material.PLASTIC,
+    "LDPE": Material.PLASTIC,
     "PP": Material.PLASTIC,
     "PS": Material.PLASTIC,
     "PSP": Material.PLASTIC,
+    "OTHER": Material.PLASTIC,
+    "플라스틱": Material.PLASTIC,
+    "플라스틱병": Material.PLASTIC,
+    "합성수지": Material.PLASTIC,
+    "폴리에틸렌": Material.PLASTIC,
+    "폴리프로필렌": Material.PLASTIC,
+    # 종이
+    "종이": Material.PAPER,
+    "종이팩": Material.PAPER,
+    "지류": Material.PAPER,
+    "판지": Material.PAPER,
+    "골판지": Material.PAPER,
+    "카톤": Material.PAPER,
+    "PAPER": Material.PAPER,
+    # 유리
+    "유리": Material.GLASS,
+    "유리병": Material.GLASS,
+    "GLASS": Material.GLASS,
+    # 스티로폼
+    "스티로폼": Material.STYROFOAM,
+    "발포": Material.STYROFOAM,
+    "EPS": Material.STYROFOAM,
+    # 비닐
+    "비닐": Material.VINYLS,
+    "필름": Material.VINYLS,
+    "FILM": Material.VINYLS,
 }   # 최우선 재질을 결정하기 위한, 재질 표기별 재질 분류를 매핑으로 정리.
 
+WeightMap: dict[str, float] = {
+    "OTHER": 0.5,   # 복합재질 표기
+    "AL": 0.5,      # 파우치 등 다층 포장의 알루미늄 층
+    "철": 0.5,
+    "발포": 0.5,
+}   # 재질 표기별 가중치. 없는 표기는 1로 취급.
+
+ContextMap: dict[str, tuple[str, str]] = {
+    "캔": (r"(?<!스)", r"(?![가-힣])"),     # "스캔", "캔디", "캔버스" 제외. 붙여 쓴 표기는 "캔류", "알루미늄캔" 처럼 따로 등록
+    "철": ("", r"(?![가-힣])"),             # "철분" 제외. "강철" 은 일치
+}   # 다른 낱말 안에 자주 들어가는 짧은 한글 표기의 앞/뒤 조건 (정규식 lookaround).
+
+
+def compileMaterialPattern(terms: Iterable[str], contexts: dict[str, tuple[str, str]] | None = None) -> re.Pattern[str]:
+    """재질 표기 목록을 한 번에 검색하는 정규식으로 컴파일합니다.
+    영문 표기는 앞뒤가 영문자가 아닐 때만 일치시켜, "PET" 안의 "PE" 같은 부분 일치를 막습니다.
+
+    Args:
+        terms (Iterable[str]): 재질 표기 목록.
+        contexts (dict[str, tuple[str, str]] | None, optional): 표기 -> (앞 조건, 뒤 조건). 한글 표기의 부분 일치를 막을 때 사용합니다.
+
+    Returns:
+        re.Pattern[str]: 컴파일된 정규식.
+    """
+    contexts = contexts or {}
+    latin: list[str] = []
+    other: list[str] = []
+    for term in sorted(terms, key=len, reverse=True):   # 같은 위치에서는 긴 표기가 먼저 일치하도록.
+        if term.isascii():
+            latin.append(re.escape(term))
+        else:
+            before, after = contexts.get(term, ("", ""))
+            other.append(f"{before}{re.escape(term)}{after}")
+    alternatives: list[str] = []
+    if latin:
+        alternatives.append(rf"(?<![A-Za-z])(?:{'|'.join(latin)})(?![A-Za-z])")
+    if other:
+        alternatives.append(f"(?:{'|'.join(other)})")
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+materialPattern: re.Pattern[str] = compileMaterialPattern(CountMap, ContextMap)
+termLookup: dict[str, str] = {term.upper(): term for term in CountMap}   # 대소문자를 무시하고 일치한 텍스트 -> 표기
+
+
+def classifyMaterial(materialText: str) -> tuple[Material, float]:
+    """재질 표기를 분석해, 가중치 합이 가장 큰 재질 분류와 그 점수를 반환합니다.
+    점수가 같으면 표기에서 먼저 등장한 재질을 우선합니다.
+
+    Args:
+        materialText (str): 재질 표기 텍스트.
+
+    Returns:
+        tuple[Material, float]: 1순위 재질 분류와 점수. 알 수 있는 표기가 없으면 (Material.NORMAL, 0).
+    """
+    scores: dict[Material, float] = {}      # 등장 순서를 유지함.
+    for match in materialPattern.finditer(materialText):
+        term: str = termLookup[match.group().upper()]
+        mat: Material = CountMap[term]
+        scores[mat] = scores.get(mat, 0.0) + WeightMap.get(term, 1.0)
+    if not scores:
+        return Material.NORMAL, 0.0
+    best: Material = max(scores, key=lambda k: scores[k])
+    return best, scores[best]
 
 
 def parseMaterial(materialText: str) -> Material:
@@ -39,9 +152,23 @@ def parseMaterial(materialText: str) -> Material:
     Returns:
         Material: 1순위 재질 분류.
     """
-    counter: dict[Material, int] = {m: 0 for m in Material}
-    for check in CountMap:
-        if check in materialText:
-            counter[CountMap[check]] += 1
-    mat: Material = max(counter.keys(), key=lambda k: counter[k])
-    return mat
\ No newline at end of file
+    return classifyMaterial(materialText)[0]
+
+
+def parseMaterials(materialTexts: Iterable[str]) -> list[Material]:
+    """여러 재질 표기를 한 번에 분류합니다. 같은 표기는 한 번만 분석합니다.
+
+    Args:
+        materialTexts (Iterable[str]): 재질 표기 텍스트 목록.
+
+    Returns:
+        list[Material]: 입력 순서대로의 1순위 재질 분류 목록.
+    """
+    memo: dict[str, Material] = {}
+    result: list[Material] = []
+    for text in materialTexts:
+        mat: Material | None = memo.get(text)
+        if mat is None:
+            mat = memo[text] = parseMaterial(text)
+        result.append(mat)
+    return result
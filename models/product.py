@@ -14,3 +14,13 @@ class Product:
     prdlst_report_no: int      # 품목제조번호
     prdlst_nm: str             # 제품명
     rawmtrl_nm: str             # 품목유형(기능지표성분)
+
+
+@dataclass(slots=True, frozen=True)
+class LookupResult:
+    """
+    바코드 조회 결과. 분류 기준이 바뀌었을 때 다시 조회하지 않고 재분류할 수 있도록 원본 표기를 함께 담습니다.
+    """
+    material: Material          # 포장재질
+    prdlst_report_no: str       # 품목보고번호
+    frmlc_mtrqlt: str           # 원본 포장재질 표기
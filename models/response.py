@@ -134,4 +134,36 @@ class ProductResponse:
             INDIV_RAWMTRL_NM,
             ETC_RAWMTRL_NM,
             CAP_RAWMTRL_NM
-        )
\ No newline at end of file
+        )
+
+
+class LazyProductResponse:
+    """
+    건강기능식품 품목제조 신고사항 API 응답의 한 행을 감쌉니다.
+    재질 분류에 필요한 필드만 그때그때 꺼내 쓰고, 전체 필드가 필요할 때만 ProductResponse로 변환합니다.
+    """
+    __slots__ = ("row", "_full")
+
+    def __init__(self, row: dict[str, str]) -> None:
+        self.row: dict[str, str] = row
+        self._full: ProductResponse | None = None
+
+    @property
+    def prdlst_report_no(self) -> str:
+        return self.row.get("PRDLST_REPORT_NO", "")
+
+    @property
+    def frmlc_mtrqlt(self) -> str:
+        return self.row.get("FRMLC_MTRQLT") or ""
+
+    @property
+    def last_updt_dtm(self) -> str:
+        return self.row.get("LAST_UPDT_DTM") or ""
+
+    def full(self) -> ProductResponse:
+        """
+        모든 필드를 변환한 ProductResponse 객체. 처음 호출할 때 변환합니다.
+        """
+        if self._full is None:
+            self._full = ProductResponse.from_json(**self.row)
+        return self._full
\ No newline at end of file
@@ -0,0 +1,253 @@
+from collections import deque
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import perf_counter
+from traceback import print_exc
+
+from handlers.barcode_api import BarcodeHandler
+from handlers.bluetooth_handler import BluetoothHandler
+from metrics import metrics
+from models.material import Material
+from models.product import LookupResult
+from storage.backend import CacheEntry
+from utils import Debouncer
+
+
+def openBin(bluetooth_handler: BluetoothHandler, debouncer: Debouncer, barcode: str, mat: Material) -> None:
+    """스캔한 제품의 분리수거함을 엽니다. 같은 제품을 연달아 스캔해 같은 분리수거함을 열려 하면 무시합니다.
+    다른 제품은 같은 분리수거함이라도 항상 열고, 명령을 전달하지 못한 경우에는 다시 스캔하면 다시 엽니다.
+
+    Args:
+        bluetooth_handler (BluetoothHandler): 분리수거함 모듈 연결.
+        debouncer (Debouncer): 최근에 연 (바코드, 분리수거함) 기록.
+        barcode (str): 스캔한 바코드의 캐시 키.
+        mat (Material): 열 분리수거함.
+    """
+    key: tuple[str, Material] = (barcode, mat)
+    if debouncer.isRecent(key):
+        metrics.inc("bluetooth_debounced", bin=mat.name)
+        return
+
+    def sent(_: Material, ok: bool) -> None:
+        if ok:
+            debouncer.mark(key)     # 전달에 성공한 때부터 시간을 잼.
+    bluetooth_handler.call(mat, sent)
+
+
+@dataclass(slots=True)
+class ScanJob:
+    """
+    파이프라인을 통과하는 바코드 조회 작업 하나.
+    """
+    seq: int                            # 스캔 순서 (배출 순서를 맞추기 위해 사용)
+    barcode: str                        # 바코드 번호 (캐시 키)
+    code: str                           # 스캐너가 읽은 그대로의 바코드 (검색에 사용)
+    prdReportNos: list[str] = field(default_factory=list)   # 크롤링으로 얻은 품목보고번호 후보
+    material: Material | None = None    # 최종 재질. 조회에 실패하면 None
+    error: bool = False                 # 조회 중 예외가 발생했는지 여부 (조회 불가한 제품과 구분)
+    submittedAt: float = field(default_factory=perf_counter)    # 파이프라인에 들어온 시각 (perf_counter 값)
+
+
+class ScanPipeline:
+    """
+    바코드 조회를 크롤링 -> API 조회 -> 블루투스 호출 단계로 나누고, 각 단계를 크기가 제한된 큐로 연결합니다.
+    여러 바코드를 동시에 조회하되, 분리수거함 호출은 스캔한 순서대로 내보냅니다.
+    """
+    def __init__(
+            self,
+            barcode_api: BarcodeHandler,
+            bluetooth_handler: BluetoothHandler,
+            crawlWorkers: int = 2,
+            apiWorkers: int = 4,
+            queueSize: int = 16,
+            prewarm: bool = True,
+            deadline: float = 0.0,
+            fallback: Material = Material.NORMAL,
+            debouncer: Debouncer | None = None
+    ) -> None:
+        self.barcode_api: BarcodeHandler = barcode_api
+        self.deadline: float = deadline     # 스캔부터 분리수거함을 열 때까지 기다리는 최대 시간(초). 0 이하이면 조회가 끝날 때까지 기다림
+        self.fallback: Material = fallback  # 시간 안에 재질을 알아내지 못했거나 조회 불가한 제품일 때 열 분리수거함
+        self.debouncer: Debouncer = debouncer or Debouncer(0)   # 같은 제품을 연달아 스캔했을 때 분리수거함을 다시 열지 않기 위한 기록
+        self.prewarm: bool = prewarm    # 크롤링 스레드가 시작하자마자 조회 자원을 준비할지 여부
+        self.bluetooth_handler: BluetoothHandler = bluetooth_handler
+        self.crawlQueue: Queue[ScanJob | None] = Queue(queueSize)
+        self.apiQueue: Queue[ScanJob | None] = Queue(queueSize)
+        self.dispatchQueue: Queue[ScanJob | None] = Queue()   # 완료된 작업은 막힘 없이 넘겨야 하므로 제한하지 않음.
+        self.crawlers: list[Thread] = [
+            Thread(target=self.crawlStage, name=f"crawl-{i}", daemon=True) for i in range(crawlWorkers)
+        ]
+        self.apiCallers: list[Thread] = [
+            Thread(target=self.apiStage, name=f"api-{i}", daemon=True) for i in range(apiWorkers)
+        ]
+        self.dispatcher: Thread = Thread(target=self.dispatchStage, name="dispatch", daemon=True)
+        self.nextSeq: int = 0
+        self.issued: deque[ScanJob] = deque()     # 아직 분리수거함을 열지 않은 작업 (스캔 순서)
+        self.inflight: dict[str, list[ScanJob]] = {}    # 조회 중인 바코드 -> 같은 바코드로 뒤이어 들어온 작업
+        self.inflightLock: Lock = Lock()
+
+    def start(self) -> None:
+        """
+        모든 단계의 스레드를 시작합니다.
+        """
+        for thread in (*self.crawlers, *self.apiCallers, self.dispatcher):
+            thread.start()
+
+    def submit(self, barcode: str, code: str | None = None) -> None:
+        """바코드 조회 작업을 파이프라인에 넣습니다. 크롤링 큐가 가득 찬 경우 자리가 날 때까지 대기합니다.
+
+        Args:
+            barcode (str): normalizeBarcode로 바꾼 캐시 키.
+            code (str | None, optional): 스캐너가 읽은 그대로의 바코드. 없으면 barcode로 검색합니다.
+        """
+        job: ScanJob = ScanJob(self.nextSeq, barcode, code or barcode)
+        self.nextSeq += 1
+        self.issued.append(job)     # 크롤링 큐에서 기다리는 시간도 제한 시간에 포함되도록 먼저 등록.
+        self.crawlQueue.put(job)
+
+    def close(self) -> None:
+        """
+        남은 작업을 모두 처리한 뒤 단계별로 스레드를 종료합니다.
+        """
+        for _ in self.crawlers:
+            self.crawlQueue.put(None)
+        for thread in self.crawlers:
+            thread.join()
+        for _ in self.apiCallers:
+            self.apiQueue.put(None)
+        for thread in self.apiCallers:
+            thread.join()
+        self.dispatchQueue.put(None)
+        self.dispatcher.join()
+
+    def crawlStage(self) -> None:
+        """
+        캐시를 먼저 확인하고, 없으면 유통상품지식뱅크를 크롤링해 품목보고번호를 얻습니다.
+        """
+        try:
+            if self.prewarm:
+                try:
+                    self.barcode_api.warmUp()
+                except Exception:
+                    print_exc()     # 첫 조회 때 다시 준비하도록 두고 계속 진행.
+            while (job := self.crawlQueue.get()) is not None:
+                with self.inflightLock:
+                    followers: list[ScanJob] | None = self.inflight.get(job.barcode)
+                    if followers is None:
+                        self.inflight[job.barcode] = []
+                    else:
+                        followers.append(job)   # 같은 바코드를 조회 중이면 그 결과를 함께 받음.
+                if followers is not None:
+                    metrics.inc("coalesced", stage="pipeline")
+                    continue
+                try:
+                    entry: CacheEntry | None = self.barcode_api.search.lookup(job.barcode)
+                    if entry is not None:
+                        job.material = entry.material   # 조회 불가로 저장된 경우 None.
+                    else:
+                        job.prdReportNos = self.barcode_api.getPrdReportNos(job.code)
+                        if not job.prdReportNos:
+                            self.barcode_api.search.put(job.barcode, None)
+                except Exception:
+                    print_exc()
+                    job.error = True
+                if job.material is None and job.prdReportNos:
+                    self.apiQueue.put(job)
+                else:
+                    self.finish(job)
+        finally:
+            self.barcode_api.closeBrowser()   # 브라우저는 실행한 스레드에서 닫아야 함.
+
+    def apiStage(self) -> None:
+        """
+        품목보고번호로 식품안전나라 API를 조회해 재질을 알아내고, 결과를 캐시에 저장합니다.
+        """
+        while (job := self.apiQueue.get()) is not None:
+            try:
+                result: LookupResult | None = self.barcode_api.product_lookup_many(job.prdReportNos)
+                job.material = None if result is None else result.material
+                self.barcode_api.search.put(job.barcode, result)
+            except Exception:
+                print_exc()
+                job.error = True
+            self.finish(job)
+
+    def finish(self, job: ScanJob) -> None:
+        """조회를 마친 작업과, 조회 중에 같은 바코드로 들어온 작업을 배출 단계로 넘깁니다.
+
+        Args:
+            job (ScanJob): 조회를 실행한 작업.
+        """
+        with self.inflightLock:
+            followers: list[ScanJob] = self.inflight.pop(job.barcode, [])
+        self.dispatchQueue.put(job)
+        for follower in followers:
+            follower.material = job.material
+            follower.error = job.error
+            self.dispatchQueue.put(follower)
+
+    def untilDeadline(self) -> float | None:
+        """
+        스캔 순서상 다음 작업의 제한 시간까지 남은 시간(초). 제한 시간을 쓰지 않으면 None.
+        기다리는 작업이 없으면 제한 시간 전체를 돌려줍니다. 대기 중에 들어온 작업의 제한 시간은 그 뒤에 끝나므로, 깨어나서 다시 계산하면 늦지 않습니다.
+        """
+        if self.deadline <= 0:
+            return None
+        if not self.issued:
+            return self.deadline
+        return max(0.0, self.issued[0].submittedAt + self.deadline - perf_counter())
+
+    def dispatchStage(self) -> None:
+        """
+        완료된 작업을 스캔 순서대로 정렬해, 재질에 해당하는 분리수거함을 호출합니다.
+        스캔 순서상 다음 작업이 제한 시간 안에 끝나지 않으면 대체 분리수거함을 먼저 열고, 그 작업의 조회 결과는 캐시에만 남깁니다.
+        """
+        pending: dict[int, ScanJob] = {}
+        expired: set[int] = set()   # 대체 분리수거함을 이미 연 작업
+        running: bool = True
+        while running:
+            try:
+                job: ScanJob | None = self.dispatchQueue.get(timeout=self.untilDeadline())
+                if job is None:
+                    running = False     # 남은 작업은 모두 도착해 있음.
+                elif job.seq in expired:
+                    expired.discard(job.seq)
+                else:
+                    pending[job.seq] = job
+            except Empty:
+                pass    # 다음 작업의 제한 시간이 지남.
+            while self.issued:
+                head: ScanJob = self.issued[0]
+                if head.seq in pending:
+                    self.issued.popleft()
+                    self.dispatch(pending.pop(head.seq))
+                elif running and self.deadline > 0 and perf_counter() - head.submittedAt >= self.deadline:
+                    self.issued.popleft()
+                    expired.add(head.seq)
+                    self.dispatch(head, timedOut=True)
+                else:
+                    break
+
+    def dispatch(self, job: ScanJob, timedOut: bool = False) -> None:
+        """작업의 재질에 해당하는 분리수거함을 엽니다. 재질을 모르면 대체 분리수거함을 엽니다.
+
+        Args:
+            job (ScanJob): 분리수거함을 열 작업.
+            timedOut (bool, optional): 제한 시간 안에 조회가 끝나지 않았는지 여부.
+        """
+        mat: Material = self.fallback
+        result: str = "fallback"
+        if not timedOut:
+            if job.error:
+                result = "error"        # 조회에 실패함. 조회 불가로 저장하지 않았으므로 다음 스캔 때 다시 조회.
+            elif job.material is None:
+                result = "not_found"    # 조회 불가한 제품.
+            else:
+                mat, result = job.material, "found"
+        try:
+            openBin(self.bluetooth_handler, self.debouncer, job.barcode, mat)
+        except Exception:
+            print_exc()
+        metrics.observe("scan", perf_counter() - job.submittedAt)
+        metrics.inc("scans", result=result)
@@ -0,0 +1,126 @@
+from argparse import ArgumentParser, Namespace
+from queue import Queue
+from threading import Lock, Thread
+from time import monotonic
+
+from config import CRAWL_WORKERS
+from handlers.barcode_api import BarcodeHandler
+from models.barcode import normalizeBarcode
+from models.material import Material
+from storage.backend import CacheEntry
+from utils import RateLimiter
+
+
+def readBarcodes(path: str) -> dict[str, str]:
+    """바코드 목록 파일을 읽어옵니다. 한 줄에 바코드 하나이며, 빈 줄과 # 으로 시작하는 줄은 무시합니다.
+    GTIN 형식이 아니거나 검증 숫자가 맞지 않는 줄은 경고를 출력하고 건너뜁니다.
+
+    Args:
+        path (str): 바코드 목록 파일 경로.
+
+    Returns:
+        dict[str, str]: 캐시 키 -> 파일에 적힌 바코드. 같은 키의 바코드는 처음 것만 남기며, 파일에 적힌 순서를 유지합니다.
+    """
+    barcodes: dict[str, str] = {}
+    with open(path, mode="rt", encoding="utf-8") as f:
+        for line in f:
+            code: str = line.strip()
+            if not code or code.startswith("#"):
+                continue
+            barcode: str | None = normalizeBarcode(code)
+            if barcode is None:
+                print(f"올바른 GTIN 바코드가 아니므로 건너뜁니다: {code}")
+                continue
+            barcodes.setdefault(barcode, code)
+    return barcodes
+
+
+class Prefetcher:
+    """
+    바코드 목록을 여러 스레드에서 조회해 캐시를 미리 채웁니다.
+    조회 결과는 캐시에 바로 기록되므로, 중단 후 다시 실행하면 이미 캐시된 바코드는 건너뜁니다.
+    """
+    def __init__(self, barcode_api: BarcodeHandler, workers: int, limiter: RateLimiter) -> None:
+        self.barcode_api: BarcodeHandler = barcode_api
+        self.workers: int = workers
+        self.limiter: RateLimiter = limiter
+        self.queue: Queue[str | None] = Queue()
+        self.lock: Lock = Lock()
+        self.found: int = 0
+        self.notFound: int = 0
+        self.failed: list[str] = []     # 네트워크 오류 등으로 결과를 얻지 못한 바코드 (캐시되지 않으므로 다음 실행에서 재시도)
+
+    def run(self, barcodes: dict[str, str]) -> None:
+        """캐시에 없는 바코드만 골라 조회합니다.
+
+        Args:
+            barcodes (dict[str, str]): 캐시 키 -> 조회할 바코드. (readBarcodes)
+        """
+        cached: dict[str, CacheEntry] = self.barcode_api.search.lookupMany(barcodes)   # 저장소에 한 번에 요청.
+        pending: list[str] = [code for key, code in barcodes.items() if key not in cached]
+        print(f"전체 {len(barcodes)}개 중 캐시된 {len(barcodes) - len(pending)}개를 건너뛰고 {len(pending)}개를 조회합니다.")
+        for code in pending:
+            self.queue.put(code)
+        threads: list[Thread] = [Thread(target=self.work, name=f"prefetch-{i}") for i in range(self.workers)]
+        for thread in threads:
+            self.queue.put(None)
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def work(self) -> None:
+        """
+        큐에서 바코드를 꺼내 조회합니다. 스레드마다 브라우저를 따로 사용합니다.
+        """
+        try:
+            while (code := self.queue.get()) is not None:
+                self.limiter.acquire()
+                try:
+                    mat: Material = self.barcode_api.search(code)
+                except ValueError:
+                    with self.lock:
+                        self.notFound += 1
+                    continue
+                except Exception as e:
+                    print(f"{code} 조회 실패: {e!r}")
+                    with self.lock:
+                        self.failed.append(code)
+                    continue
+                with self.lock:
+                    self.found += 1
+                    done: int = self.found + self.notFound + len(self.failed)
+                if done % 50 == 0:
+                    print(f"{done}개 조회 완료 (마지막: {code} -> {mat.name})")
+        finally:
+            self.barcode_api.closeBrowser()   # 브라우저는 실행한 스레드에서 닫아야 함.
+
+
+def main():
+    """
+    바코드 목록 파일로 캐시를 미리 채우는 일괄 조회 명령.
+    """
+    parser: ArgumentParser = ArgumentParser(description="바코드 목록을 미리 조회해 캐시를 채웁니다.")
+    parser.add_argument("barcodes", help="한 줄에 바코드(EAN-8, UPC-A, EAN-13, GTIN-14) 하나씩 적힌 파일")
+    parser.add_argument("--workers", type=int, default=CRAWL_WORKERS, help="동시에 조회할 스레드 수 (스레드마다 브라우저 1개)")
+    parser.add_argument("--rate", type=float, default=1.0, help="초당 최대 조회 수. 0 이면 제한하지 않음")
+    parser.add_argument("--failed", default=None, help="조회에 실패한 바코드를 기록할 파일")
+    args: Namespace = parser.parse_args()
+
+    barcode_api: BarcodeHandler = BarcodeHandler()
+    prefetcher: Prefetcher = Prefetcher(barcode_api, args.workers, RateLimiter(args.rate))
+    started: float = monotonic()
+    try:
+        prefetcher.run(readBarcodes(args.barcodes))
+    finally:
+        barcode_api.teardown()
+    print(
+        f"{monotonic() - started:.1f}초 동안 조회 성공 {prefetcher.found}개, "
+        f"조회 불가 {prefetcher.notFound}개, 실패 {len(prefetcher.failed)}개."
+    )
+    if args.failed is not None and prefetcher.failed:
+        with open(args.failed, mode="wt", encoding="utf-8") as f:
+            f.write("\n".join(prefetcher.failed) + "\n")
+
+
+if __name__ == "__main__":
+    main()
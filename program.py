@@ -1,23 +1,33 @@
-from typing import Final
-from os import environ
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from time import perf_counter
+from traceback import print_exc
+from typing import cast, Final
 
 import serial
 import serial.tools.list_ports
 
-import bluetooth
-
+from config import (
+    API_WORKERS, BLUETOOTH_DEBOUNCE, BLUETOOTH_PORTS, BLUETOOTH_READY_TIMEOUT, CRAWL_WORKERS, PIPELINE_ENABLED, PIPELINE_QUEUE_SIZE, PREWARM,
+    SCAN_DEADLINE, SCAN_FALLBACK, SERIAL_BAUDRATE, SERIAL_CHECKSUM, SERIAL_MAX_FRAME, SERIAL_PORT, SERIAL_TIMEOUT
+)
 from handlers.barcode_api import BarcodeHandler
 from handlers.bluetooth_handler import BluetoothHandler, Module
+from handlers.serial_protocol import FrameReader
+from metrics import createExporter, metrics, MetricsExporter
 
+from models.barcode import normalizeBarcode
 from models.material import Material
 from models.response import BarcodeResponse, ProductResponse
 from models.product import Product
+from storage.backend import CacheEntry
+from pipeline import openBin, ScanPipeline
+from utils import Debouncer, startupTimer
 
-PORT: Final[str] = "/dev/ttyUSB0"
-BAUDRATE: Final[int] = 9600
-environ["FOOD_SAFETY_KR_API_KEY"] = "5c3691cdc5fb4104bc46"
+PORT: Final[str] = SERIAL_PORT
+BAUDRATE: Final[int] = SERIAL_BAUDRATE
 
 def lookUpNearbyBluetoothDevices():
+  import bluetooth    # 주변 기기 검색에만 필요하므로, 사용할 때 불러옴.
   nearby_devices = bluetooth.discover_devices()
   for bdaddr in nearby_devices:
     print(f"{bluetooth.lookup_name(bdaddr)}[{bdaddr}]")
@@ -35,10 +45,14 @@ class BluetoothTester:
         print("Connecting devices...")
         self.bluetooth_handler.connect(Material.NORMAL, test_module1)
         self.bluetooth_handler.connect(Material.GLASS, test_module2)
-        self.bluetooth_handler.pair(Material.NORMAL)
-        self.bluetooth_handler.pair(Material.GLASS)
-        from time import sleep
-        sleep(10)
+        for mat in (Material.NORMAL, Material.GLASS):
+            if not self.bluetooth_handler.supervisor.waitConnected(mat, BLUETOOTH_READY_TIMEOUT):
+                print(f"{mat.name} 모듈이 {BLUETOOTH_READY_TIMEOUT:.0f}초 안에 연결되지 않았습니다.")
+                continue
+            self.bluetooth_handler.pair(mat)
+        for mat in (Material.NORMAL, Material.GLASS):
+            if not self.bluetooth_handler.waitReady(mat, BLUETOOTH_READY_TIMEOUT):
+                print(f"{mat.name} 모듈이 준비되지 않았습니다.")
         print("Calling devices...")
         self.bluetooth_handler.call(Material.NORMAL)
         self.bluetooth_handler.call(Material.GLASS)
@@ -49,45 +63,116 @@ class BarcodeSearcher:
     바코드 번호를 사용해, 식품의약처 API로 제품의 포장 재질을 알아냅니다.
     """
     def __init__(self):
-        self.serial: serial.Serial = serial.Serial(PORT, BAUDRATE)  # 
-        self.barcode_api = BarcodeHandler()
-        self.bluetooth_handler = BluetoothHandler()
+        with startupTimer.section("serial open"):
+            # 제한 시간을 두어, 입력이 없을 때도 종료 요청을 확인할 수 있게 함.
+            self.serial: serial.Serial = serial.Serial(PORT, BAUDRATE, timeout=SERIAL_TIMEOUT)
+        self.reader: FrameReader = FrameReader(self.serial, SERIAL_MAX_FRAME, SERIAL_CHECKSUM)
+        self.reader.register("bc", self.barcodeTask, str.isdigit)      # 바코드 입력
+        self.reader.register("bt", self.bluetoothConnectionTask, str.isdigit)  # 블루투스 명령
+        self.running: bool = False
+        with startupTimer.section("handlers init"):
+            self.barcode_api = BarcodeHandler()     # 브라우저, 세션, 캐시는 첫 조회(또는 미리 준비) 때 초기화됨.
+            self.bluetooth_handler = BluetoothHandler()
+            for name, port in BLUETOOTH_PORTS.items():
+                self.bluetooth_handler.connect(Material[name], Module(port))     # 포트는 연결 감시 스레드에서 엶.
+        self.fallback: Material = Material[SCAN_FALLBACK]   # 시간 안에 재질을 알아내지 못했을 때 열 분리수거함
+        self.debouncer: Debouncer = Debouncer(BLUETOOTH_DEBOUNCE)   # 같은 제품을 연달아 스캔했을 때 분리수거함을 다시 열지 않음
+        self.pipeline: ScanPipeline | None = ScanPipeline(
+            self.barcode_api, self.bluetooth_handler, CRAWL_WORKERS, API_WORKERS, PIPELINE_QUEUE_SIZE, PREWARM,
+            SCAN_DEADLINE, self.fallback, self.debouncer
+        ) if PIPELINE_ENABLED else None
+        # 파이프라인을 쓰지 않을 때 조회를 실행하는 전용 스레드. 브라우저가 이 스레드에 묶이므로 미리 준비도 여기서 함.
+        self.lookupExecutor: ThreadPoolExecutor | None = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lookup"
+        ) if self.pipeline is None else None
+        self.metricsExporter: MetricsExporter | None = createExporter()
 
     def run(self):
         """
         서비스 가동.
         """
-        running: bool = True
-        while running:
-            line: bytes = self.serial.readline()   # 타임아웃을 지정하지 않았으므로, 시리얼로부터 완전한 한 줄 (바코드 번호 전체)를 받을때까지 대기.
-            data: str = line.decode("utf-8").strip()   # 바이트열을 문자열로 변환하고, 불필요한 공백을 제거.
-            header, body = data.split(":")
-            match header:
-                case "bc":
-                    # 바코드 입력
-                    self.barcodeTask(body)
-                case "bt":
-                    # 블루투스 명령
-                    self.bluetoothConnectionTask(body)
-            
-        self.teardown()
+        if self.pipeline is not None:
+            self.pipeline.start()   # 조회는 파이프라인 스레드에서, 이 스레드는 시리얼 입력만 담당.
+        elif PREWARM and self.lookupExecutor is not None:
+            self.lookupExecutor.submit(self.barcode_api.warmUp)    # 첫 스캔 전에 조회 스레드에서 미리 준비.
+        if self.metricsExporter is not None:
+            self.metricsExporter.start()
+        startupTimer.report()
+        self.running = True
+        try:
+            while self.running:
+                with metrics.span("serial_read"):   # 다음 입력을 기다린 시간도 포함됨.
+                    frames: list[tuple[str, str]] = list(self.reader.read())   # 버퍼에 쌓인 프레임을 한 번에 읽음.
+                for header, body in frames:
+                    try:
+                        self.reader.dispatch(header, body)
+                    except Exception:
+                        # 프레임 하나의 처리 실패로 서비스가 멈추지 않도록 함.
+                        metrics.inc("frame_errors", header=header)
+                        print_exc()
+        finally:
+            self.teardown()
+
+    def stop(self):
+        """
+        서비스 종료 요청. 진행 중인 읽기가 끝나면 run 이 teardown 후 반환됩니다.
+        """
+        self.running = False
 
     def teardown(self):
         """
         서비스 종료시 필요한 처리 핸들링.
         """
         self.serial.close()
+        if self.pipeline is not None:
+            self.pipeline.close()
+        if self.lookupExecutor is not None:
+            self.lookupExecutor.submit(self.barcode_api.closeBrowser).result()   # 브라우저는 실행한 스레드에서 닫아야 함.
+            self.lookupExecutor.shutdown()
         self.barcode_api.teardown()
+        self.bluetooth_handler.close()
+        if self.metricsExporter is not None:
+            self.metricsExporter.stop()
 
     def barcodeTask(self, body: str) -> None:
-        if not body.isdigit() or len(body) != 13:
+        barcode: str | None = normalizeBarcode(body)   # 오인식된 바코드는 캐시나 크롤링까지 가지 않도록 여기서 거름.
+        if barcode is None:
+            metrics.inc("scans", result="invalid")
+            return
+        if self.pipeline is not None:
+            self.pipeline.submit(barcode, body)  # 결과는 파이프라인이 기록.
             return
+        started: float = perf_counter()
+        mat: Material = self.fallback
+        result: str = "found"
         try:
-            mat: Material = self.barcode_api.search(body)
-            self.bluetooth_handler.call(mat)
+            # 캐시는 이 스레드에서 바로 확인해, 조회 스레드가 다른 바코드를 크롤링 중이어도 기다리지 않음.
+            entry: CacheEntry | None = self.barcode_api.search.lookup(barcode)
+            if entry is None:
+                lookup: Future[Material] = cast(ThreadPoolExecutor, self.lookupExecutor).submit(
+                    self.barcode_api.search.crawl, barcode, body   # 검색은 읽은 그대로의 바코드로.
+                )
+                mat = lookup.result(timeout=SCAN_DEADLINE or None)
+            elif entry.material is not None:
+                mat = entry.material
+            else:
+                metrics.inc("not_found", source="cache")
+                result = "not_found"
+        except FutureTimeoutError:
+            # 조회는 조회 스레드에서 계속 진행되어 결과가 캐시에 저장되므로, 같은 제품을 다시 스캔하면 바로 열림.
+            result = "fallback"
         except ValueError:
             # 조회 불가한 제품에 대한 처리.
-            return
+            result = "not_found"
+        except Exception:
+            print_exc()
+            result = "error"
+        try:
+            openBin(self.bluetooth_handler, self.debouncer, barcode, mat)
+        except Exception:
+            print_exc()     # 모듈을 연결하지 않은 경우 등. 스캔 기록은 남김.
+        metrics.observe("scan", perf_counter() - started)
+        metrics.inc("scans", result=result)
 
     def bluetoothConnectionTask(self, body: str) -> None:
         material = Material(int(body))
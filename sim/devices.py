@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field
+import os
+import pty
+from random import Random
+import select
+from threading import Lock, Thread
+from time import monotonic, sleep
+import tty
+
+from models.material import Material
+
+
+class PtyLink:
+    """
+    실제 장치 대신 사용할 가상 시리얼 포트. pty를 만들고, 고정된 경로에 심볼릭 링크를 걸어 둡니다.
+    프로그램은 링크 경로를 실제 포트처럼 열고, 시뮬레이터는 반대편(master)을 읽고 씁니다.
+    """
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.master: int = -1
+        self.slave: int = -1
+        self.open()
+
+    def open(self) -> None:
+        """
+        새 pty를 만들고 링크 경로가 가리키게 합니다.
+        """
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        tmpPath: str = self.path + ".tmp"
+        os.symlink(os.ttyname(self.slave), tmpPath)
+        os.replace(tmpPath, self.path)
+
+    def close(self) -> None:
+        """
+        pty를 닫고 링크를 지웁니다. 포트를 연 프로그램에는 연결이 끊긴 것으로 보입니다.
+        """
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        for fd in (self.master, self.slave):
+            if fd >= 0:
+                os.close(fd)
+        self.master = self.slave = -1
+
+    def write(self, data: bytes) -> None:
+        if self.master >= 0:
+            os.write(self.master, data)
+
+    def read(self, timeout: float) -> bytes:
+        """받은 내용을 읽습니다.
+
+        Args:
+            timeout (float): 최대 대기 시간(초).
+
+        Returns:
+            bytes: 받은 내용. 시간 안에 받은 내용이 없거나 포트가 닫혀 있으면 빈 바이트열.
+        """
+        master: int = self.master
+        if master < 0:
+            sleep(timeout)
+            return b""
+        try:
+            readable, _, _ = select.select([master], [], [], timeout)
+            return os.read(master, 1024) if readable else b""
+        except OSError:
+            return b""  # 읽는 도중 연결을 끊은 경우.
+
+
+def readScript(path: str) -> list[tuple[float | None, str]]:
+    """시리얼 입력 기록 파일을 읽어옵니다. 한 줄에 "bc:<바코드>" 또는 "bt:<재질 번호>" 하나이며,
+    앞에 기록 시작 후 경과 시간(초)을 적으면 그 시간에 맞춰 재생합니다. 빈 줄과 # 으로 시작하는 줄은 무시합니다.
+
+    Args:
+        path (str): 기록 파일 경로.
+
+    Returns:
+        list[tuple[float | None, str]]: (경과 시간 또는 None, 입력 줄) 목록.
+    """
+    script: list[tuple[float | None, str]] = []
+    with open(path, mode="rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            offset, _, data = line.rpartition(" ")
+            script.append((float(offset) if offset else None, data))
+    return script
+
+
+class ScannerSimulator:
+    """
+    바코드 스캐너 아두이노 흉내. 기록된 입력 줄을 정해진 속도로 가상 시리얼 포트에 씁니다.
+    """
+    def __init__(self, link: PtyLink, script: list[tuple[float | None, str]], rate: float, loops: int = 1) -> None:
+        self.link: PtyLink = link
+        self.script: list[tuple[float | None, str]] = script
+        self.rate: float = rate     # 초당 입력 줄 수. 0 이면 기록된 시간에 맞추고, 시간이 없으면 최대한 빠르게
+        self.loops: int = loops
+        self.sent: int = 0
+        self.sentAt: list[float] = []   # 줄마다 보낸 시각 (monotonic 값)
+        self.startedAt: float = 0.0
+        self.finishedAt: float = 0.0
+        self.thread: Thread = Thread(target=self.run, name="sim-scanner", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def run(self) -> None:
+        self.startedAt = monotonic()
+        for _ in range(self.loops):
+            loopStart: float = monotonic()
+            for offset, data in self.script:
+                if self.rate > 0:
+                    dueAt: float = self.startedAt + self.sent / self.rate
+                elif offset is not None:
+                    dueAt = loopStart + offset
+                else:
+                    dueAt = 0.0
+                delay: float = dueAt - monotonic()
+                if delay > 0:
+                    sleep(delay)
+                self.link.write(f"{data}\r\n".encode("utf-8"))
+                self.sentAt.append(monotonic())
+                self.sent += 1
+        self.finishedAt = monotonic()
+
+
+@dataclass(slots=True)
+class BinStats:
+    """
+    분리수거함 모듈 흉내가 받은 명령 통계.
+    """
+    commands: dict[str, int] = field(default_factory=dict)   # 명령 -> 받은 횟수
+    receivedAt: list[float] = field(default_factory=list)     # 명령을 받은 시각 (monotonic 값)
+    drops: int = 0                                            # 연결을 끊은 횟수
+
+
+class BinModuleSimulator:
+    """
+    분리수거함 블루투스 모듈 흉내. 받은 명령을 기록하고, 지연 후 응답을 보내며, 가끔 연결을 끊습니다.
+    """
+    def __init__(
+            self,
+            mat: Material,
+            link: PtyLink,
+            latency: float = 0.05,
+            ackToken: str = "",
+            dropRate: float = 0.0,
+            dropTime: float = 2.0,
+            seed: int | None = None
+    ) -> None:
+        self.mat: Material = mat
+        self.link: PtyLink = link
+        self.latency: float = latency       # 명령을 받은 뒤 응답하기까지의 평균 시간(초)
+        self.ackToken: str = ackToken       # 명령을 수행한 뒤 보낼 응답. 비워두면 응답하지 않음
+        self.dropRate: float = dropRate     # 명령을 받을 때마다 연결이 끊길 확률
+        self.dropTime: float = dropTime     # 연결이 끊겨 있는 시간(초)
+        self.random: Random = Random(seed)
+        self.stats: BinStats = BinStats()
+        self.lock: Lock = Lock()
+        self.running: bool = True
+        self.thread: Thread = Thread(target=self.run, name=f"sim-bin-{mat.name}", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self.thread.join()
+
+    def run(self) -> None:
+        while self.running:
+            data: bytes = self.link.read(0.1)
+            for cmd in data.decode("ascii", errors="replace"):
+                self.onCommand(cmd)
+
+    def onCommand(self, cmd: str) -> None:
+        """
+        명령 하나를 처리합니다. 응답은 지연 시간 뒤에 보냅니다.
+        """
+        with self.lock:
+            self.stats.commands[cmd] = self.stats.commands.get(cmd, 0) + 1
+            self.stats.receivedAt.append(monotonic())
+        if self.dropRate > 0 and self.random.random() < self.dropRate:
+            self.drop()
+            return
+        if self.ackToken:
+            sleep(self.random.uniform(0.5, 1.5) * self.latency)
+            self.link.write(self.ackToken.encode("ascii"))
+
+    def drop(self) -> None:
+        """
+        연결을 끊었다가 일정 시간 뒤에 다시 연결될 수 있게 합니다.
+        """
+        with self.lock:
+            self.stats.drops += 1
+        self.link.close()
+        sleep(self.dropTime)
+        self.link.open()
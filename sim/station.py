@@ -0,0 +1,92 @@
+from argparse import ArgumentParser, Namespace
+import os
+from subprocess import Popen
+import sys
+from tempfile import mkdtemp
+from time import monotonic, sleep
+
+from models.material import Material
+from sim.devices import BinModuleSimulator, PtyLink, ScannerSimulator, readScript
+
+
+def main():
+    """
+    실제 스캐너와 분리수거함 모듈 없이 스테이션을 실행하는 시뮬레이션 명령.
+    가상 시리얼 포트를 만든 뒤 기록된 입력을 재생하고, 분리수거함 모듈이 받은 명령을 집계합니다.
+    """
+    parser: ArgumentParser = ArgumentParser(description="가상 스캐너/분리수거함 모듈로 스테이션을 시험합니다.")
+    parser.add_argument("script", help='한 줄에 "bc:<바코드>" 또는 "bt:<재질 번호>" 하나씩 적힌 입력 기록 파일')
+    parser.add_argument("--rate", type=float, default=1.0, help="초당 입력 줄 수. 0 이면 기록된 시간에 맞춤")
+    parser.add_argument("--loops", type=int, default=1, help="입력 기록을 반복할 횟수")
+    parser.add_argument("--dir", default=None, help="가상 포트 링크를 만들 디렉터리. 기본은 임시 디렉터리")
+    parser.add_argument("--bins", default=",".join(mat.name for mat in Material), help="흉내낼 분리수거함 재질 이름 목록")
+    parser.add_argument("--latency", type=float, default=0.05, help="모듈이 명령에 응답하기까지의 평균 시간(초)")
+    parser.add_argument("--ack", default="", help="모듈이 명령을 수행한 뒤 보낼 응답. 비워두면 응답하지 않음")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="명령을 받을 때마다 모듈 연결이 끊길 확률")
+    parser.add_argument("--drop-time", type=float, default=2.0, help="모듈 연결이 끊겨 있는 시간(초)")
+    parser.add_argument("--seed", type=int, default=None, help="연결 끊김을 재현하기 위한 난수 시드")
+    parser.add_argument("--drain", type=float, default=5.0, help="입력을 모두 보낸 뒤 남은 명령을 기다리는 시간(초)")
+    parser.add_argument("--spawn", action="store_true", help="스테이션 프로그램을 가상 포트에 연결해 함께 실행")
+    args: Namespace = parser.parse_args()
+
+    linkDir: str = args.dir or mkdtemp(prefix="recyclehelper-sim-")
+    os.makedirs(linkDir, exist_ok=True)
+    scannerLink: PtyLink = PtyLink(os.path.join(linkDir, "scanner"))
+    bins: dict[Material, BinModuleSimulator] = {}
+    for name in args.bins.split(","):
+        mat: Material = Material[name.strip()]
+        bins[mat] = BinModuleSimulator(
+            mat, PtyLink(os.path.join(linkDir, f"bin-{mat.name}")),
+            args.latency, args.ack, args.drop_rate, args.drop_time, args.seed
+        )
+    env: dict[str, str] = {
+        "SERIAL_PORT": scannerLink.path,
+        "BLUETOOTH_PORTS": ",".join(f"{mat.name}={module.link.path}" for mat, module in bins.items()),
+        "BLUETOOTH_ACK": args.ack
+    }
+    for module in bins.values():
+        module.start()
+
+    station: Popen | None = None
+    if args.spawn:
+        station = Popen(
+            [sys.executable, "-c", "from main import main; main()"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=os.environ | env
+        )
+    else:
+        print("다음 환경 변수로 스테이션을 실행하세요:")
+        for key, value in env.items():
+            print(f"  {key}={value!r}")
+        input("스테이션이 준비되면 Enter 를 누르세요...")
+
+    scanner: ScannerSimulator = ScannerSimulator(scannerLink, readScript(args.script), args.rate, args.loops)
+    try:
+        scanner.start()
+        scanner.thread.join()
+        sleep(args.drain)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if station is not None:
+            station.terminate()
+            station.wait()
+        for module in bins.values():
+            module.stop()
+            module.link.close()
+        scannerLink.close()
+
+    elapsed: float = (scanner.finishedAt or monotonic()) - scanner.startedAt
+    print(f"입력 {scanner.sent}줄을 {elapsed:.1f}초 동안 보냄 ({scanner.sent / elapsed if elapsed else 0:.2f}줄/초)")
+    lastCommandAt: float = scanner.startedAt
+    for mat, module in bins.items():
+        if module.stats.receivedAt:
+            lastCommandAt = max(lastCommandAt, module.stats.receivedAt[-1])
+        print(f"  {mat.name}: 받은 명령 {module.stats.commands}, 연결 끊김 {module.stats.drops}회")
+    opened: int = sum(module.stats.commands.get("1", 0) for module in bins.values())
+    window: float = lastCommandAt - scanner.startedAt
+    print(f"분리수거함 열림 {opened}회 ({opened / window if window > 0 else 0:.2f}회/초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+from argparse import ArgumentParser, Namespace
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from random import Random
+import re
+from threading import Lock
+from time import sleep
+from urllib.parse import parse_qs, quote, urlsplit, SplitResult
+
+from config import PRODUCT_SEARCH_PARAM
+
+apiPathPattern = re.compile(r"^/api/[^/]+/I0030/json/(\d+)/(\d+)(?:/(PRDLST_REPORT_NO|CHNG_DT)=(\d+))?$")
+defaultFixturePath: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "services.json")
+
+
+class StubServices:
+    """
+    유통상품지식뱅크와 식품안전나라 I0030 API 대신 응답할 기록된 데이터. 응답 지연과 오류를 흉내냅니다.
+    """
+    def __init__(self, fixturePath: str = defaultFixturePath, latency: float = 0.0, errorRate: float = 0.0, seed: int | None = None) -> None:
+        with open(fixturePath, mode="rt", encoding="utf-8") as f:
+            fixture: dict = json.load(f)
+        self.products: dict[str, dict] = fixture.get("products", {})        # 바코드 -> {"name", "prdReportNos"}
+        self.i0030: dict[str, list[dict[str, str]]] = fixture.get("i0030", {})   # 품목보고번호 -> API 응답 행 목록
+        self.latency: float = latency       # 응답마다 추가할 평균 지연 시간(초)
+        self.errorRate: float = errorRate   # 503 응답을 보낼 확률
+        self.random: Random = Random(seed)
+        self.lock: Lock = Lock()            # Random은 스레드 안전하지 않음.
+
+    def delay(self) -> bool:
+        """응답 전에 지연 시간만큼 기다리고, 이번 요청을 오류로 응답할지 정합니다.
+
+        Returns:
+            bool: 오류로 응답해야 하는지 여부.
+        """
+        with self.lock:
+            wait: float = self.random.uniform(0.5, 1.5) * self.latency
+            fail: bool = self.random.random() < self.errorRate
+        if wait > 0:
+            sleep(wait)
+        return fail
+
+    def searchPage(self, barcode: str) -> str:
+        """
+        검색 결과 페이지. 유통상품지식뱅크의 검색창과 결과 목록 구조를 따릅니다.
+        """
+        product: dict | None = self.products.get(barcode)
+        if product is None:
+            result: str = "<p>검색결과가 없습니다.</p>"
+        else:
+            result = (
+                f'<ul><li class="spl_list"><a href="/products/info?prd={quote(barcode)}">'
+                f'{escape(product["name"])}</a></li></ul>'
+            )
+        return (
+            "<html><body>"
+            '<div class="header_searchV2"><form action="/products/search" method="get">'
+            f'<input id="searchText" name="{PRODUCT_SEARCH_PARAM}" value="{escape(barcode)}"><button type="submit">검색</button>'
+            f"</form></div>{result}</body></html>"
+        )
+
+    def detailPage(self, barcode: str) -> str | None:
+        """
+        상품 상세 페이지. 품목보고번호는 유통상품지식뱅크와 같이 표의 10번째 행에 둡니다.
+        """
+        product: dict | None = self.products.get(barcode)
+        if product is None:
+            return None
+        rows: list[tuple[str, str]] = [
+            ("상품명", product["name"]), ("바코드", barcode), ("제조사", ""), ("판매원", ""), ("원산지", ""),
+            ("용량", ""), ("보관방법", ""), ("유통기한", ""), ("식품유형", ""),
+            ("품목보고번호", ", ".join(product["prdReportNos"]))
+        ]
+        table: str = "".join(f"<tr><th>{escape(label)}</th><td>{escape(value)}</td></tr>" for label, value in rows)
+        return (
+            '<html><body><div class="sub_content2"><div><div class="pdv_korcharDetail"><div class="pdv_wrap_korcham">'
+            f"<table><tbody>{table}</tbody></table>"
+            "</div></div></div></div></body></html>"
+        )
+
+    def i0030Body(self, start: int, end: int, field: str | None = None, value: str = "") -> dict:
+        """
+        I0030 API 응답 본문. 실제 API와 같이 1부터 시작하는 행 범위로 나눠 돌려줍니다.
+        조건이 없으면 전체 데이터셋을, CHNG_DT 조건이면 그 날짜 이후 수정된 행을 품목보고번호 순서로 돌려줍니다.
+        """
+        rows: list[dict[str, str]]
+        if field == "PRDLST_REPORT_NO":
+            rows = self.i0030.get(value, [])
+        else:
+            rows = [row for key in sorted(self.i0030) for row in self.i0030[key]]
+            if field == "CHNG_DT":
+                rows = [row for row in rows if (row.get("LAST_UPDT_DTM") or "")[:10].replace("-", "") >= value]
+        if not rows:
+            return {"I0030": {"total_count": "0", "RESULT": {"MSG": "해당하는 데이터가 없습니다.", "CODE": "INFO-200"}}}
+        return {
+            "I0030": {
+                "total_count": str(len(rows)),
+                "row": rows[start - 1:end],
+                "RESULT": {"MSG": "정상처리되었습니다.", "CODE": "INFO-000"}
+            }
+        }
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    StubServices의 데이터로 검색/상세 페이지와 I0030 API 요청에 응답합니다.
+    """
+    server: "StubServer"
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        services: StubServices = self.server.services
+        if services.delay():
+            self.reply(503, "text/plain; charset=utf-8", "일시적인 오류")
+            return
+        url: SplitResult = urlsplit(self.path)
+        query: dict[str, list[str]] = parse_qs(url.query)
+        if url.path == "/products/search":
+            barcode: str = query.get(PRODUCT_SEARCH_PARAM, [""])[0]
+            self.reply(200, "text/html; charset=utf-8", services.searchPage(barcode))
+        elif url.path == "/products/info":
+            page: str | None = services.detailPage(query.get("prd", [""])[0])
+            if page is None:
+                self.reply(404, "text/html; charset=utf-8", "<html><body>없는 상품입니다.</body></html>")
+            else:
+                self.reply(200, "text/html; charset=utf-8", page)
+        elif (match := apiPathPattern.match(url.path)) is not None:
+            body: dict = services.i0030Body(int(match[1]), int(match[2]), match[3], match[4] or "")
+            self.reply(200, "application/json; charset=utf-8", json.dumps(body, ensure_ascii=False))
+        else:
+            self.reply(404, "text/plain; charset=utf-8", "찾을 수 없는 주소입니다.")
+
+    def reply(self, status: int, contentType: str, body: str) -> None:
+        data: bytes = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass    # 벤치마크 중 요청마다 출력하지 않음.
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    로컬 스텁 서버. 요청마다 스레드를 띄워 응답합니다.
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], services: StubServices) -> None:
+        self.services: StubServices = services
+        super().__init__(address, StubRequestHandler)
+
+    @property
+    def baseUrl(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environment(self) -> dict[str, str]:
+        """
+        BarcodeHandler가 이 서버를 사용하도록 설정하는 환경 변수.
+        """
+        return {
+            "PRODUCT_SEARCH_URL": f"{self.baseUrl}/products/search",
+            "FOOD_SAFETY_API_URL": f"{self.baseUrl}/api",
+            "FOOD_SAFETY_KR_API_KEY": "sample"
+        }
+
+
+def main():
+    """
+    외부 서비스 없이 조회 과정을 시험하기 위한 로컬 스텁 서버 실행 명령.
+    """
+    parser: ArgumentParser = ArgumentParser(description="유통상품지식뱅크와 식품안전나라 API를 흉내내는 로컬 서버를 실행합니다.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=defaultFixturePath, help="기록된 응답 데이터 파일")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답마다 추가할 평균 지연 시간(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답을 보낼 확률")
+    parser.add_argument("--seed", type=int, default=None, help="지연/오류를 재현하기 위한 난수 시드")
+    args: Namespace = parser.parse_args()
+
+    server: StubServer = StubServer(
+        (args.host, args.port), StubServices(args.fixtures, args.latency, args.error_rate, args.seed)
+    )
+    print(f"{server.baseUrl} 에서 대기 중. 다음 환경 변수로 스테이션을 실행하세요:")
+    for key, value in server.environment().items():
+        print(f"  {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
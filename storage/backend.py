@@ -0,0 +1,135 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from heapq import nsmallest
+from typing import Iterable, Iterator
+
+from models.material import Material
+
+
+@dataclass(slots=True, frozen=True)
+class CacheEntry:
+    """
+    캐시에 저장된 조회 결과 하나.
+    """
+    material: Material | None       # 재질. 조회 불가한 제품으로 확인된 경우 None
+    updatedAt: float                # 조회한 시각 (time.time() 값)
+    prdReportNo: str | None = None  # 품목보고번호
+    rawMaterial: str | None = None  # API 응답의 원본 포장재질 표기 (FRMLC_MTRQLT). 재분류에 사용
+
+
+class CacheBackend(ABC):
+    """
+    바코드 -> 재질 캐시를 저장하는 저장소의 공통 인터페이스.
+    """
+
+    @abstractmethod
+    def get(self, barcode: str) -> CacheEntry | None:
+        """저장된 조회 결과를 가져옵니다. 만료 여부는 확인하지 않습니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+
+        Returns:
+            CacheEntry | None: 저장된 조회 결과. 없을 경우 None.
+        """
+
+    @abstractmethod
+    def put(self, barcode: str, entry: CacheEntry) -> None:
+        """조회 결과를 저장합니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+            entry (CacheEntry): 저장할 조회 결과.
+        """
+
+    @abstractmethod
+    def entries(self) -> Iterator[tuple[str, CacheEntry]]:
+        """
+        조회 불가 결과를 포함해 저장된 모든 (바코드, 조회 결과) 쌍을 순회합니다.
+        """
+
+    def entriesAfter(self, after: str, limit: int) -> list[tuple[str, CacheEntry]]:
+        """바코드 순서로 after 다음의 항목을 limit개까지 가져옵니다. 저장된 항목을 나눠 순회할 때 사용합니다.
+        기본 구현은 전체 항목을 확인하므로, 순서대로 조회할 수 있는 저장소는 재정의해야 합니다.
+
+        Args:
+            after (str): 이 바코드보다 뒤의 항목만 가져옵니다. 빈 문자열이면 처음부터.
+            limit (int): 가져올 최대 항목 수.
+
+        Returns:
+            list[tuple[str, CacheEntry]]: 바코드 순으로 정렬된 (바코드, 조회 결과) 목록.
+        """
+        return nsmallest(
+            limit, ((barcode, entry) for barcode, entry in self.entries() if barcode > after), key=lambda item: item[0]
+        )
+
+    def getMany(self, barcodes: Iterable[str]) -> dict[str, CacheEntry]:
+        """여러 바코드의 조회 결과를 한꺼번에 가져옵니다.
+
+        Args:
+            barcodes (Iterable[str]): 바코드 번호 값 목록.
+
+        Returns:
+            dict[str, CacheEntry]: 바코드 -> 저장된 조회 결과. 저장되지 않은 바코드는 빠집니다.
+        """
+        found: dict[str, CacheEntry] = {}
+        for barcode in barcodes:
+            entry: CacheEntry | None = self.get(barcode)
+            if entry is not None:
+                found[barcode] = entry
+        return found
+
+    def putMany(self, entries: dict[str, CacheEntry]) -> None:
+        """여러 조회 결과를 한꺼번에 저장합니다.
+
+        Args:
+            entries (dict[str, CacheEntry]): 바코드 -> 저장할 조회 결과.
+        """
+        for barcode, entry in entries.items():
+            self.put(barcode, entry)
+
+    def items(self) -> Iterator[tuple[str, Material]]:
+        """
+        조회에 성공한 모든 (바코드, 재질) 쌍을 순회합니다.
+        """
+        for barcode, entry in self.entries():
+            if entry.material is not None:
+                yield barcode, entry.material
+
+    def updateMaterials(self, changes: dict[str, Material]) -> None:
+        """저장된 항목의 재질만 한꺼번에 바꿉니다. 조회 시각과 원본 표기는 유지합니다.
+
+        Args:
+            changes (dict[str, Material]): 바코드 -> 새 재질.
+        """
+        for barcode, mat in changes.items():
+            entry: CacheEntry | None = self.get(barcode)
+            if entry is not None:
+                self.put(barcode, CacheEntry(mat, entry.updatedAt, entry.prdReportNo, entry.rawMaterial))
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def open(self) -> None:
+        """
+        저장소를 미리 엽니다. 열지 않아도 처음 사용할 때 자동으로 열립니다.
+        """
+
+    def compact(self, positiveTtl: int = 0, negativeTtl: int = 0, negative: bool = True) -> int:
+        """유효 기간이 지난 항목을 지우고, 저장소의 불필요한 공간을 정리합니다. 저장소에 따라 아무 것도 하지 않을 수 있습니다.
+
+        Args:
+            positiveTtl (int, optional): 재질 조회 결과의 유효 기간(초). 0 이면 지우지 않음.
+            negativeTtl (int, optional): 조회 불가 결과의 유효 기간(초). 0 이면 지우지 않음.
+            negative (bool, optional): 조회 불가 결과를 남길지 여부. False 이면 유효 기간과 상관없이 모두 지움.
+
+        Returns:
+            int: 지운 항목 수.
+        """
+        return 0
+
+    def close(self) -> None:
+        """
+        저장소를 닫습니다.
+        """
@@ -0,0 +1,162 @@
+from argparse import ArgumentParser, Namespace
+import json
+import os
+from socketserver import StreamRequestHandler, ThreadingTCPServer, ThreadingUnixStreamServer
+from threading import Lock
+from time import time
+
+from config import CACHE_PATH, CACHE_POSITIVE_TTL, CACHE_SERVER
+from storage.backend import CacheBackend, CacheEntry
+from storage.json_backend import dumpEntry, loadEntry
+from storage.remote_backend import addressFamily, AddressT, parseAddress
+from utils import createCacheBackend
+
+
+class CacheService:
+    """
+    캐시 서버가 처리하는 요청. 한 줄에 json 하나로 받은 요청을 저장소에 적용하고 응답을 만듭니다.
+    """
+    def __init__(self, backend: CacheBackend, positiveTtl: int = CACHE_POSITIVE_TTL) -> None:
+        self.backend: CacheBackend = backend
+        self.positiveTtl: int = positiveTtl     # 조회 불가 결과로 덮어쓰지 않을 재질 조회 결과의 유효 기간. 0 이면 만료되지 않음
+        self.lock: Lock = Lock()    # 저장소 종류와 상관없이 여러 연결의 요청을 하나씩 적용함.
+
+    def keepPositive(self, entries: dict[str, CacheEntry]) -> dict[str, CacheEntry]:
+        """유효한 재질 조회 결과가 이미 저장된 바코드의 조회 불가 결과를 뺍니다.
+
+        한 스테이션의 일시적인 조회 실패가 다른 스테이션이 찾은 재질을 지우지 않도록 합니다.
+
+        Args:
+            entries (dict[str, CacheEntry]): 저장할 바코드 -> 조회 결과.
+
+        Returns:
+            dict[str, CacheEntry]: 실제로 저장할 바코드 -> 조회 결과.
+        """
+        negative: list[str] = [barcode for barcode, entry in entries.items() if entry.material is None]
+        if not negative:
+            return entries
+        stored: dict[str, CacheEntry] = self.backend.getMany(negative)
+        now: float = time()
+        return {
+            barcode: entry for barcode, entry in entries.items()
+            if not (
+                entry.material is None and barcode in stored and stored[barcode].material is not None
+                and (self.positiveTtl <= 0 or now - stored[barcode].updatedAt <= self.positiveTtl)
+            )
+        }
+
+    def handle(self, request: dict) -> dict:
+        """요청 하나를 처리합니다.
+
+        Args:
+            request (dict): {"op": 요청 종류, ...} 형식의 요청.
+
+        Returns:
+            dict: 응답 내용. 처리하지 못한 요청이면 {"error": 오류 내용}.
+        """
+        if request.get("op") == "entries":
+            # 저장소가 순서대로 한 묶음만 읽음. 오래 걸릴 수 있으므로 다른 스테이션의 get/put을 막지 않도록 잠그지 않음.
+            page: list[tuple[str, CacheEntry]] = self.backend.entriesAfter(
+                str(request.get("after", "")), int(request.get("limit", 1000))
+            )
+            return {"entries": [[barcode, dumpEntry(entry)] for barcode, entry in page]}
+        with self.lock:
+            match request.get("op"):
+                case "get":
+                    found: dict[str, CacheEntry] = self.backend.getMany(request["barcodes"])
+                    return {"entries": {barcode: dumpEntry(entry) for barcode, entry in found.items()}}
+                case "put":
+                    entries: dict[str, CacheEntry] = self.keepPositive(
+                        {barcode: loadEntry(value) for barcode, value in request["entries"].items()}
+                    )
+                    self.backend.putMany(entries)
+                    return {"stored": len(entries)}
+                case "len":
+                    return {"count": len(self.backend)}
+        return {"error": f"알 수 없는 요청입니다: {request.get('op')}"}
+
+
+class CacheRequestHandler(StreamRequestHandler):
+    """
+    연결 하나에서 들어오는 요청을 연결이 끊길 때까지 차례로 처리합니다.
+    """
+    server: "ThreadingUnixStreamServer | ThreadingTCPServer"
+
+    def handle(self) -> None:
+        service: CacheService = self.server.service     # type: ignore[attr-defined]
+        for line in self.rfile:
+            try:
+                reply: dict = service.handle(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                reply = {"error": f"잘못된 요청입니다: {e!r}"}
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class UnixCacheServer(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, service: CacheService) -> None:
+        self.service: CacheService = service
+        if os.path.exists(path):
+            os.unlink(path)     # 이전 실행이 남긴 소켓 파일.
+        super().__init__(path, CacheRequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class TcpCacheServer(ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], service: CacheService) -> None:
+        self.service: CacheService = service
+        self.address_family = addressFamily(address)    # 소켓을 만들기 전에 정해야 함.
+        super().__init__(address, CacheRequestHandler)
+
+
+def createCacheServer(address: str, backend: CacheBackend) -> UnixCacheServer | TcpCacheServer:
+    """캐시 서버를 만듭니다.
+
+    Args:
+        address (str): "unix:<소켓 경로>" 또는 "tcp:<루프백 호스트>:<포트>" 형식의 주소. IPv6 호스트는 대괄호로 감쌉니다.
+        backend (CacheBackend): 스테이션들이 함께 사용할 저장소.
+
+    Returns:
+        UnixCacheServer | TcpCacheServer: 주소 종류에 맞는 서버.
+    """
+    parsed: AddressT = parseAddress(address)
+    service: CacheService = CacheService(backend)
+    if isinstance(parsed, str):
+        return UnixCacheServer(parsed, service)
+    return TcpCacheServer(parsed, service)
+
+
+def main():
+    """
+    한 건물의 여러 스테이션이 조회 결과를 함께 쓰기 위한 캐시 서버 실행 명령.
+    """
+    parser: ArgumentParser = ArgumentParser(description="여러 스테이션이 함께 사용하는 바코드 캐시 서버를 실행합니다.")
+    parser.add_argument("--address", default=CACHE_SERVER, help='"unix:<소켓 경로>" 또는 "tcp:127.0.0.1:<포트>"')
+    parser.add_argument("--path", default=CACHE_PATH, help="캐시 저장소 파일 경로")
+    parser.add_argument("--backend", default="sqlite", choices=("sqlite", "json"), help="캐시 저장소 종류")
+    args: Namespace = parser.parse_args()
+
+    backend: CacheBackend = createCacheBackend(args.backend, args.path)
+    backend.open()
+    server: UnixCacheServer | TcpCacheServer = createCacheServer(args.address, backend)
+    print(f"{args.address} 에서 대기 중. ({len(backend)}개 항목)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import struct
+import sys
+from threading import Lock
+from typing import BinaryIO, Final, Iterable, Iterator
+
+from models.material import Material
+
+MAGIC: Final[bytes] = b"RHIX"
+VERSION: Final[int] = 1
+HEADER: Final[struct.Struct] = struct.Struct("<4sIQ")   # 매직, 버전, 항목 수. 16바이트라 뒤의 바코드 배열이 8바이트 정렬됨
+
+
+def packBarcode(barcode: str) -> int | None:
+    """바코드를 색인에 저장하는 64비트 정수로 바꿉니다. GTIN-14까지는 64비트 안에 들어갑니다.
+    정수로 바꾸므로 앞자리 0의 개수만 다른 바코드는 같은 값이 됩니다.
+
+    Args:
+        barcode (str): 바코드 번호 값.
+
+    Returns:
+        int | None: 정수 값. 숫자가 아니거나 14자리를 넘으면 None.
+    """
+    if not barcode.isdigit() or len(barcode) > 14:
+        return None
+    return int(barcode)
+
+
+class CompactIndexException(Exception):
+    """
+    색인 파일의 형식이 맞지 않는 경우 발생하는 오류.
+    """
+    msg: str
+
+    def __init__(self, msg: str):
+        self.msg = msg
+
+
+class CompactIndex:
+    """
+    대량의 바코드 -> 재질 목록을 작게 보관하는 읽기 전용 색인.
+    정렬한 64비트 바코드 배열(리틀 엔디언)과 같은 순서의 재질 바이트 배열을 파일에 두고, 메모리 매핑으로 열어 이진 탐색합니다.
+    항목당 9바이트만 사용하며, 파일을 읽어들이지 않으므로 항목 수와 상관없이 바로 열립니다.
+    """
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.missing: bool = not os.path.exists(path)  # 시작할 때 색인 파일이 없었는지 여부. 없으면 빈 색인으로 사용함
+        if self.missing:
+            print(f"색인 파일이 없어 빈 색인을 사용합니다: {path}")
+        self.file: BinaryIO | None = None
+        self.lock: Lock = Lock()
+        self.map: mmap.mmap | None = None
+        self.keys: memoryview | None = None         # uint64 바코드 (오름차순)
+        self.materials: memoryview | None = None    # 재질 값 (keys와 같은 순서)
+
+    def open(self) -> None:
+        """색인 파일을 메모리 매핑으로 엽니다. 만들 때 파일이 없었으면 빈 색인으로 엽니다.
+
+        Raises:
+            CompactIndexException: 색인 파일의 형식이 맞지 않는 경우.
+        """
+        with self.lock:
+            if self.map is not None or self.keys is not None:
+                return
+            if self.missing:
+                self.keys = memoryview(array("Q"))     # 조회할 때마다 파일을 다시 열어 보지 않음.
+                self.materials = memoryview(b"")
+                return
+            if sys.byteorder != "little":
+                raise CompactIndexException("색인 파일은 리틀 엔디언 기기에서만 사용할 수 있습니다.")
+            self.file = open(self.path, mode="rb")
+            size: int = os.fstat(self.file.fileno()).st_size
+            if size < HEADER.size:
+                self.file.close()
+                self.file = None
+                raise CompactIndexException(f"색인 파일이 너무 짧습니다: {self.path}")
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count = HEADER.unpack_from(self.map)
+            if magic != MAGIC or version != VERSION or size != HEADER.size + count * 9:
+                self.closeMap()
+                raise CompactIndexException(f"색인 파일의 형식이 맞지 않습니다: {self.path}")
+            view: memoryview = memoryview(self.map)
+            self.keys = view[HEADER.size:HEADER.size + count * 8].cast("Q")
+            self.materials = view[HEADER.size + count * 8:]
+            view.release()
+
+    def get(self, barcode: str) -> Material | None:
+        """색인에서 재질을 찾습니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+
+        Returns:
+            Material | None: 재질. 색인에 없으면 None.
+        """
+        key: int | None = packBarcode(barcode)
+        if key is None:
+            return None
+        if self.keys is None:
+            self.open()
+        keys: memoryview = self.keys
+        i: int = bisect_left(keys, key)
+        if i == len(keys) or keys[i] != key:
+            return None
+        return Material(self.materials[i])
+
+    def __contains__(self, barcode: str) -> bool:
+        return self.get(barcode) is not None
+
+    def __len__(self) -> int:
+        if self.keys is None:
+            self.open()
+        return len(self.keys)
+
+    def items(self) -> Iterator[tuple[int, Material]]:
+        """
+        색인의 모든 (바코드 정수 값, 재질) 쌍을 바코드 순서로 순회합니다.
+        """
+        if self.keys is None:
+            self.open()
+        for key, mat in zip(self.keys, self.materials):
+            yield key, Material(mat)
+
+    def close(self) -> None:
+        with self.lock:
+            self.closeMap()
+
+    def closeMap(self) -> None:
+        # 매핑을 닫기 전에 매핑을 가리키는 memoryview를 모두 놓아야 함.
+        for view in (self.keys, self.materials):
+            if view is not None:
+                view.release()
+        self.keys = self.materials = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def buildIndex(items: Iterable[tuple[str, Material]], path: str) -> int:
+    """(바코드, 재질) 목록으로 색인 파일을 만듭니다. 같은 파일을 열고 있는 프로세스가 있어도 안전하도록 파일을 교체합니다.
+
+    Args:
+        items (Iterable[tuple[str, Material]]): 색인에 넣을 (바코드, 재질) 쌍. 같은 바코드가 여러 번 나오면 마지막 값을 사용합니다.
+        path (str): 만들 색인 파일 경로.
+
+    Returns:
+        int: 색인에 넣은 항목 수. 숫자가 아니거나 14자리를 넘는 바코드는 빠집니다.
+    """
+    packed: dict[int, int] = {}
+    for barcode, mat in items:
+        key: int | None = packBarcode(barcode)
+        if key is not None:
+            packed[key] = int(mat)
+    keys: array = array("Q", sorted(packed))
+    materials: bytes = bytes(packed[key] for key in keys)
+    tmpPath: str = path + ".tmp"
+    with open(tmpPath, mode="wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys)))
+        keys.tofile(f)
+        f.write(materials)
+    os.replace(tmpPath, path)
+    return len(keys)
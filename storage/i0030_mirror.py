@@ -0,0 +1,155 @@
+import json
+import sqlite3
+from threading import RLock
+from typing import Callable, Iterable
+
+I0030PageFetcherT = Callable[[int, int, str], tuple[list[dict[str, str]], int]]   # (시작, 끝, 조건) -> (행 목록, 전체 행 수)
+
+
+def rowKey(row: dict[str, str]) -> tuple[str, str, str]:
+    """
+    행을 구분하는 키. 품목보고번호 하나에 여러 행이 있을 수 있으므로 인허가번호와 품목명을 함께 사용합니다.
+    """
+    return row.get("PRDLST_REPORT_NO") or "", row.get("LCNS_NO") or "", row.get("PRDLST_NM") or ""
+
+
+class I0030Mirror:
+    """
+    식품안전나라 I0030 데이터셋을 내려받아 둔 SQLite 저장소. 품목보고번호로 색인되어 있습니다.
+    행은 API 응답의 json 그대로 저장하고, 꺼낼 때도 필드를 변환하지 않습니다.
+    """
+    def __init__(self, path: str = "./i0030.sqlite3") -> None:
+        self.path: str = path
+        self.conn: sqlite3.Connection | None = None
+        self.lock: RLock = RLock()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        """
+        저장소 연결. 처음 접근할 때 파일을 열고, 테이블이 없으면 만듭니다.
+        """
+        with self.lock:
+            if self.conn is None:
+                conn: sqlite3.Connection = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS i0030 ("
+                    "report_no TEXT NOT NULL, "
+                    "lcns_no TEXT NOT NULL, "
+                    "prdlst_nm TEXT NOT NULL, "
+                    "last_updt TEXT NOT NULL, "
+                    "row TEXT NOT NULL, "
+                    "PRIMARY KEY (report_no, lcns_no, prdlst_nm)"
+                    ")"
+                )
+                conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                conn.commit()
+                self.conn = conn
+        return self.conn
+
+    def open(self) -> None:
+        self.db
+
+    def rows(self, prdReportNo: str) -> list[dict[str, str]]:
+        """품목보고번호에 해당하는 행을 모두 가져옵니다.
+
+        Args:
+            prdReportNo (str): 품목보고번호.
+
+        Returns:
+            list[dict[str, str]]: API 응답과 같은 형식의 행 목록. 없으면 빈 목록.
+        """
+        with self.lock:
+            found: list[tuple[str]] = self.db.execute(
+                "SELECT row FROM i0030 WHERE report_no = ?", (prdReportNo,)
+            ).fetchall()
+        return [json.loads(row) for row, in found]
+
+    def state(self, key: str) -> str | None:
+        with self.lock:
+            row: tuple[str] | None = self.db.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def savePage(self, rows: Iterable[dict[str, str]], progress: dict[str, str | None]) -> None:
+        """받은 페이지의 행과 동기화 진행 상황을 한 번에 기록합니다. 도중에 멈춰도 기록한 페이지 다음부터 이어받을 수 있습니다.
+
+        Args:
+            rows (Iterable[dict[str, str]]): API 응답 행 목록.
+            progress (dict[str, str | None]): 바꿀 진행 상황. 값이 None 이면 지웁니다.
+        """
+        with self.lock:
+            with self.db:   # 하나의 트랜잭션으로 커밋.
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO i0030 (report_no, lcns_no, prdlst_nm, last_updt, row) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (*rowKey(row), row.get("LAST_UPDT_DTM") or "", json.dumps(row, ensure_ascii=False))
+                        for row in rows
+                    )
+                )
+                for key, value in progress.items():
+                    if value is None:
+                        self.db.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+                    else:
+                        self.db.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM i0030").fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+def syncMirror(
+        mirror: I0030Mirror,
+        fetchPage: I0030PageFetcherT,
+        pageSize: int = 1000,
+        full: bool = False,
+        onPage: Callable[[int, int], None] | None = None
+) -> int:
+    """I0030 데이터셋을 페이지 단위로 받아 저장소에 기록합니다. 한 번에 한 페이지만 메모리에 둡니다.
+    지난 동기화 이후 수정된 행(LAST_UPDT_DTM 기준)만 받으며, 중단된 동기화가 있으면 그 위치부터 이어받습니다.
+
+    Args:
+        mirror (I0030Mirror): 기록할 저장소.
+        fetchPage (I0030PageFetcherT): API 한 페이지를 받아오는 함수.
+        pageSize (int, optional): 한 번에 받을 행 수.
+        full (bool, optional): 진행 상황을 무시하고 전체 데이터셋을 처음부터 받을지 여부.
+        onPage (Callable[[int, int], None] | None, optional): 페이지마다 (지금까지 받은 행 수, 전체 행 수)를 받을 함수.
+
+    Returns:
+        int: 이번 실행에서 받은 행 수.
+    """
+    syncedUntil: str | None = mirror.state("synced_until")   # 마지막으로 끝까지 받은 때의 최신 LAST_UPDT_DTM
+    cursor: str | None = None if full else mirror.state("cursor")
+    if cursor is not None:
+        start: int = int(cursor)
+        condition: str = mirror.state("condition") or ""
+        newest: str = mirror.state("newest") or ""
+    else:
+        start = 1
+        # 같은 날 수정된 행은 다시 받게 되지만, 같은 키로 덮어쓰므로 문제 없음.
+        condition = "" if full or syncedUntil is None else f"CHNG_DT={syncedUntil[:10].replace('-', '')}"
+        newest = syncedUntil or ""
+    received: int = 0
+    while True:
+        end: int = start + pageSize - 1
+        rows, total = fetchPage(start, end, condition)
+        received += len(rows)
+        newest = max([newest, *(row.get("LAST_UPDT_DTM") or "" for row in rows)])
+        done: bool = not rows or end >= total
+        mirror.savePage(rows, {
+            "cursor": None if done else str(end + 1),
+            "condition": None if done else condition,
+            "newest": None if done else newest,
+            "synced_until": newest if done and newest else syncedUntil
+        })
+        if onPage is not None:
+            onPage(start - 1 + len(rows), total)
+        if done:
+            return received
+        start = end + 1
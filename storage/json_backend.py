@@ -0,0 +1,108 @@
+import json
+from time import time
+from typing import Iterator
+
+from models.material import Material
+from storage.backend import CacheBackend, CacheEntry
+
+
+def dumpEntry(entry: CacheEntry) -> list:
+    """조회 결과를 json으로 저장할 수 있는 목록으로 변환합니다.
+
+    Args:
+        entry (CacheEntry): 조회 결과.
+
+    Returns:
+        list: [재질 번호 또는 null, 조회 시각, 품목보고번호, 원본 재질 표기]
+    """
+    return [None if entry.material is None else int(entry.material), entry.updatedAt, entry.prdReportNo, entry.rawMaterial]
+
+
+def loadEntry(value: list) -> CacheEntry:
+    """dumpEntry로 변환한 목록을 조회 결과로 되돌립니다. 품목보고번호와 원본 표기가 없는 목록도 받습니다.
+
+    Args:
+        value (list): [재질 번호 또는 null, 조회 시각, (품목보고번호, 원본 재질 표기)]
+
+    Returns:
+        CacheEntry: 조회 결과.
+    """
+    return CacheEntry(None if value[0] is None else Material(value[0]), *value[1:])
+
+
+def loadJsonCache(path: str) -> dict[str, CacheEntry]:
+    """json 캐시 파일의 내용을 불러옵니다.
+    값이 재질 번호 하나뿐인 기존 형식은 불러온 시각에 조회한 것으로 취급합니다.
+
+    Args:
+        path (str): 파일의 경로.
+
+    Returns:
+        dict[str, CacheEntry]: 캐시 파일의 json 내용을 불러온 딕셔너리 객체. 파일이 없으면 빈 딕셔너리.
+    """
+    try:
+        with open(path, mode="rt", encoding="utf-8") as f:
+            read: dict[str, int | list] = json.load(f)
+    except FileNotFoundError:
+        return {}
+    now: float = time()
+    loaded: dict[str, CacheEntry] = {}
+    for key, value in read.items():
+        if isinstance(value, list):
+            loaded[key] = loadEntry(value)
+        else:
+            loaded[key] = CacheEntry(Material(value), now)
+    return loaded
+
+
+class JsonCacheBackend(CacheBackend):
+    """
+    기존 crawl_cache.json 형식의 저장소. 전체 내용을 메모리에 올려두고, 닫을 때 파일 전체를 다시 씁니다.
+    """
+    def __init__(self, path: str = "./crawl_cache.json") -> None:
+        self.path: str = path
+        self.data: dict[str, CacheEntry] | None = None
+
+    @property
+    def cache(self) -> dict[str, CacheEntry]:
+        if self.data is None:
+            self.data = loadJsonCache(self.path)
+        return self.data
+
+    def open(self) -> None:
+        self.cache
+
+    def get(self, barcode: str) -> CacheEntry | None:
+        return self.cache.get(barcode)
+
+    def put(self, barcode: str, entry: CacheEntry) -> None:
+        self.cache[barcode] = entry
+
+    def entries(self) -> Iterator[tuple[str, CacheEntry]]:
+        yield from list(self.cache.items())
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def compact(self, positiveTtl: int = 0, negativeTtl: int = 0, negative: bool = True) -> int:
+        """
+        유효 기간이 지난 항목을 지웁니다. 파일에는 닫을 때 반영됩니다.
+        """
+        now: float = time()
+        expired: list[str] = [
+            barcode for barcode, entry in self.cache.items()
+            if (entry.material is None and not negative)
+            or (ttl := positiveTtl if entry.material is not None else negativeTtl) > 0 and now - entry.updatedAt > ttl
+        ]
+        for barcode in expired:
+            del self.cache[barcode]
+        return len(expired)
+
+    def close(self) -> None:
+        if self.data is None:
+            return  # 한 번도 열지 않았으면 쓸 내용도 없음.
+        with open(self.path, mode="wt", encoding="utf-8") as f:
+            json.dump(
+                {barcode: dumpEntry(entry) for barcode, entry in self.data.items()},
+                f, ensure_ascii=False, indent=2
+            )
@@ -0,0 +1,255 @@
+from contextlib import contextmanager
+from ipaddress import ip_address
+import json
+from queue import Empty, LifoQueue
+import socket
+from threading import BoundedSemaphore
+from time import monotonic
+from typing import BinaryIO, Iterable, Iterator
+
+from metrics import metrics
+from storage.backend import CacheBackend, CacheEntry
+from storage.json_backend import dumpEntry, loadEntry
+
+AddressT = str | tuple[str, int]    # 유닉스 소켓 경로 또는 (호스트, 포트)
+
+
+class CacheServerException(Exception):
+    """
+    캐시 서버가 요청을 처리하지 못했다고 응답한 경우 발생하는 오류.
+    """
+    msg: str
+
+    def __init__(self, msg: str):
+        self.msg = msg
+
+
+def parseAddress(address: str) -> AddressT:
+    """캐시 서버 주소를 읽습니다. 다른 기기에서 접근할 수 없도록, TCP 주소는 루프백만 허용합니다.
+
+    Args:
+        address (str): "unix:<소켓 경로>" 또는 "tcp:<호스트>:<포트>" 형식의 주소. IPv6 호스트는 "tcp:[::1]:<포트>" 처럼 씁니다.
+
+    Raises:
+        ValueError: 형식이 맞지 않거나, 루프백이 아닌 TCP 주소인 경우.
+
+    Returns:
+        AddressT: 유닉스 소켓 경로 또는 (호스트, 포트).
+    """
+    kind, _, rest = address.partition(":")
+    match kind:
+        case "unix":
+            if rest:
+                return rest
+        case "tcp":
+            host, _, port = rest.rpartition(":")
+            host = host.removeprefix("[").removesuffix("]")
+            if host and port.isdigit():
+                if host != "localhost" and not ip_address(host).is_loopback:
+                    raise ValueError(f"캐시 서버는 이 기기 안에서만 사용할 수 있습니다: {address}")
+                return host, int(port)
+    raise ValueError(f"알 수 없는 캐시 서버 주소입니다: {address}")
+
+
+def addressFamily(address: AddressT) -> int:
+    """주소에 맞는 소켓 종류를 고릅니다.
+
+    Args:
+        address (AddressT): parseAddress로 읽은 주소.
+
+    Returns:
+        int: socket.AF_UNIX, IPv6 호스트이면 socket.AF_INET6, 그 밖에는 socket.AF_INET.
+    """
+    if isinstance(address, str):
+        return socket.AF_UNIX
+    return socket.AF_INET6 if ":" in address[0] else socket.AF_INET
+
+
+class Connection:
+    """
+    캐시 서버와의 연결 하나. 요청과 응답은 한 줄에 json 하나씩 주고받습니다.
+    """
+    def __init__(self, address: AddressT, timeout: float) -> None:
+        self.sock: socket.socket = socket.socket(addressFamily(address), socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(address)
+        except OSError:
+            self.sock.close()
+            raise
+        self.stream: BinaryIO = self.sock.makefile("rwb")
+
+    def request(self, op: str, **payload) -> dict:
+        """요청을 보내고 응답을 받습니다.
+
+        Args:
+            op (str): 요청 종류. ("get", "put", "entries", "len")
+
+        Raises:
+            OSError: 연결이 끊기거나 응답이 제한 시간 안에 오지 않은 경우.
+            CacheServerException: 서버가 오류로 응답한 경우.
+
+        Returns:
+            dict: 응답 내용.
+        """
+        self.stream.write(json.dumps({"op": op, **payload}, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.stream.flush()
+        line: bytes = self.stream.readline()
+        if not line:
+            raise ConnectionResetError("캐시 서버가 연결을 닫았습니다.")
+        reply: dict = json.loads(line)
+        if "error" in reply:
+            raise CacheServerException(reply["error"])
+        return reply
+
+    def close(self) -> None:
+        self.stream.close()
+        self.sock.close()
+
+
+class ConnectionPool:
+    """
+    캐시 서버 연결을 재사용합니다. 동시에 열 수 있는 연결 수를 제한하며, 오류가 난 연결은 버립니다.
+    """
+    def __init__(self, address: AddressT, size: int, timeout: float) -> None:
+        self.address: AddressT = address
+        self.timeout: float = timeout
+        self.idle: LifoQueue[Connection] = LifoQueue()
+        self.slots: BoundedSemaphore = BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """
+        with 문 블록 동안 연결 하나를 빌려줍니다. 남는 연결이 없으면 새로 엽니다.
+        """
+        self.slots.acquire()
+        try:
+            try:
+                conn: Connection = self.idle.get_nowait()
+            except Empty:
+                conn = Connection(self.address, self.timeout)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()    # 응답을 다 읽지 못했을 수 있으므로 다시 쓰지 않음.
+                raise
+            self.idle.put(conn)
+        finally:
+            self.slots.release()
+
+    def request(self, op: str, **payload) -> dict:
+        with self.connection() as conn:
+            return conn.request(op, **payload)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except Empty:
+                return
+
+
+class RemoteCacheBackend(CacheBackend):
+    """
+    여러 스테이션이 함께 쓰는 캐시 서버(storage.cache_server)의 저장소.
+    이 기기의 저장소를 먼저 확인하고, 없으면 캐시 서버에서 가져와 이 기기에도 저장합니다.
+    새 조회 결과는 두 곳에 바로 기록합니다. 캐시 서버에 연결할 수 없으면 잠시 동안 이 기기의 저장소만 사용합니다.
+    """
+    def __init__(
+            self,
+            address: str,
+            local: CacheBackend | None = None,
+            poolSize: int = 4,
+            timeout: float = 1.0,
+            retryAfter: float = 5.0
+    ) -> None:
+        self.pool: ConnectionPool = ConnectionPool(parseAddress(address), poolSize, timeout)
+        self.local: CacheBackend | None = local     # 이 기기의 저장소. 캐시 서버가 멈춰도 조회 결과를 잃지 않도록 함
+        self.retryAfter: float = retryAfter         # 연결에 실패한 뒤 캐시 서버를 다시 시도하기까지 기다리는 시간(초)
+        self.downUntil: float = 0.0
+
+    def remote(self, op: str, **payload) -> dict | None:
+        """캐시 서버에 요청합니다. 연결할 수 없으면 None을 반환하고, retryAfter 동안 요청하지 않습니다.
+        서버가 요청을 거절한 경우는 그 요청만 실패로 처리하고, 다음 요청은 그대로 보냅니다.
+
+        Args:
+            op (str): 요청 종류.
+
+        Returns:
+            dict | None: 응답 내용. 캐시 서버를 사용할 수 없으면 None.
+        """
+        if monotonic() < self.downUntil:
+            return None
+        try:
+            return self.pool.request(op, **payload)
+        except OSError as e:
+            metrics.inc("cache_remote_errors", op=op)
+            print(f"캐시 서버 연결 실패 ({op}): {e!r}")
+            self.downUntil = monotonic() + self.retryAfter
+            return None
+        except (ValueError, CacheServerException) as e:
+            metrics.inc("cache_remote_errors", op=op)
+            print(f"캐시 서버 요청 실패 ({op}): {e!r}")    # 연결은 살아 있으므로 쉬지 않음.
+            return None
+
+    def open(self) -> None:
+        if self.local is not None:
+            self.local.open()
+
+    def get(self, barcode: str) -> CacheEntry | None:
+        return self.getMany((barcode,)).get(barcode)
+
+    def getMany(self, barcodes: Iterable[str]) -> dict[str, CacheEntry]:
+        codes: list[str] = list(barcodes)
+        found: dict[str, CacheEntry] = {} if self.local is None else self.local.getMany(codes)
+        missing: list[str] = [code for code in codes if code not in found]
+        if not missing:
+            return found
+        reply: dict | None = self.remote("get", barcodes=missing)
+        if reply is None:
+            return found
+        fetched: dict[str, CacheEntry] = {
+            barcode: loadEntry(value) for barcode, value in reply["entries"].items() if value is not None
+        }
+        metrics.inc("cache_remote_hits", len(fetched))
+        if fetched and self.local is not None:
+            self.local.putMany(fetched)
+        found.update(fetched)
+        return found
+
+    def put(self, barcode: str, entry: CacheEntry) -> None:
+        self.putMany({barcode: entry})
+
+    def putMany(self, entries: dict[str, CacheEntry]) -> None:
+        if self.local is not None:
+            self.local.putMany(entries)
+        self.remote("put", entries={barcode: dumpEntry(entry) for barcode, entry in entries.items()})
+
+    def entriesAfter(self, after: str, limit: int) -> list[tuple[str, CacheEntry]]:
+        reply: dict | None = self.remote("entries", after=after, limit=limit)
+        if reply is None:
+            return []
+        return [(barcode, loadEntry(value)) for barcode, value in reply["entries"]]
+
+    def entries(self, chunkSize: int = 1000) -> Iterator[tuple[str, CacheEntry]]:
+        last: str = ""
+        while page := self.entriesAfter(last, chunkSize):
+            yield from page
+            last = page[-1][0]
+
+    def __len__(self) -> int:
+        reply: dict | None = self.remote("len")
+        if reply is None:
+            return 0 if self.local is None else len(self.local)
+        return reply["count"]
+
+    def compact(self, positiveTtl: int = 0, negativeTtl: int = 0, negative: bool = True) -> int:
+        """
+        이 기기의 저장소만 정리합니다. 캐시 서버의 저장소는 서버가 있는 기기에서 정리합니다.
+        """
+        return 0 if self.local is None else self.local.compact(positiveTtl, negativeTtl, negative)
+
+    def close(self) -> None:
+        self.pool.close()
+        if self.local is not None:
+            self.local.close()
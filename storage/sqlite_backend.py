@@ -0,0 +1,191 @@
+import sqlite3
+from threading import RLock
+from time import time
+from typing import Iterable, Iterator
+
+from models.material import Material
+from storage.backend import CacheBackend, CacheEntry
+from storage.json_backend import loadJsonCache
+
+
+columns: tuple[str, ...] = ("barcode", "material", "updated_at", "report_no", "raw_material")
+upsertSql: str = f"INSERT OR REPLACE INTO crawl_cache ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+def toRow(barcode: str, entry: CacheEntry) -> tuple:
+    """조회 결과를 테이블의 한 행으로 변환합니다.
+
+    Args:
+        barcode (str): 바코드 번호 값.
+        entry (CacheEntry): 조회 결과.
+
+    Returns:
+        tuple: columns 순서의 행.
+    """
+    return (
+        barcode,
+        None if entry.material is None else int(entry.material),
+        entry.updatedAt,
+        entry.prdReportNo,
+        entry.rawMaterial
+    )
+
+
+def fromRow(row: tuple) -> CacheEntry:
+    """테이블의 한 행을 조회 결과로 변환합니다.
+
+    Args:
+        row (tuple): 바코드를 제외한 columns 순서의 행.
+
+    Returns:
+        CacheEntry: 조회 결과.
+    """
+    material, updatedAt, prdReportNo, rawMaterial = row
+    return CacheEntry(None if material is None else Material(material), updatedAt, prdReportNo, rawMaterial)
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    SQLite 파일에 바코드별로 한 행씩 저장하는 저장소.
+    새 항목은 즉시 파일에 기록되고, 시작할 때 전체 내용을 읽어들이지 않습니다.
+    """
+    def __init__(self, path: str = "./crawl_cache.sqlite3", legacyJsonPath: str | None = None) -> None:
+        self.path: str = path
+        self.legacyJsonPath: str | None = legacyJsonPath    # 저장소를 처음 만들 때 가져올 기존 json 캐시 파일
+        self.conn: sqlite3.Connection | None = None
+        self.lock: RLock = RLock()    # 여러 파이프라인 스레드에서 하나의 연결을 공유하기 위한 잠금
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        """
+        저장소 연결. 처음 접근할 때 파일을 열고, 테이블이 없으면 만듭니다.
+        """
+        with self.lock:
+            if self.conn is None:
+                conn: sqlite3.Connection = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")     # 항목마다 커밋해도 부담이 적도록.
+                conn.execute("PRAGMA synchronous=NORMAL")
+                created: bool = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name='crawl_cache'"
+                ).fetchone() is None
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS crawl_cache ("
+                    "barcode TEXT PRIMARY KEY, "
+                    "material INTEGER, "
+                    "updated_at REAL NOT NULL, "
+                    "report_no TEXT, "
+                    "raw_material TEXT"
+                    ")"
+                )
+                existing: set[str] = {row[1] for row in conn.execute("PRAGMA table_info(crawl_cache)")}
+                for column in ("report_no", "raw_material"):    # 원본 표기를 저장하기 전에 만든 저장소 갱신.
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE crawl_cache ADD COLUMN {column} TEXT")
+                conn.commit()
+                self.conn = conn
+                if created and self.legacyJsonPath is not None:
+                    self.importJson(self.legacyJsonPath)
+        return self.conn
+
+    def open(self) -> None:
+        self.db
+
+    def importJson(self, path: str) -> int:
+        """기존 json 캐시 파일의 내용을 저장소로 가져옵니다. 이미 있는 바코드는 덮어씁니다.
+
+        Args:
+            path (str): json 캐시 파일의 경로.
+
+        Returns:
+            int: 가져온 항목 수.
+        """
+        legacy: dict[str, CacheEntry] = loadJsonCache(path)
+        with self.lock:
+            self.db.executemany(upsertSql, (toRow(barcode, entry) for barcode, entry in legacy.items()))
+            self.db.commit()
+        return len(legacy)
+
+    def get(self, barcode: str) -> CacheEntry | None:
+        with self.lock:
+            row: tuple | None = self.db.execute(
+                "SELECT material, updated_at, report_no, raw_material FROM crawl_cache WHERE barcode = ?", (barcode,)
+            ).fetchone()
+        return None if row is None else fromRow(row)
+
+    def put(self, barcode: str, entry: CacheEntry) -> None:
+        with self.lock:
+            self.db.execute(upsertSql, toRow(barcode, entry))
+            self.db.commit()
+
+    def getMany(self, barcodes: Iterable[str], chunkSize: int = 500) -> dict[str, CacheEntry]:
+        codes: list[str] = list(dict.fromkeys(barcodes))
+        found: dict[str, CacheEntry] = {}
+        for i in range(0, len(codes), chunkSize):     # SQLite의 변수 개수 제한을 넘지 않도록 나눠 조회.
+            chunk: list[str] = codes[i:i + chunkSize]
+            with self.lock:
+                rows: list[tuple] = self.db.execute(
+                    f"SELECT {', '.join(columns)} FROM crawl_cache WHERE barcode IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            for row in rows:
+                found[row[0]] = fromRow(row[1:])
+        return found
+
+    def putMany(self, entries: dict[str, CacheEntry]) -> None:
+        with self.lock:
+            self.db.executemany(upsertSql, (toRow(barcode, entry) for barcode, entry in entries.items()))
+            self.db.commit()
+
+    def entriesAfter(self, after: str, limit: int) -> list[tuple[str, CacheEntry]]:
+        with self.lock:
+            rows: list[tuple] = self.db.execute(
+                f"SELECT {', '.join(columns)} FROM crawl_cache WHERE barcode > ? ORDER BY barcode LIMIT ?",
+                (after, limit)
+            ).fetchall()   # 기본 키 색인을 따라 필요한 행만 읽음.
+        return [(row[0], fromRow(row[1:])) for row in rows]
+
+    def entries(self, chunkSize: int = 1000) -> Iterator[tuple[str, CacheEntry]]:
+        last: str = ""
+        # 순회 도중 다른 스레드가 쓸 수 있도록, 잠금은 묶음 단위로만 잡음.
+        while page := self.entriesAfter(last, chunkSize):
+            yield from page
+            last = page[-1][0]
+
+    def updateMaterials(self, changes: dict[str, Material]) -> None:
+        with self.lock:
+            self.db.executemany(
+                "UPDATE crawl_cache SET material = ? WHERE barcode = ?",
+                ((int(mat), barcode) for barcode, mat in changes.items())
+            )
+            self.db.commit()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM crawl_cache").fetchone()[0]
+
+    def compact(self, positiveTtl: int = 0, negativeTtl: int = 0, negative: bool = True) -> int:
+        """
+        유효 기간이 지난 행을 지운 뒤, WAL 내용을 본 파일에 반영하고 삭제된 행이 차지하던 공간을 정리합니다.
+        """
+        now: float = time()
+        removed: int = 0
+        with self.lock:
+            with self.db:   # 하나의 트랜잭션으로 커밋.
+                if positiveTtl > 0:
+                    removed += self.db.execute(
+                        "DELETE FROM crawl_cache WHERE material IS NOT NULL AND updated_at < ?", (now - positiveTtl,)
+                    ).rowcount
+                if not negative:
+                    removed += self.db.execute("DELETE FROM crawl_cache WHERE material IS NULL").rowcount
+                elif negativeTtl > 0:
+                    removed += self.db.execute(
+                        "DELETE FROM crawl_cache WHERE material IS NULL AND updated_at < ?", (now - negativeTtl,)
+                    ).rowcount
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.db.execute("VACUUM")
+        return removed
+
+    def close(self) -> None:
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
@@ -0,0 +1,41 @@
+import pytest
+
+from models.barcode import checkDigit, normalizeBarcode, withCheckDigit
+
+
+def test_check_digit() -> None:
+    assert checkDigit("880111778400") == 3
+    assert checkDigit("03600029145") == 2     # UPC-A
+    assert checkDigit("9638507") == 4         # EAN-8
+    assert withCheckDigit("880111778400") == "8801117784003"
+
+
+@pytest.mark.parametrize(("code", "key"), [
+    ("8801117784003", "8801117784003"),     # EAN-13은 그대로
+    ("036000291452", "0036000291452"),      # UPC-A
+    ("96385074", "0000096385074"),          # EAN-8
+    ("00036000291452", "0036000291452"),    # 낱개 상품의 GTIN-14
+    ("10036000291459", "10036000291459"),   # 묶음 상품의 GTIN-14는 14자리 유지
+    (" 8801117784003\r\n", "8801117784003"),
+])
+def test_normalize_valid(code: str, key: str) -> None:
+    assert normalizeBarcode(code) == key
+
+
+def test_upc_and_ean_share_key() -> None:
+    assert normalizeBarcode("036000291452") == normalizeBarcode("0036000291452")
+
+
+@pytest.mark.parametrize("code", [
+    "8801117784009",    # 검증 숫자 오류
+    "036000291453",
+    "96385075",
+    "880111778400",     # 12자리지만 UPC-A 검증 숫자가 맞지 않음
+    "1234567",          # 지원하지 않는 길이
+    "123456789012345",
+    "88011177840O3",    # 숫자가 아닌 문자
+    "８８０１１１７７８４００３",  # 전각 숫자
+    "",
+])
+def test_normalize_invalid(code: str) -> None:
+    assert normalizeBarcode(code) is None
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import pytest
+
+from handlers.barcode_api import BarcodeHandler, chooseProductRow
+from models.material import Material
+from models.product import LookupResult
+from models.response import LazyProductResponse
+
+
+def row(prdReportNo: str, material: str, updated: str) -> LazyProductResponse:
+    return LazyProductResponse({"PRDLST_REPORT_NO": prdReportNo, "FRMLC_MTRQLT": material, "LAST_UPDT_DTM": updated})
+
+
+def test_choose_prefers_known_material() -> None:
+    known: LazyProductResponse = row("1", "종이", "20200101")
+    unknown: LazyProductResponse = row("2", "기타", "20240101")     # 더 최근이지만 알 수 있는 표기가 없음
+    assert chooseProductRow([unknown, known]) == (known, Material.PAPER)
+
+
+def test_choose_latest_among_known() -> None:
+    old: LazyProductResponse = row("1", "종이", "20200101")
+    new: LazyProductResponse = row("1", "PET", "20230505")
+    assert chooseProductRow([new, old]) == (new, Material.PLASTIC)
+    assert chooseProductRow([old, new]) == (new, Material.PLASTIC)
+
+
+def test_choose_unknown_only_and_empty() -> None:
+    unknown: LazyProductResponse = row("1", "", "")
+    assert chooseProductRow([unknown]) == (unknown, Material.NORMAL)
+    assert chooseProductRow([]) is None
+
+
+class StubHandler(BarcodeHandler):
+    """
+    API 대신 품목보고번호마다 정해 둔 행을 돌려주는 조회기.
+    """
+    def __init__(self, rows: dict[str, list[LazyProductResponse]]) -> None:
+        super().__init__()
+        self.rows: dict[str, list[LazyProductResponse]] = rows
+        self.requested: list[str] = []
+        self.lock: Lock = Lock()
+
+    def product_rows(self, prdReportNo: str) -> list[LazyProductResponse]:
+        with self.lock:
+            self.requested.append(prdReportNo)
+        return self.rows.get(prdReportNo, [])
+
+
+@pytest.fixture
+def handler(monkeypatch) -> StubHandler:
+    monkeypatch.setenv("FOOD_SAFETY_KR_API_KEY", "test")
+    return StubHandler({
+        "1": [row("1", "기타", "20240101")],
+        "2": [row("2", "유리", "20190101"), row("2", "캔", "20210101")],
+    })
+
+
+def test_lookup_many_chooses_across_candidates(handler: StubHandler) -> None:
+    assert handler.product_lookup_many(["1", "2", "1", "3"]) == LookupResult(Material.CAN, "2", "캔")
+    assert sorted(handler.requested) == ["1", "2", "3"]     # 같은 번호는 한 번만 요청
+
+
+def test_lookup_many_without_rows(handler: StubHandler) -> None:
+    assert handler.product_lookup_many(["3"]) is None
+    assert handler.product_lookup_many([]) is None
+
+
+def test_lookups_share_one_executor(handler: StubHandler) -> None:
+    handler.product_lookup_many(["1", "2"])
+    executor: ThreadPoolExecutor = handler.executor
+    handler.product_lookup_many(["2", "3"])
+    assert handler.executor is executor     # 조회마다 스레드 풀을 새로 만들지 않음
+    handler.teardown()
+    assert handler._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)              # 정리할 때 스레드 풀도 종료
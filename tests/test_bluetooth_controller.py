@@ -0,0 +1,188 @@
+import socket
+from threading import Event, Thread
+
+import pytest
+
+from handlers.bluetooth_controller import BluetoothController
+from models.material import Material
+
+
+class FakeModule:
+    """
+    소켓 한 쌍으로 흉내 낸 분리수거함 모듈. 반대쪽 끝은 FakeDevice가 사용합니다.
+    """
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock: socket.socket = sock
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def send(self, data: str) -> None:
+        self.sock.sendall(data.encode("ASCII"))
+
+    def receive(self) -> str:
+        return self.sock.recv(64).decode("ASCII")
+
+
+class ClosedModule:
+    """
+    등록하기 전에 연결 감시가 포트를 닫은 모듈.
+    """
+    def fileno(self) -> int:
+        raise ConnectionError("포트가 닫혀 있습니다.")
+
+
+class FakeDevice(Thread):
+    """
+    받은 명령을 기록하고, 처음 drop 번은 무시한 뒤 응답 토큰을 돌려주는 장치.
+    """
+    def __init__(self, sock: socket.socket, ack: bytes, drop: int = 0) -> None:
+        super().__init__(daemon=True)
+        self.sock: socket.socket = sock
+        self.ack: bytes = ack
+        self.drop: int = drop
+        self.commands: list[bytes] = []
+
+    def run(self) -> None:
+        while data := self.sock.recv(64):
+            self.commands.append(data)
+            if self.drop > 0:
+                self.drop -= 1
+            elif self.ack:
+                for i in range(len(self.ack)):     # 응답이 나눠 들어와도 찾을 수 있어야 함.
+                    self.sock.sendall(self.ack[i:i + 1])
+
+
+class Results:
+    def __init__(self, expected: int = 1) -> None:
+        self.done: list[tuple[Material, bool]] = []
+        self.expected: int = expected
+        self.event: Event = Event()
+
+    def __call__(self, mat: Material, ok: bool) -> None:
+        self.done.append((mat, ok))
+        if len(self.done) >= self.expected:
+            self.event.set()
+
+    def wait(self) -> list[tuple[Material, bool]]:
+        assert self.event.wait(5)
+        return self.done
+
+
+@pytest.fixture
+def pair():
+    ours, theirs = socket.socketpair()
+    yield ours, theirs
+    ours.close()
+    theirs.close()
+
+
+def startController(ack: str = "OK", retries: int = 2, queueSize: int = 8) -> BluetoothController:
+    controller: BluetoothController = BluetoothController(ack, ackTimeout=0.2, retries=retries, queueSize=queueSize)
+    controller.start()
+    return controller
+
+
+def test_ack_completes_command(pair) -> None:
+    ours, theirs = pair
+    device: FakeDevice = FakeDevice(theirs, b"OK")
+    device.start()
+    controller: BluetoothController = startController()
+    controller.attach(Material.CAN, FakeModule(ours))
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert results.wait() == [(Material.CAN, True)]
+    controller.stop()
+    assert device.commands == [b"1"]
+
+
+def test_resends_until_ack(pair) -> None:
+    ours, theirs = pair
+    device: FakeDevice = FakeDevice(theirs, b"OK", drop=2)
+    device.start()
+    controller: BluetoothController = startController(retries=2)
+    controller.attach(Material.CAN, FakeModule(ours))
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert results.wait() == [(Material.CAN, True)]
+    controller.stop()
+    assert device.commands == [b"1"] * 3
+
+
+def test_fails_after_retries(pair) -> None:
+    ours, theirs = pair
+    device: FakeDevice = FakeDevice(theirs, b"")
+    device.start()
+    controller: BluetoothController = startController(retries=1)
+    controller.attach(Material.CAN, FakeModule(ours))
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert results.wait() == [(Material.CAN, False)]
+    controller.stop()
+    assert device.commands == [b"1"] * 2
+
+
+def test_without_ack_token_write_is_enough(pair) -> None:
+    ours, theirs = pair
+    controller: BluetoothController = startController(ack="")
+    controller.attach(Material.CAN, FakeModule(ours))
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert results.wait() == [(Material.CAN, True)]
+    controller.stop()
+    assert theirs.recv(64) == b"1"
+
+
+def test_unattached_bin_fails_immediately() -> None:
+    controller: BluetoothController = startController()
+    results: Results = Results()
+    controller.send(Material.GLASS, "1", results)
+    assert results.wait() == [(Material.GLASS, False)]
+    controller.stop()
+
+
+def test_full_queue_rejects_and_stop_fails_pending(pair) -> None:
+    ours, theirs = pair     # 장치가 응답하지 않아 첫 명령이 계속 응답을 기다림
+    controller: BluetoothController = startController(retries=100, queueSize=1)
+    controller.attach(Material.CAN, FakeModule(ours))
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    theirs.settimeout(5)
+    assert theirs.recv(64) == b"1"
+    for _ in range(2):
+        controller.send(Material.CAN, "1", results)     # 하나는 대기열에 들어가고, 하나는 넘침
+    assert results.wait() == [(Material.CAN, False)]
+    controller.stop()
+    assert results.done == [(Material.CAN, False)] * 3
+
+
+def test_attach_closed_port_reports_link_down() -> None:
+    controller: BluetoothController = startController()
+    down: list[Material] = []
+    reported: Event = Event()
+    controller.onLinkDown = lambda mat, error: (down.append(mat), reported.set())
+    controller.attach(Material.CAN, ClosedModule())
+    assert reported.wait(5)
+    assert down == [Material.CAN]
+    results: Results = Results()
+    controller.send(Material.GLASS, "1", results)   # 컨트롤러 스레드는 계속 동작함
+    assert results.wait() == [(Material.GLASS, False)]
+    assert controller.thread.is_alive()
+    controller.stop()
+
+
+def test_send_after_stop_fails() -> None:
+    controller: BluetoothController = startController()
+    controller.stop()
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert results.wait() == [(Material.CAN, False)]
+    controller.attach(Material.CAN, ClosedModule())     # 다른 작업도 예외 없이 무시됨
+    controller.stop()
+
+
+def test_wake_pipe_does_not_block_sender() -> None:
+    controller: BluetoothController = BluetoothController()     # 루프를 시작하지 않아 깨우기 신호가 쌓이기만 함
+    for _ in range(100000):
+        controller.expect(Material.CAN)
+    controller.stop()
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("serial")   # handlers.bluetooth_handler
+
+from handlers.bluetooth_handler import BluetoothHandler, Module
+from models.material import Material
+
+
+@pytest.fixture
+def handler():
+    handler: BluetoothHandler = BluetoothHandler()
+    handler.sent: list[Material] = []
+    handler.controller.send = lambda mat, command, onDone=None: handler.sent.append(mat)
+    for mat in (Material.CAN, Material.PAPER):
+        handler.devices[mat] = object()     # 포트를 열지 않고 연결된 것으로 둠
+    yield handler
+    handler.close()
+
+
+def test_call_always_sends(handler: BluetoothHandler) -> None:
+    for mat in (Material.CAN, Material.CAN, Material.PAPER):
+        handler.call(mat)
+    assert handler.sent == [Material.CAN, Material.CAN, Material.PAPER]     # 거르는 일은 openBin이 함
+
+
+def test_module_does_not_reopen_closed_port() -> None:
+    module: Module = Module("/dev/missing-bin")
+    for use in (module.fileno, module.receive, lambda: module.send("1")):
+        with pytest.raises(ConnectionError):
+            use()
+    assert module.ser is None   # 포트는 연결 감시 스레드만 엶
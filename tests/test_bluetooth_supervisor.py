@@ -0,0 +1,134 @@
+import socket
+from threading import Event
+
+from handlers.bluetooth_controller import BluetoothController
+from handlers.bluetooth_supervisor import LinkSupervisor
+from models.material import Material
+
+
+class FlakyModule:
+    """
+    처음 몇 번은 열기에 실패하고, 열 때마다 새 소켓 한 쌍으로 장치를 흉내 내는 모듈.
+    """
+    def __init__(self, failures: int = 0) -> None:
+        self.port: str = "fake"
+        self.failures: int = failures
+        self.opens: int = 0
+        self.sock: socket.socket | None = None
+        self.peer: socket.socket | None = None
+        self.opened: Event = Event()
+
+    def open(self) -> socket.socket:
+        if self.sock is None:
+            self.opens += 1
+            if self.failures > 0:
+                self.failures -= 1
+                raise OSError("장치 없음")
+            self.sock, self.peer = socket.socketpair()
+            self.peer.settimeout(5)
+            self.opened.set()
+        return self.sock
+
+    def close(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def fileno(self) -> int:
+        return self.open().fileno()
+
+    def send(self, data: str) -> None:
+        self.open().sendall(data.encode("ASCII"))
+
+    def receive(self) -> str:
+        data: bytes = self.open().recv(64)
+        if not data:
+            raise ConnectionResetError("장치 연결 끊김")
+        return data.decode("ASCII")
+
+    def unplug(self) -> socket.socket:
+        """
+        장치 쪽 연결을 끊고, 다음에 열 때까지 기다릴 수 있도록 표시를 지웁니다.
+        """
+        peer: socket.socket = self.peer
+        self.opened.clear()
+        peer.close()
+        return peer
+
+
+class Results:
+    def __init__(self) -> None:
+        self.done: list[bool] = []
+        self.event: Event = Event()
+
+    def __call__(self, mat: Material, ok: bool) -> None:
+        self.done.append(ok)
+        self.event.set()
+
+
+def startSupervisor() -> tuple[BluetoothController, LinkSupervisor]:
+    controller: BluetoothController = BluetoothController(holdTime=5.0)
+    supervisor: LinkSupervisor = LinkSupervisor(controller, heartbeatInterval=60.0, backoff=0.05, maxBackoff=0.2)
+    controller.onLinkDown = supervisor.onLinkDown
+    controller.start()
+    supervisor.start()
+    return controller, supervisor
+
+
+def stopSupervisor(controller: BluetoothController, supervisor: LinkSupervisor) -> None:
+    controller.stop()
+    supervisor.stop()
+
+
+def test_connects_in_background_with_backoff() -> None:
+    controller, supervisor = startSupervisor()
+    module: FlakyModule = FlakyModule(failures=2)
+    supervisor.watch(Material.CAN, module)
+    assert supervisor.waitConnected(Material.CAN, 5)
+    assert module.opens == 3
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert module.peer.recv(64) == b"1"
+    assert results.event.wait(5) and results.done == [True]
+    stopSupervisor(controller, supervisor)
+
+
+def test_command_sent_before_connecting_is_held() -> None:
+    controller, supervisor = startSupervisor()
+    module: FlakyModule = FlakyModule(failures=3)
+    supervisor.watch(Material.CAN, module)
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)     # 아직 연결되지 않았지만 보관됨
+    assert module.opened.wait(5)
+    assert module.peer.recv(64) == b"1"
+    assert results.event.wait(5) and results.done == [True]
+    stopSupervisor(controller, supervisor)
+
+
+def test_reconnects_after_link_loss() -> None:
+    controller, supervisor = startSupervisor()
+    module: FlakyModule = FlakyModule()
+    supervisor.watch(Material.CAN, module)
+    assert supervisor.waitConnected(Material.CAN, 5)
+    module.unplug()
+    assert module.opened.wait(5)    # 감시 스레드가 포트를 다시 엶
+    assert supervisor.waitConnected(Material.CAN, 5)
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert module.peer.recv(64) == b"1"
+    assert results.event.wait(5) and results.done == [True]
+    assert module.opens == 2
+    stopSupervisor(controller, supervisor)
+
+
+def test_unwatch_closes_port() -> None:
+    controller, supervisor = startSupervisor()
+    module: FlakyModule = FlakyModule()
+    supervisor.watch(Material.CAN, module)
+    assert supervisor.waitConnected(Material.CAN, 5)
+    supervisor.unwatch(Material.CAN)
+    assert module.sock is None
+    results: Results = Results()
+    controller.send(Material.CAN, "1", results)
+    assert results.event.wait(5) and results.done == [False]
+    stopSupervisor(controller, supervisor)
@@ -0,0 +1,144 @@
+import os
+import socket
+from threading import Thread
+from time import time
+
+import pytest
+
+from models.material import Material
+from storage.backend import CacheEntry
+from storage.cache_server import CacheService, createCacheServer, TcpCacheServer, UnixCacheServer
+from storage.json_backend import dumpEntry, JsonCacheBackend
+from storage.remote_backend import RemoteCacheBackend, parseAddress
+from storage.sqlite_backend import SqliteCacheBackend
+
+
+@pytest.fixture
+def shared(tmp_path) -> SqliteCacheBackend:
+    backend: SqliteCacheBackend = SqliteCacheBackend(os.path.join(tmp_path, "shared.sqlite3"))
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def server(tmp_path, shared: SqliteCacheBackend) -> str:
+    path: str = os.path.join(tmp_path, "cache.sock")
+    server: UnixCacheServer = UnixCacheServer(path, CacheService(shared))
+    thread: Thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"unix:{path}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def makeRemote(address: str, tmp_path, name: str) -> RemoteCacheBackend:
+    return RemoteCacheBackend(address, SqliteCacheBackend(os.path.join(tmp_path, name)), timeout=1.0)
+
+
+def test_parse_address() -> None:
+    assert parseAddress("unix:/run/changong/cache.sock") == "/run/changong/cache.sock"
+    assert parseAddress("tcp:127.0.0.1:9200") == ("127.0.0.1", 9200)
+    assert parseAddress("tcp:localhost:9200") == ("localhost", 9200)
+    assert parseAddress("tcp:[::1]:9200") == ("::1", 9200)
+    for address in ("tcp:192.168.0.10:9200", "tcp:[fe80::1]:9200", "tcp:127.0.0.1:port", "unix:", "http://127.0.0.1"):
+        with pytest.raises(ValueError):
+            parseAddress(address)
+
+
+def test_service(shared: SqliteCacheBackend) -> None:
+    service: CacheService = CacheService(shared)
+    entries: dict[str, list] = {
+        code: dumpEntry(CacheEntry(Material.CAN, 1.0, code)) for code in ("3", "1", "2")
+    }
+    assert service.handle({"op": "put", "entries": entries}) == {"stored": 3}
+    assert service.handle({"op": "get", "barcodes": ["1", "9"]}) == {"entries": {"1": entries["1"]}}
+    assert service.handle({"op": "len"}) == {"count": 3}
+    assert service.handle({"op": "entries", "limit": 2}) == {"entries": [["1", entries["1"]], ["2", entries["2"]]]}
+    assert service.handle({"op": "entries", "after": "2", "limit": 2}) == {"entries": [["3", entries["3"]]]}
+    assert "error" in service.handle({"op": "drop"})
+
+
+def test_negative_does_not_replace_positive(shared: SqliteCacheBackend) -> None:
+    service: CacheService = CacheService(shared, positiveTtl=60)
+    now: float = time()
+    shared.put("8801117784003", CacheEntry(Material.CAN, now, "20220001234"))
+    shared.put("0036000291452", CacheEntry(Material.PAPER, now - 120))     # 유효 기간이 지난 결과
+    entries: dict[str, list] = {
+        code: dumpEntry(CacheEntry(None, now)) for code in ("8801117784003", "0036000291452", "4006381333931")
+    }
+    assert service.handle({"op": "put", "entries": entries}) == {"stored": 2}
+    assert shared.get("8801117784003") == CacheEntry(Material.CAN, now, "20220001234")
+    assert shared.get("0036000291452") == CacheEntry(None, now)
+    assert shared.get("4006381333931") == CacheEntry(None, now)
+
+
+def test_stations_share_results(server: str, tmp_path) -> None:
+    first: RemoteCacheBackend = makeRemote(server, tmp_path, "first.sqlite3")
+    second: RemoteCacheBackend = makeRemote(server, tmp_path, "second.sqlite3")
+    try:
+        first.put("8801117784003", CacheEntry(Material.CAN, 1.0, "20220001234"))
+        first.put("0036000291452", CacheEntry(None, 1.0))
+        assert second.local.get("8801117784003") is None
+        assert second.get("8801117784003") == CacheEntry(Material.CAN, 1.0, "20220001234")
+        assert second.local.get("8801117784003") is not None    # 가져온 결과는 이 기기에도 저장
+        assert second.get("4006381333931") is None
+        assert len(second) == 2
+        assert dict(second.entries(chunkSize=1)) == {
+            "0036000291452": CacheEntry(None, 1.0),
+            "8801117784003": CacheEntry(Material.CAN, 1.0, "20220001234"),
+        }
+    finally:
+        first.close()
+        second.close()
+
+
+def test_falls_back_to_local_when_server_is_down(tmp_path) -> None:
+    remote: RemoteCacheBackend = makeRemote(f"unix:{os.path.join(tmp_path, 'missing.sock')}", tmp_path, "local.sqlite3")
+    try:
+        remote.put("8801117784003", CacheEntry(Material.PAPER, 1.0))
+        assert remote.downUntil > 0     # 잠시 동안 캐시 서버에 요청하지 않음
+        assert remote.get("8801117784003") == CacheEntry(Material.PAPER, 1.0)
+        assert remote.get("0036000291452") is None
+        assert len(remote) == 1
+    finally:
+        remote.close()
+
+
+def test_json_backend_entries_after(tmp_path) -> None:
+    backend: JsonCacheBackend = JsonCacheBackend(os.path.join(tmp_path, "cache.json"))
+    for code in ("3", "1", "2"):
+        backend.put(code, CacheEntry(Material.CAN, 1.0))
+    assert [code for code, _ in backend.entriesAfter("", 2)] == ["1", "2"]
+    assert [code for code, _ in backend.entriesAfter("2", 2)] == ["3"]
+
+
+def test_rejected_request_does_not_back_off(server: str, tmp_path) -> None:
+    remote: RemoteCacheBackend = makeRemote(server, tmp_path, "local.sqlite3")
+    try:
+        assert remote.remote("drop") is None    # 서버가 거절한 요청
+        assert remote.downUntil == 0.0
+        remote.put("8801117784003", CacheEntry(Material.CAN, 1.0))
+        assert len(remote) == 1     # 다음 요청은 그대로 서버로 보냄
+    finally:
+        remote.close()
+
+
+@pytest.mark.skipif(not socket.has_ipv6, reason="IPv6를 지원하지 않는 환경")
+def test_ipv6_loopback(shared: SqliteCacheBackend, tmp_path) -> None:
+    try:
+        server: TcpCacheServer = createCacheServer("tcp:[::1]:0", shared)
+    except OSError:
+        pytest.skip("::1에 바인딩할 수 없는 환경")
+    thread: Thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    remote: RemoteCacheBackend = makeRemote(f"tcp:[::1]:{server.server_address[1]}", tmp_path, "local.sqlite3")
+    try:
+        remote.put("8801117784003", CacheEntry(Material.CAN, 1.0))
+        assert remote.downUntil == 0.0
+        assert len(shared) == 1
+    finally:
+        remote.close()
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from models.material import Material
+from storage.compact_index import buildIndex, CompactIndex, CompactIndexException, HEADER, packBarcode
+
+
+@pytest.fixture
+def index(tmp_path) -> CompactIndex:
+    path: str = os.path.join(tmp_path, "catalog.idx")
+    count: int = buildIndex([
+        ("8801117784003", Material.CAN),
+        ("0036000291452", Material.PLASTIC),
+        ("10036000291459", Material.PAPER),
+        ("8801117784003", Material.GLASS),   # 같은 바코드는 마지막 값
+        ("not-a-barcode", Material.PAPER),
+        ("123456789012345", Material.PAPER),  # 14자리 초과
+    ], path)
+    assert count == 3
+    idx: CompactIndex = CompactIndex(path)
+    yield idx
+    idx.close()
+
+
+def test_pack_barcode() -> None:
+    assert packBarcode("0036000291452") == 36000291452
+    assert packBarcode("99999999999999") == 99999999999999
+    assert packBarcode("123456789012345") is None
+    assert packBarcode("12a") is None
+
+
+def test_lookup(index: CompactIndex) -> None:
+    assert index.get("8801117784003") == Material.GLASS
+    assert index.get("0036000291452") == Material.PLASTIC
+    assert index.get("10036000291459") == Material.PAPER
+    assert index.get("8801117784010") is None
+    assert index.get("0") is None                   # 배열 맨 앞보다 작음
+    assert index.get("99999999999999") is None      # 배열 맨 뒤보다 큼
+    assert "0036000291452" in index
+    assert len(index) == 3
+
+
+def test_items_are_sorted(index: CompactIndex) -> None:
+    keys: list[int] = [key for key, _ in index.items()]
+    assert keys == sorted(keys)
+
+
+def test_reopen_after_close(index: CompactIndex) -> None:
+    assert index.get("8801117784003") == Material.GLASS
+    index.close()
+    assert index.get("8801117784003") == Material.GLASS    # 다시 접근하면 다시 엶
+
+
+def test_empty_index(tmp_path) -> None:
+    path: str = os.path.join(tmp_path, "empty.idx")
+    assert buildIndex([], path) == 0
+    idx: CompactIndex = CompactIndex(path)
+    assert idx.get("8801117784003") is None
+    assert len(idx) == 0
+    idx.close()
+
+
+def test_missing_file_is_empty_index(tmp_path, capsys) -> None:
+    path: str = os.path.join(tmp_path, "missing.idx")
+    idx: CompactIndex = CompactIndex(path)
+    assert "missing.idx" in capsys.readouterr().out     # 시작할 때 한 번만 알림
+    for _ in range(2):
+        assert idx.get("8801117784003") is None
+    assert len(idx) == 0
+    buildIndex([("8801117784003", Material.CAN)], path)
+    assert idx.get("8801117784003") is None     # 시작한 뒤에 만든 파일은 다시 시작해야 사용함
+    idx.close()
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b"RHIX",
+    b"XXXX" + bytes(12),
+    HEADER.pack(b"RHIX", 1, 2) + bytes(9),     # 항목 수와 파일 크기가 맞지 않음
+    HEADER.pack(b"RHIX", 99, 0),
+])
+def test_rejects_malformed_file(tmp_path, content: bytes) -> None:
+    path: str = os.path.join(tmp_path, "bad.idx")
+    with open(path, mode="wb") as f:
+        f.write(content)
+    idx: CompactIndex = CompactIndex(path)
+    with pytest.raises(CompactIndexException):
+        idx.open()
+    idx.close()
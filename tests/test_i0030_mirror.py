@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from handlers.barcode_api import BarcodeHandler
+from storage.i0030_mirror import I0030Mirror, syncMirror
+
+
+def makeRow(prdReportNo: str, name: str, updated: str) -> dict[str, str]:
+    return {"PRDLST_REPORT_NO": prdReportNo, "LCNS_NO": "1", "PRDLST_NM": name, "LAST_UPDT_DTM": updated}
+
+
+class FakeApi:
+    """
+    조건에 맞는 행을 페이지 단위로 돌려주는 I0030 API. failAt 번째 요청에서 실패합니다.
+    """
+    def __init__(self, rows: list[dict[str, str]], failAt: int | None = None) -> None:
+        self.rows: list[dict[str, str]] = rows
+        self.failAt: int | None = failAt
+        self.calls: list[tuple[int, int, str]] = []
+
+    def fetchPage(self, start: int, end: int, condition: str) -> tuple[list[dict[str, str]], int]:
+        self.calls.append((start, end, condition))
+        if len(self.calls) == self.failAt:
+            raise ConnectionError("요청 실패")
+        matched: list[dict[str, str]] = [
+            row for row in self.rows
+            if not condition or row["LAST_UPDT_DTM"][:10].replace("-", "") >= condition.partition("=")[2]
+        ]
+        return matched[start - 1:end], len(matched)
+
+
+@pytest.fixture
+def mirror(tmp_path) -> I0030Mirror:
+    mirror: I0030Mirror = I0030Mirror(os.path.join(tmp_path, "i0030.sqlite3"))
+    yield mirror
+    mirror.close()
+
+
+ROWS: list[dict[str, str]] = [
+    makeRow("1", "과자", "2024-01-01 09:00:00"),
+    makeRow("1", "과자 대용량", "2024-01-03 09:00:00"),     # 같은 품목보고번호의 다른 행
+    makeRow("2", "음료", "2024-01-02 09:00:00"),
+    makeRow("3", "라면", "2024-01-05 09:00:00"),
+    makeRow("4", "우유", "2024-01-04 09:00:00"),
+]
+
+
+def test_full_sync(mirror: I0030Mirror) -> None:
+    api: FakeApi = FakeApi(ROWS)
+    assert syncMirror(mirror, api.fetchPage, pageSize=2) == 5
+    assert [start for start, _, _ in api.calls] == [1, 3, 5]
+    assert len(mirror) == 5
+    assert [row["PRDLST_NM"] for row in mirror.rows("1")] == ["과자", "과자 대용량"]
+    assert mirror.rows("9") == []
+    assert mirror.state("synced_until") == "2024-01-05 09:00:00"
+    assert mirror.state("cursor") is None
+
+
+def test_resume_after_interruption(mirror: I0030Mirror) -> None:
+    with pytest.raises(ConnectionError):
+        syncMirror(mirror, FakeApi(ROWS, failAt=2).fetchPage, pageSize=2)
+    assert len(mirror) == 2     # 실패 전에 받은 페이지는 남음
+    assert mirror.state("cursor") == "3"
+    api: FakeApi = FakeApi(ROWS)
+    assert syncMirror(mirror, api.fetchPage, pageSize=2) == 3
+    assert [start for start, _, _ in api.calls] == [3, 5]
+    assert len(mirror) == 5
+    assert mirror.state("synced_until") == "2024-01-05 09:00:00"
+
+
+def test_incremental_sync(mirror: I0030Mirror) -> None:
+    syncMirror(mirror, FakeApi(ROWS).fetchPage, pageSize=2)
+    updated: list[dict[str, str]] = [*ROWS, makeRow("2", "음료", "2024-01-07 09:00:00"), makeRow("5", "두유", "2024-01-06 09:00:00")]
+    updated.pop(2)
+    api: FakeApi = FakeApi(updated)
+    assert syncMirror(mirror, api.fetchPage, pageSize=2) == 3    # 마지막 동기화한 날 수정된 행도 다시 받음
+    assert api.calls[0] == (1, 2, "CHNG_DT=20240105")
+    assert len(mirror) == 6
+    assert mirror.rows("2")[0]["LAST_UPDT_DTM"] == "2024-01-07 09:00:00"
+    assert mirror.state("synced_until") == "2024-01-07 09:00:00"
+
+
+def test_full_sync_ignores_progress(mirror: I0030Mirror) -> None:
+    syncMirror(mirror, FakeApi(ROWS).fetchPage, pageSize=2)
+    api: FakeApi = FakeApi(ROWS)
+    assert syncMirror(mirror, api.fetchPage, pageSize=10, full=True) == 5
+    assert api.calls == [(1, 10, "")]
+
+
+def test_handler_reads_mirror_before_api(mirror: I0030Mirror, monkeypatch) -> None:
+    monkeypatch.setenv("FOOD_SAFETY_KR_API_KEY", "test")
+    syncMirror(mirror, FakeApi(ROWS).fetchPage)
+    handler: BarcodeHandler = BarcodeHandler()
+    handler.mirror = mirror
+    requested: list[str] = []
+    monkeypatch.setattr(handler, "api_page", lambda start, end, condition="": requested.append(condition) or ([], 0))
+    assert [r.row["PRDLST_NM"] for r in handler.product_rows("1")] == ["과자", "과자 대용량"]
+    assert requested == []
+    assert handler.product_rows("9") == []
+    assert requested == ["PRDLST_REPORT_NO=9"]  # 동기화 이후 등록된 제품은 API로 조회
@@ -0,0 +1,40 @@
+import os
+import signal
+
+import pytest
+
+pytest.importorskip("serial")   # main -> program
+
+import main
+
+
+class StubSearcher:
+    """
+    실행하자마자 자기 프로세스에 신호를 보내고, stop()이 불렸는지 기록하는 스테이션.
+    """
+    def __init__(self, signum: int) -> None:
+        self.signum: int = signum
+        self.stopped: bool = False
+
+    def run(self) -> None:
+        os.kill(os.getpid(), self.signum)   # 주 스레드에서 받으므로 처리기가 바로 실행됨
+        assert self.stopped
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture(autouse=True)
+def restoreHandlers():
+    saved = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    yield
+    for signum, handler in saved.items():
+        signal.signal(signum, handler)
+
+
+@pytest.mark.parametrize("signum", [signal.SIGTERM, signal.SIGINT])
+def test_signal_stops_station(monkeypatch, signum: int) -> None:
+    searcher: StubSearcher = StubSearcher(signum)
+    monkeypatch.setattr(main, "BarcodeSearcher", lambda: searcher)
+    main.main()
+    assert searcher.stopped
@@ -0,0 +1,47 @@
+import pytest
+
+from models.material import Material, classifyMaterial, parseMaterial, parseMaterials
+
+
+@pytest.mark.parametrize(("text", "mat"), [
+    ("PET", Material.PLASTIC),
+    ("PET병", Material.PLASTIC),
+    ("페트병", Material.PLASTIC),
+    ("페트", Material.PLASTIC),
+    ("폴리에틸렌(PE)", Material.PLASTIC),
+    ("알루미늄", Material.CAN),
+    ("알루미늄캔", Material.CAN),
+    ("알미늄캔", Material.CAN),
+    ("참치캔", Material.CAN),
+    ("캔류", Material.CAN),
+    ("스틸캔", Material.CAN),
+    ("강철", Material.CAN),
+    ("steel", Material.CAN),
+    ("종이팩", Material.PAPER),
+    ("유리병", Material.GLASS),
+    ("용기: 유리, 뚜껑: PP", Material.GLASS),    # 점수가 같으면 먼저 나온 재질
+])
+def test_classify(text: str, mat: Material) -> None:
+    assert parseMaterial(text) == mat
+
+
+@pytest.mark.parametrize(("text", "mat"), [
+    ("스캔", Material.NORMAL),              # "캔"이 다른 낱말 안에 있음
+    ("캔디 포장: 비닐", Material.VINYLS),
+    ("캔버스", Material.NORMAL),
+    ("철분 강화, 종이", Material.PAPER),     # "철"이 다른 낱말 안에 있음
+    ("HDPE", Material.PLASTIC),            # "PE"만 따로 세지 않음
+    ("PEPPER", Material.NORMAL),           # 영문 표기의 부분 일치
+    ("ALL NATURAL", Material.NORMAL),
+])
+def test_short_term_boundaries(text: str, mat: Material) -> None:
+    assert parseMaterial(text) == mat
+
+
+def test_weights() -> None:
+    assert classifyMaterial("AL, PE") == (Material.PLASTIC, 1.0)   # 다층 포장의 알루미늄 층은 절반만 셈
+    assert classifyMaterial("") == (Material.NORMAL, 0.0)
+
+
+def test_parse_many_keeps_order() -> None:
+    assert parseMaterials(["종이", "캔", "종이"]) == [Material.PAPER, Material.CAN, Material.PAPER]
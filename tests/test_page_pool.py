@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from handlers.page_pool import PagePool
+
+SEARCH_URL: str = "http://127.0.0.1/products/search"
+
+
+class StubPage:
+    """
+    이동한 주소를 기록하는 브라우저 페이지. 검색 페이지로 이동하면 redirect 주소로 바뀝니다.
+    """
+    def __init__(self, redirect: str) -> None:
+        self.url: str = "about:blank"
+        self.redirect: str = redirect
+        self.visited: list[str] = []
+
+    def goto(self, url: str) -> None:
+        self.visited.append(url)
+        self.url = self.redirect if url == SEARCH_URL else url
+
+    def is_closed(self) -> bool:
+        return False
+
+
+class StubContext:
+    def __init__(self, redirect: str) -> None:
+        self.redirect: str = redirect
+        self.closed: bool = False
+
+    def set_default_timeout(self, timeout: float) -> None:
+        pass
+
+    def set_default_navigation_timeout(self, timeout: float) -> None:
+        pass
+
+    def new_page(self) -> StubPage:
+        return StubPage(self.redirect)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class StubBrowser:
+    def __init__(self, redirect: str = SEARCH_URL) -> None:
+        self.redirect: str = redirect
+
+    def new_context(self) -> StubContext:
+        return StubContext(self.redirect)
+
+
+def test_page_left_on_result_under_search_url_is_reparked() -> None:
+    pool: PagePool = PagePool(StubBrowser(SEARCH_URL + "?lang=ko"), SEARCH_URL)
+    with pool.page() as page:
+        assert page.url == SEARCH_URL + "?lang=ko"
+        page.goto(SEARCH_URL + "/result?q=8801117784003")   # 검색 주소로 시작하는 결과 페이지
+    assert page.visited[-1] == SEARCH_URL
+    assert page.url == SEARCH_URL + "?lang=ko"
+
+
+def test_page_still_on_landing_url_is_not_reloaded() -> None:
+    pool: PagePool = PagePool(StubBrowser(SEARCH_URL + "?lang=ko"), SEARCH_URL)
+    with pool.page() as page:
+        pass
+    with pool.page() as again:
+        assert again is page
+    assert page.visited == [SEARCH_URL]
+
+
+def test_one_page_per_thread_by_default() -> None:
+    pool: PagePool = PagePool(StubBrowser(), SEARCH_URL)
+    with pool.page():
+        with pytest.raises(RuntimeError):
+            pool.acquire()
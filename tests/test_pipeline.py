@@ -0,0 +1,199 @@
+from threading import Lock
+from time import sleep
+
+import pytest
+
+pytest.importorskip("serial")   # pipeline -> handlers.bluetooth_handler
+
+from metrics import metricKey, metrics
+from models.material import Material
+from models.product import LookupResult
+from pipeline import openBin, ScanPipeline
+from storage.backend import CacheEntry
+from utils import Debouncer
+
+
+class StubSearch:
+    def __init__(self) -> None:
+        self.stored: dict[str, Material | None] = {}
+
+    def lookup(self, barcode: str) -> CacheEntry | None:
+        if barcode not in self.stored:
+            return None
+        return CacheEntry(self.stored[barcode], 0.0)
+
+    def put(self, barcode: str, result: LookupResult | None) -> None:
+        self.stored[barcode] = None if result is None else result.material
+
+
+class StubApi:
+    """
+    바코드마다 정해 둔 시간만큼 걸려 재질을 돌려주는 조회 단계.
+    """
+    def __init__(self, materials: dict[str, Material], delays: dict[str, float] | None = None) -> None:
+        self.search: StubSearch = StubSearch()
+        self.materials: dict[str, Material] = materials
+        self.delays: dict[str, float] = delays or {}
+        self.crawled: list[str] = []
+        self.lock: Lock = Lock()
+
+    def warmUp(self) -> None:
+        pass
+
+    def closeBrowser(self) -> None:
+        pass
+
+    def getPrdReportNos(self, barcode: str) -> list[str]:
+        with self.lock:
+            self.crawled.append(barcode)
+        sleep(self.delays.get(barcode, 0.0))
+        return [barcode] if barcode in self.materials else []
+
+    def product_lookup_many(self, prdReportNos: list[str]) -> LookupResult | None:
+        return LookupResult(self.materials[prdReportNos[0]], prdReportNos[0], "")
+
+
+class StubBluetooth:
+    def __init__(self, delivered: bool = True) -> None:
+        self.calls: list[Material] = []
+        self.delivered: bool = delivered    # 모듈에 명령을 전달했는지 여부
+
+    def call(self, mat: Material, onDone=None) -> None:
+        self.calls.append(mat)
+        if onDone is not None:
+            onDone(mat, self.delivered)
+
+
+def makePipeline(api: StubApi, bt: StubBluetooth, deadline: float = 0.0, debounce: float = 0.0) -> ScanPipeline:
+    pipeline: ScanPipeline = ScanPipeline(
+        api, bt, crawlWorkers=2, apiWorkers=2, queueSize=8, deadline=deadline, fallback=Material.NORMAL,
+        debouncer=Debouncer(debounce)
+    )
+    pipeline.start()
+    return pipeline
+
+
+def test_dispatches_in_scan_order() -> None:
+    api: StubApi = StubApi({"1": Material.CAN, "2": Material.PAPER}, {"1": 0.2})
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt)
+    pipeline.submit("1")
+    pipeline.submit("2")
+    pipeline.close()
+    assert bt.calls == [Material.CAN, Material.PAPER]
+
+
+def test_same_barcode_is_crawled_once() -> None:
+    api: StubApi = StubApi({"1": Material.CAN}, {"1": 0.2})
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt)
+    for _ in range(3):
+        pipeline.submit("1")
+    pipeline.close()
+    assert api.crawled == ["1"]
+    assert bt.calls == [Material.CAN] * 3
+
+
+def test_searches_scanned_code() -> None:
+    api: StubApi = StubApi({"96385074": Material.CAN})
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt)
+    pipeline.submit("0000096385074", "96385074")
+    pipeline.close()
+    assert api.crawled == ["96385074"]
+    assert api.search.stored == {"0000096385074": Material.CAN}   # 캐시에는 키로 저장
+
+
+def test_unknown_product_opens_fallback_without_blocking_later_scans() -> None:
+    api: StubApi = StubApi({"2": Material.PAPER})
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt)
+    pipeline.submit("1")
+    pipeline.submit("2")
+    pipeline.close()
+    assert bt.calls == [Material.NORMAL, Material.PAPER]
+    assert api.search.stored == {"1": None, "2": Material.PAPER}    # 조회 불가한 제품도 저장
+
+
+def test_lookup_error_is_not_reported_as_not_found() -> None:
+    def failCrawl(barcode: str) -> list[str]:
+        raise ConnectionError("검색 페이지에 연결할 수 없음")
+
+    api: StubApi = StubApi({"1": Material.CAN})
+    api.getPrdReportNos = failCrawl
+    bt: StubBluetooth = StubBluetooth()
+    key: str = metricKey("scans", {"result": "error"})
+    notFound: str = metricKey("scans", {"result": "not_found"})
+    before: tuple[float, float] = (metrics.counters.get(key, 0), metrics.counters.get(notFound, 0))
+    pipeline: ScanPipeline = makePipeline(api, bt)
+    pipeline.submit("1")
+    pipeline.close()
+    assert bt.calls == [Material.NORMAL]
+    assert (metrics.counters.get(key, 0), metrics.counters.get(notFound, 0)) == (before[0] + 1, before[1])
+    assert api.search.stored == {}  # 다음 스캔 때 다시 조회
+
+
+def test_cached_material_skips_crawling() -> None:
+    api: StubApi = StubApi({"1": Material.CAN})
+    api.search.stored["1"] = Material.GLASS
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt)
+    pipeline.submit("1")
+    pipeline.close()
+    assert api.crawled == []
+    assert bt.calls == [Material.GLASS]
+
+
+def test_cached_not_found_skips_crawling() -> None:
+    api: StubApi = StubApi({"1": Material.CAN})
+    api.search.stored["1"] = None
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt)
+    pipeline.submit("1")
+    pipeline.close()
+    assert api.crawled == []
+    assert bt.calls == [Material.NORMAL]
+
+
+def test_slow_lookup_opens_fallback_at_deadline() -> None:
+    api: StubApi = StubApi({"1": Material.CAN, "2": Material.PAPER}, {"1": 1.0})
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt, deadline=0.3)
+    pipeline.submit("1")
+    pipeline.submit("2")
+    sleep(0.6)
+    assert bt.calls == [Material.NORMAL, Material.PAPER]   # 늦은 조회가 다음 스캔을 막지 않음
+    pipeline.close()
+    assert bt.calls == [Material.NORMAL, Material.PAPER]   # 늦게 끝난 조회는 캐시에만 남김
+    assert api.search.stored["1"] == Material.CAN
+
+
+def test_deadline_after_idle_period() -> None:
+    api: StubApi = StubApi({"1": Material.CAN}, {"1": 2.0})
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt, deadline=0.3)
+    sleep(0.5)      # 기다리는 작업이 없는 동안 배출 단계가 잠들어 있던 경우
+    pipeline.submit("1")
+    sleep(0.8)
+    assert bt.calls == [Material.NORMAL]
+    pipeline.close()
+    assert bt.calls == [Material.NORMAL]
+
+
+def test_debounce_is_per_barcode() -> None:
+    api: StubApi = StubApi({"1": Material.CAN, "2": Material.CAN})
+    bt: StubBluetooth = StubBluetooth()
+    pipeline: ScanPipeline = makePipeline(api, bt, debounce=5.0)
+    for code in ("1", "1", "2"):
+        pipeline.submit(code)
+        sleep(0.05)
+    pipeline.close()
+    assert bt.calls == [Material.CAN, Material.CAN]    # 다른 제품은 같은 분리수거함이라도 열림
+
+
+def test_failed_open_is_not_debounced() -> None:
+    bt: StubBluetooth = StubBluetooth(delivered=False)
+    debouncer: Debouncer = Debouncer(5.0)
+    for _ in range(2):
+        openBin(bt, debouncer, "1", Material.CAN)
+    assert bt.calls == [Material.CAN, Material.CAN]    # 전달하지 못했으면 다시 스캔했을 때 다시 엶
@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+import pytest
+
+pytest.importorskip("requests")     # handlers.resolvers
+sync_api = pytest.importorskip("playwright.sync_api")
+
+from handlers.resolvers import PlaywrightResolver, ResolverError
+
+
+class StubLocator:
+    def __init__(self, page: "StubPage") -> None:
+        self.page: StubPage = page
+
+    @property
+    def first(self) -> "StubLocator":
+        return self
+
+    def locator(self, selector: str) -> "StubLocator":
+        return self
+
+    def fill(self, value: str) -> None:
+        self.page.searched.append(value)
+
+    def click(self) -> None:
+        if self.page.error is not None:
+            raise self.page.error
+
+    def count(self) -> int:
+        return self.page.items
+
+    def inner_text(self) -> str:
+        return self.page.detail
+
+
+class StubPage:
+    """
+    검색 결과 수, 상세 페이지 내용, 동작 중 발생할 오류를 정해 둔 브라우저 페이지.
+    """
+    def __init__(self, items: int = 1, content: str = "", detail: str = "", error: Exception | None = None) -> None:
+        self.items: int = items
+        self.html: str = content
+        self.detail: str = detail
+        self.error: Exception | None = error
+        self.searched: list[str] = []
+
+    def locator(self, selector: str) -> StubLocator:
+        return StubLocator(self)
+
+    @contextmanager
+    def expect_navigation(self) -> Iterator[None]:
+        yield
+
+    def content(self) -> str:
+        return self.html
+
+
+class StubPool:
+    def __init__(self, page: StubPage) -> None:
+        self.stub: StubPage = page
+
+    @contextmanager
+    def page(self) -> Iterator[StubPage]:
+        yield self.stub
+
+
+def resolveWith(page: StubPage) -> list[str]:
+    resolver: PlaywrightResolver = PlaywrightResolver()
+    resolver.browserLocal.pagePool = StubPool(page)     # 브라우저를 띄우지 않음
+    return resolver.resolve("8801117784003")
+
+
+def test_resolves_report_number() -> None:
+    page: StubPage = StubPage(detail="20220001234567")
+    assert resolveWith(page) == ["20220001234567"]
+    assert page.searched == ["8801117784003"]
+
+
+def test_no_result_page() -> None:
+    assert resolveWith(StubPage(items=0, content="<p>검색결과가 없습니다.</p>")) == []
+
+
+def test_unexpected_layout() -> None:
+    with pytest.raises(ResolverError):
+        resolveWith(StubPage(items=0, content="<p>점검 중입니다</p>"))
+
+
+def test_playwright_error_becomes_resolver_error() -> None:
+    with pytest.raises(ResolverError):
+        resolveWith(StubPage(error=sync_api.TimeoutError("Timeout 10000ms exceeded.")))
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("serial")   # program
+
+from handlers.bluetooth_handler import NotConnectedException
+from metrics import metricKey, metrics
+from models.material import Material
+from program import BarcodeSearcher
+from storage.backend import CacheEntry
+from utils import Debouncer
+
+
+class StubSearch:
+    def lookup(self, barcode: str) -> CacheEntry | None:
+        return CacheEntry(Material.CAN, 0.0)
+
+
+class StubApi:
+    search: StubSearch = StubSearch()
+
+
+class UnpluggedBluetooth:
+    def call(self, mat: Material, onDone=None) -> None:
+        raise NotConnectedException(mat)
+
+
+def makeSearcher() -> BarcodeSearcher:
+    searcher: BarcodeSearcher = BarcodeSearcher.__new__(BarcodeSearcher)   # 포트를 열지 않음
+    searcher.barcode_api = StubApi()
+    searcher.bluetooth_handler = UnpluggedBluetooth()
+    searcher.pipeline = None
+    searcher.lookupExecutor = None
+    searcher.fallback = Material.NORMAL
+    searcher.debouncer = Debouncer(0)
+    return searcher
+
+
+def count(name: str, **labels: object) -> float:
+    return metrics.counters.get(metricKey(name, labels), 0)
+
+
+def test_scan_is_recorded_when_bin_is_not_connected() -> None:
+    before: float = count("scans", result="found")
+    makeSearcher().barcodeTask("8801117784003")
+    assert count("scans", result="found") == before + 1
@@ -0,0 +1,114 @@
+from urllib.parse import urljoin
+
+import pytest
+
+pytest.importorskip("requests")     # handlers.resolvers
+
+from config import PRODUCT_SEARCH_URL
+from handlers.resolvers import DetailTableParser, HttpResolver, parsePrdReportNos, ResolverError, SearchResultParser
+
+SEARCH_HTML: str = """
+<ul class="result">
+  <li class="spl_list item">
+    <div><span>상품</span></div>
+    <a href="/product/detail?id=1">첫 번째</a>
+  </li>
+  <li class="spl_list"><a href="/product/detail?id=2">두 번째</a></li>
+</ul>
+"""
+
+DETAIL_HTML: str = """
+<table><tbody>
+  <tr><th>상품명</th><td>콜라</td></tr>
+  <tr><th>품목보고번호</th><td> 20220001234567 (캔) </td></tr>
+</tbody></table>
+"""
+
+
+class StubResponse:
+    def __init__(self, url: str, text: str) -> None:
+        self.url: str = url
+        self.text: str = text
+
+    def __enter__(self) -> "StubResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class StubSession:
+    """
+    주소마다 정해 둔 HTML을 돌려주는 세션.
+    """
+    def __init__(self, pages: dict[str, str]) -> None:
+        self.pages: dict[str, str] = pages
+        self.requested: list[str] = []
+
+    def get(self, url: str, params: dict[str, str] | None = None, timeout: float | None = None) -> StubResponse:
+        self.requested.append(url)
+        return StubResponse(url, self.pages[url])
+
+
+def parseSearch(html: str) -> str | None:
+    parser: SearchResultParser = SearchResultParser()
+    parser.feed(html)
+    return parser.href
+
+
+def test_search_result_takes_first_item_link() -> None:
+    assert parseSearch(SEARCH_HTML) == "/product/detail?id=1"
+
+
+def test_search_result_link_on_item_itself() -> None:
+    assert parseSearch('<a class="spl_list" href="/p?id=3"><span>상품</span></a>') == "/p?id=3"
+
+
+def test_search_result_ignores_links_outside_items() -> None:
+    assert parseSearch('<a href="/home">홈</a><div class="spl_list"><div></div></div><a href="/x">x</a>') is None
+
+
+def test_detail_table_find() -> None:
+    detail: DetailTableParser = DetailTableParser()
+    detail.feed(DETAIL_HTML)
+    assert detail.find("품목보고번호") == "20220001234567 (캔)"
+    assert detail.find("원재료") is None
+
+
+def test_parse_several_report_numbers() -> None:
+    assert parsePrdReportNos("20220001234567, 20190007654321 (리뉴얼), 20220001234567") == [
+        "20220001234567", "20190007654321"
+    ]
+    assert parsePrdReportNos("해당 없음") == []
+
+
+def test_http_resolver() -> None:
+    session: StubSession = StubSession({
+        PRODUCT_SEARCH_URL: SEARCH_HTML,
+        urljoin(PRODUCT_SEARCH_URL, "/product/detail?id=1"): DETAIL_HTML,
+    })
+    assert HttpResolver(session).resolve("8801117784003") == ["20220001234567"]
+    assert len(session.requested) == 2
+
+
+def test_http_resolver_no_result() -> None:
+    session: StubSession = StubSession({PRODUCT_SEARCH_URL: "<p>검색결과가 없습니다.</p>"})
+    assert HttpResolver(session).resolve("8801117784003") == []
+
+
+@pytest.mark.parametrize("detailHtml", [
+    "<p>점검 중입니다</p>",
+    "<table><tr><th>상품명</th><td>콜라</td></tr></table>",
+])
+def test_http_resolver_unexpected_layout(detailHtml: str) -> None:
+    session: StubSession = StubSession({
+        PRODUCT_SEARCH_URL: SEARCH_HTML,
+        urljoin(PRODUCT_SEARCH_URL, "/product/detail?id=1"): detailHtml,
+    })
+    with pytest.raises(ResolverError):
+        HttpResolver(session).resolve("8801117784003")
+    with pytest.raises(ResolverError):
+        HttpResolver(StubSession({PRODUCT_SEARCH_URL: "<p>점검 중입니다</p>"})).resolve("8801117784003")
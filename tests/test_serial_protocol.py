@@ -0,0 +1,76 @@
+from handlers.serial_protocol import FrameReader, checksum
+
+
+class FakePort:
+    """
+    미리 정해 둔 조각을 차례로 돌려주는 시리얼 포트.
+    """
+    def __init__(self, *chunks: bytes) -> None:
+        self.chunks: list[bytes] = list(chunks)
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size: int = 1) -> bytes:
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def withChecksum(frame: bytes) -> bytes:
+    return frame + b"*%02X" % checksum(frame)
+
+
+def makeReader(*chunks: bytes, requireChecksum: bool = False) -> FrameReader:
+    reader: FrameReader = FrameReader(FakePort(*chunks), maxFrame=32, requireChecksum=requireChecksum)
+    reader.register("bc", lambda body: None, str.isdigit)
+    reader.register("bt", lambda body: None, str.isdigit)
+    return reader
+
+
+def test_several_frames_in_one_read() -> None:
+    reader: FrameReader = makeReader(b"bc:8801117784003\r\nbt:3\r\n")
+    assert list(reader.read()) == [("bc", "8801117784003"), ("bt", "3")]
+
+
+def test_frame_split_across_reads() -> None:
+    reader: FrameReader = makeReader(b"bc:88011", b"17784003\r", b"\nbt:1\n")
+    assert list(reader.read()) == []
+    assert list(reader.read()) == []
+    assert list(reader.read()) == [("bc", "8801117784003"), ("bt", "1")]
+
+
+def test_checksum() -> None:
+    good: bytes = withChecksum(b"bc:8801117784003")
+    bad: bytes = good[:-1] + (b"0" if good[-1:] != b"0" else b"1")
+    reader: FrameReader = makeReader(good + b"\n" + bad + b"\nbc:123*ZZ\n")
+    assert list(reader.read()) == [("bc", "8801117784003")]
+    assert reader.malformed == 2
+
+
+def test_require_checksum() -> None:
+    reader: FrameReader = makeReader(b"bc:1\n" + withChecksum(b"bc:2") + b"\n", requireChecksum=True)
+    assert list(reader.read()) == [("bc", "2")]
+    assert reader.malformed == 1
+
+
+def test_corrupt_frames_are_dropped() -> None:
+    reader: FrameReader = makeReader(b"xx:1\nbc1\nbc:12a\n\xff\xfe:1\n\r\nbc:7\n")
+    assert list(reader.read()) == [("bc", "7")]
+    assert reader.malformed == 4    # 머리말, 구분자, 본문, 인코딩. 빈 줄은 세지 않음
+
+
+def test_too_long_frame_is_discarded_until_newline() -> None:
+    reader: FrameReader = makeReader(b"bc:" + b"1" * 40, b"1" * 40, b"\nbc:5\n")
+    assert list(reader.read()) == []
+    assert list(reader.read()) == []
+    assert list(reader.read()) == [("bc", "5")]
+    assert reader.malformed == 1
+
+
+def test_dispatch() -> None:
+    received: list[str] = []
+    reader: FrameReader = FrameReader(FakePort(b"bc:42\n"))
+    reader.register("bc", received.append)
+    for header, body in reader.read():
+        reader.dispatch(header, body)
+    assert received == ["42"]
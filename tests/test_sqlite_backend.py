@@ -0,0 +1,114 @@
+import json
+import os
+import sqlite3
+from time import time
+
+import pytest
+
+from models.material import Material
+from storage.backend import CacheEntry
+from storage.sqlite_backend import SqliteCacheBackend
+
+
+@pytest.fixture
+def backend(tmp_path) -> SqliteCacheBackend:
+    backend: SqliteCacheBackend = SqliteCacheBackend(os.path.join(tmp_path, "cache.sqlite3"))
+    yield backend
+    backend.close()
+
+
+def test_put_and_get(backend: SqliteCacheBackend) -> None:
+    assert backend.get("8801117784003") is None
+    backend.put("8801117784003", CacheEntry(Material.CAN, 1.0))
+    backend.put("8801117784003", CacheEntry(Material.GLASS, 2.0))    # 같은 바코드는 덮어씀
+    assert backend.get("8801117784003") == CacheEntry(Material.GLASS, 2.0)
+    assert len(backend) == 1
+
+
+def test_not_found_entry(backend: SqliteCacheBackend) -> None:
+    backend.put("8801117784003", CacheEntry(None, 1.0))
+    backend.put("0036000291452", CacheEntry(Material.CAN, 1.0))
+    assert backend.get("8801117784003") == CacheEntry(None, 1.0)
+    assert list(backend.items()) == [("0036000291452", Material.CAN)]     # 조회에 성공한 항목만 순회
+
+
+def test_entries_survive_reopen(tmp_path) -> None:
+    path: str = os.path.join(tmp_path, "cache.sqlite3")
+    backend: SqliteCacheBackend = SqliteCacheBackend(path)
+    backend.put("8801117784003", CacheEntry(Material.PAPER, 1.0))
+    backend.close()     # 닫기 전에 따로 저장하지 않아도 이미 기록되어 있음
+    reopened: SqliteCacheBackend = SqliteCacheBackend(path)
+    assert reopened.get("8801117784003") == CacheEntry(Material.PAPER, 1.0)
+    reopened.close()
+
+
+def test_items_in_chunks(backend: SqliteCacheBackend) -> None:
+    codes: list[str] = [f"{i:013d}" for i in range(25)]
+    for code in reversed(codes):
+        backend.put(code, CacheEntry(Material.VINYLS, 1.0))
+    assert [code for code, _ in backend.entries(chunkSize=7)] == codes
+
+
+def test_raw_material_and_reclassify(backend: SqliteCacheBackend) -> None:
+    backend.put("8801117784003", CacheEntry(Material.NORMAL, 1.0, "20220001234567", "페트"))
+    backend.updateMaterials({"8801117784003": Material.PLASTIC})
+    assert backend.get("8801117784003") == CacheEntry(Material.PLASTIC, 1.0, "20220001234567", "페트")
+
+
+def test_old_table_gains_columns(tmp_path) -> None:
+    path: str = os.path.join(tmp_path, "cache.sqlite3")
+    conn: sqlite3.Connection = sqlite3.connect(path)
+    conn.execute("CREATE TABLE crawl_cache (barcode TEXT PRIMARY KEY, material INTEGER, updated_at REAL NOT NULL)")
+    conn.execute("INSERT INTO crawl_cache VALUES ('8801117784003', ?, 1.0)", (int(Material.CAN),))
+    conn.commit()
+    conn.close()
+    backend: SqliteCacheBackend = SqliteCacheBackend(path)
+    assert backend.get("8801117784003") == CacheEntry(Material.CAN, 1.0)
+    backend.close()
+
+
+def test_legacy_json_is_imported_only_on_create(tmp_path) -> None:
+    legacy: str = os.path.join(tmp_path, "crawl_cache.json")
+    with open(legacy, mode="wt", encoding="utf-8") as f:
+        json.dump({"8801117784003": int(Material.CAN), "0036000291452": int(Material.PLASTIC)}, f)
+    path: str = os.path.join(tmp_path, "cache.sqlite3")
+    backend: SqliteCacheBackend = SqliteCacheBackend(path, legacyJsonPath=legacy)
+    assert backend.get("0036000291452").material == Material.PLASTIC
+    assert len(backend) == 2
+    backend.put("0036000291452", CacheEntry(Material.GLASS, 1.0))
+    backend.close()
+    reopened: SqliteCacheBackend = SqliteCacheBackend(path, legacyJsonPath=legacy)
+    assert reopened.get("0036000291452").material == Material.GLASS     # 이미 만든 저장소에는 다시 가져오지 않음
+    reopened.close()
+
+
+def test_compact_keeps_entries(backend: SqliteCacheBackend) -> None:
+    backend.put("8801117784003", CacheEntry(Material.CAN, 1.0))
+    assert backend.compact() == 0   # 유효 기간 0 은 지우지 않음
+    assert backend.get("8801117784003") == CacheEntry(Material.CAN, 1.0)
+
+
+def test_compact_deletes_expired(backend: SqliteCacheBackend) -> None:
+    now: float = time()
+    backend.put("8801117784003", CacheEntry(Material.CAN, now - 100))
+    backend.put("0036000291452", CacheEntry(Material.CAN, now))
+    backend.put("4006381333931", CacheEntry(None, now - 100))
+    backend.put("0000096385074", CacheEntry(None, now - 10))
+    assert backend.compact(positiveTtl=50, negativeTtl=50) == 2
+    assert sorted(code for code, _ in backend.entries()) == ["0000096385074", "0036000291452"]
+
+
+def test_compact_deletes_all_not_found_when_disabled(backend: SqliteCacheBackend) -> None:
+    now: float = time()
+    backend.put("8801117784003", CacheEntry(Material.CAN, 1.0))
+    backend.put("4006381333931", CacheEntry(None, now))
+    assert backend.compact(negative=False) == 1
+    assert [code for code, _ in backend.entries()] == ["8801117784003"]
+
+
+def test_entries_after(backend: SqliteCacheBackend) -> None:
+    for code in ("3", "1", "4", "2"):
+        backend.put(code, CacheEntry(Material.CAN, 1.0))
+    assert [code for code, _ in backend.entriesAfter("", 2)] == ["1", "2"]
+    assert [code for code, _ in backend.entriesAfter("2", 5)] == ["3", "4"]
+    assert backend.entriesAfter("4", 5) == []
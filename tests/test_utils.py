@@ -0,0 +1,172 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep, time
+
+import pytest
+
+from models.material import Material
+from models.product import LookupResult
+from storage.backend import CacheEntry
+from storage.sqlite_backend import SqliteCacheBackend
+from utils import CachedBarcodeCrawler, Debouncer, SingleFlight
+
+
+def test_single_flight_runs_once_for_concurrent_callers() -> None:
+    flight: SingleFlight = SingleFlight("test")
+    started: Event = Event()
+    release: Event = Event()
+    calls: list[int] = []
+
+    def work() -> str:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.do, "key", work)
+        assert started.wait(5)
+        followers = [pool.submit(flight.do, "key", work) for _ in range(7)]
+        sleep(0.05)     # 뒤따른 호출이 모두 기다리기 시작하도록.
+        release.set()
+        results: list[str] = [leader.result(5), *(f.result(5) for f in followers)]
+    assert results == ["done"] * 8
+    assert len(calls) == 1
+    assert flight.calls == {}
+
+
+def test_single_flight_shares_exception_and_forgets_key() -> None:
+    flight: SingleFlight = SingleFlight("test")
+    started: Event = Event()
+    release: Event = Event()
+
+    def fail() -> str:
+        started.set()
+        release.wait(5)
+        raise ValueError("not found")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", fail)
+        assert started.wait(5)
+        follower = pool.submit(flight.do, "key", fail)
+        sleep(0.05)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result(5)
+    assert flight.do("key", lambda: "again") == "again"    # 끝난 작업은 다시 실행할 수 있음
+
+
+def test_single_flight_keys_are_independent() -> None:
+    flight: SingleFlight = SingleFlight("test")
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+
+
+def test_debouncer() -> None:
+    debouncer: Debouncer = Debouncer(0.2)
+    assert not debouncer.isRecent("a")
+    debouncer.mark("a")
+    assert debouncer.isRecent("a")
+    assert not debouncer.isRecent("b")
+    sleep(0.25)
+    assert not debouncer.isRecent("a")
+    assert debouncer.done == {}     # 오래된 키는 정리됨
+
+
+def test_debouncer_disabled() -> None:
+    debouncer: Debouncer = Debouncer(0)
+    debouncer.mark("a")
+    assert not debouncer.isRecent("a")
+
+
+class TestCachedBarcodeCrawler:
+    @pytest.fixture
+    def backend(self, tmp_path) -> SqliteCacheBackend:
+        backend: SqliteCacheBackend = SqliteCacheBackend(os.path.join(tmp_path, "cache.sqlite3"))
+        yield backend
+        backend.close()
+
+    def makeCrawler(self, backend: SqliteCacheBackend, **kwargs) -> CachedBarcodeCrawler:
+        self.searched: list[str] = []
+
+        def fn(_, barcode: str) -> LookupResult:
+            self.searched.append(barcode)
+            if barcode.startswith("0000"):
+                raise ValueError("검색 결과 없음")
+            return LookupResult(Material.CAN, "20220001234567", "알루미늄")
+
+        return CachedBarcodeCrawler(fn, backend, **kwargs)
+
+    def test_result_is_cached_and_written(self, backend: SqliteCacheBackend) -> None:
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend)
+        assert crawler("8801117784003") == Material.CAN
+        assert crawler("8801117784003") == Material.CAN
+        assert self.searched == ["8801117784003"]
+        assert backend.get("8801117784003").rawMaterial == "알루미늄"     # 재분류를 위해 원본 표기도 저장
+
+    def test_not_found_is_cached(self, backend: SqliteCacheBackend) -> None:
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend)
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                crawler("0000000000000")
+        assert self.searched == ["0000000000000"]
+        assert crawler.get("0000000000000") is None
+        assert crawler.lookup("0000000000000") == backend.get("0000000000000")
+
+    def test_expired_entries_are_crawled_again(self, backend: SqliteCacheBackend) -> None:
+        backend.put("8801117784003", CacheEntry(Material.PAPER, time() - 100))
+        backend.put("0000000000000", CacheEntry(None, time() - 100))
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend, positiveTtl=50, negativeTtl=50)
+        assert crawler("8801117784003") == Material.CAN
+        with pytest.raises(ValueError):
+            crawler("0000000000000")
+        assert self.searched == ["8801117784003", "0000000000000"]
+
+    def test_zero_positive_ttl_never_expires(self, backend: SqliteCacheBackend) -> None:
+        backend.put("8801117784003", CacheEntry(Material.PAPER, 0.0))
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend, positiveTtl=0)
+        assert crawler("8801117784003") == Material.PAPER
+        assert self.searched == []
+
+    def test_zero_negative_ttl_never_expires(self, backend: SqliteCacheBackend) -> None:
+        backend.put("0000000000000", CacheEntry(None, 0.0))
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend, negativeTtl=0)
+        with pytest.raises(ValueError):
+            crawler("0000000000000")
+        assert self.searched == []
+
+    def test_disabled_negative_cache_does_not_store_not_found(self, backend: SqliteCacheBackend) -> None:
+        backend.put("0036000291452", CacheEntry(None, time()))     # 설정을 바꾸기 전에 저장된 결과
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend, negative=False)
+        with pytest.raises(ValueError):
+            crawler("0000000000000")
+        assert backend.get("0000000000000") is None
+        assert crawler("0036000291452") == Material.CAN
+        assert self.searched == ["0000000000000", "0036000291452"]
+
+    def test_memory_is_bounded_lru(self, backend: SqliteCacheBackend) -> None:
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend, maxEntries=2)
+        first, second, third = "8801117784003", "0036000291452", "4006381333931"
+        for barcode in (first, second, first, third):
+            crawler(barcode)
+        assert list(crawler.cache) == [first, third]    # 가장 오래 안 쓴 second가 빠짐
+        assert crawler(second) == Material.CAN          # 저장소에는 남아 있어 다시 크롤링하지 않음
+        assert self.searched == [first, second, third]
+
+    def test_invalid_barcode_is_neither_crawled_nor_cached(self, backend: SqliteCacheBackend) -> None:
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend)
+        with pytest.raises(ValueError):
+            crawler("8801117784009")
+        assert self.searched == []
+        assert len(backend) == 0
+
+    def test_searches_scanned_code_and_caches_by_key(self, backend: SqliteCacheBackend) -> None:
+        crawler: CachedBarcodeCrawler = self.makeCrawler(backend)
+        assert crawler("96385074") == Material.CAN
+        assert crawler("036000291452") == Material.CAN
+        assert self.searched == ["96385074", "036000291452"]    # 자리수를 채우지 않고 검색
+        assert set(crawler.cache) == {"0000096385074", "0036000291452"}
+        assert crawler("0036000291452") == Material.CAN         # 같은 상품의 EAN-13 표기는 캐시에서
+        assert len(self.searched) == 2
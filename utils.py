@@ -1,14 +1,30 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import date
-import json
-from typing import Any, Callable, Final, TYPE_CHECKING
+from threading import Lock
+from time import monotonic, perf_counter, sleep, time
+from typing import Any, Callable, Final, Hashable, Iterable, Iterator, TypeVar, TYPE_CHECKING
 
+from config import (
+    CACHE_BACKEND, CACHE_INDEX_PATH, CACHE_MAX_ENTRIES, CACHE_NEGATIVE, CACHE_NEGATIVE_TTL, CACHE_PATH, CACHE_POSITIVE_TTL, CACHE_SERVER, CACHE_SERVER_POOL,
+    CACHE_SERVER_TIMEOUT, LEGACY_CACHE_PATH
+)
+from metrics import metrics
+from models.barcode import normalizeBarcode
 from models.material import Material
+from storage.backend import CacheBackend, CacheEntry
+from storage.compact_index import CompactIndex
+from storage.json_backend import JsonCacheBackend
+from storage.remote_backend import RemoteCacheBackend
+from storage.sqlite_backend import SqliteCacheBackend
 
 if TYPE_CHECKING:
     from models.response import BarcodeResponse, ProductResponse
-    from models.product import Product
+    from models.product import LookupResult, Product
     
-BarcodeCrawlerFuncT = Callable[[Any, str], Material]
+BarcodeCrawlerFuncT = Callable[[Any, str], "LookupResult"]
+T = TypeVar("T")
 
 
 def parse_date(date_str: str) -> date | None:
@@ -27,57 +43,415 @@ def parse_date(date_str: str) -> date | None:
 
 
 
+class StartupTimer:
+    """
+    시작 과정의 단계별 소요 시간을 기록합니다.
+    보고서를 출력한 뒤에 끝난 단계(첫 조회 때 지연 초기화되는 브라우저 등)는 끝나는 즉시 한 줄씩 출력합니다.
+    """
+    def __init__(self) -> None:
+        self.started: float = perf_counter()
+        self.sections: list[tuple[str, float]] = []
+        self.reported: bool = False
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """
+        with 문 블록의 소요 시간을 name 단계로 기록합니다.
+        """
+        started: float = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed: float = perf_counter() - started
+            self.sections.append((name, elapsed))
+            if self.reported:
+                print(f"[startup] {name}: {elapsed * 1000:.1f}ms (지연 초기화)")
+
+    def report(self) -> None:
+        """
+        지금까지 기록한 단계별 소요 시간과 전체 시작 시간을 출력합니다.
+        """
+        print(f"[startup] 시작까지 총 {(perf_counter() - self.started) * 1000:.1f}ms")
+        for name, elapsed in self.sections:
+            print(f"[startup]   {name}: {elapsed * 1000:.1f}ms")
+        self.reported = True
+
+
+startupTimer: StartupTimer = StartupTimer()
+
+
+class RateLimiter:
+    """
+    초당 호출 횟수를 제한하는 토큰 버킷. 여러 스레드에서 함께 사용할 수 있습니다.
+    """
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate: float = rate     # 초당 허용 횟수. 0 이하이면 제한하지 않음
+        self.burst: int = burst     # 한 번에 몰아서 허용할 수 있는 최대 횟수
+        self.tokens: float = float(burst)
+        self.last: float = monotonic()
+        self.lock: Lock = Lock()
+
+    def acquire(self) -> None:
+        """
+        호출이 허용될 때까지 대기합니다.
+        """
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now: float = monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait: float = (1 - self.tokens) / self.rate
+            sleep(wait)
+
+
+class Debouncer:
+    """
+    같은 키의 작업을 일정 시간 안에 다시 하지 않도록 거릅니다. 시간은 작업이 성공했다고 알린 때부터 잽니다.
+    """
+    def __init__(self, window: float) -> None:
+        self.window: float = window     # 다시 하지 않는 시간(초). 0 이하이면 거르지 않음
+        self.done: dict[Hashable, float] = {}
+        self.lock: Lock = Lock()
+
+    def isRecent(self, key: Hashable) -> bool:
+        """키의 작업이 window 안에 성공했는지 확인합니다.
+
+        Args:
+            key (Hashable): 작업을 구분하는 키.
+
+        Returns:
+            bool: 거를 작업이면 True.
+        """
+        if self.window <= 0:
+            return False
+        now: float = monotonic()
+        with self.lock:
+            for stale in [k for k, at in self.done.items() if now - at >= self.window]:
+                del self.done[stale]    # 오래된 키는 정리해, 바코드 수만큼 쌓이지 않게 함.
+            return key in self.done
+
+    def mark(self, key: Hashable) -> None:
+        """
+        키의 작업이 성공했다고 기록합니다.
+        """
+        if self.window > 0:
+            with self.lock:
+                self.done[key] = monotonic()
+
+
+class SingleFlight:
+    """
+    같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고, 실행 중인 작업의 결과(또는 예외)를 함께 받습니다.
+    """
+    def __init__(self, name: str) -> None:
+        self.name: str = name   # 합쳐진 호출 수를 세는 지표의 라벨
+        self.calls: dict[str, Future] = {}
+        self.lock: Lock = Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """키에 해당하는 작업을 한 번만 실행합니다.
+
+        Args:
+            key (str): 작업을 구분하는 키.
+            fn (Callable[[], T]): 실행할 작업.
+
+        Returns:
+            T: 작업 결과. 작업이 예외를 던지면 기다리던 모든 호출에서 같은 예외가 발생합니다.
+        """
+        with self.lock:
+            future: Future | None = self.calls.get(key)
+            leader: bool = future is None
+            if future is None:
+                future = self.calls[key] = Future()
+        if not leader:
+            metrics.inc("coalesced", stage=self.name)
+            return future.result()
+        try:
+            result: T = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+        future.set_result(result)
+        return result
+
+
+def createCacheBackend(kind: str = CACHE_BACKEND, path: str = CACHE_PATH) -> CacheBackend:
+    """설정에 맞는 캐시 저장소를 만듭니다. 저장소는 처음 사용할 때 열립니다.
+
+    Args:
+        kind (str, optional): 저장소 종류. "sqlite", "json" 또는 "remote" 입니다.
+            "remote" 는 캐시 서버와 함께, path 위치의 sqlite 저장소를 이 기기의 저장소로 사용합니다.
+        path (str, optional): 저장소 파일 경로.
+
+    Raises:
+        ValueError: 알 수 없는 저장소 종류인 경우.
+
+    Returns:
+        CacheBackend: 캐시 저장소 객체.
+    """
+    match kind:
+        case "sqlite":
+            return SqliteCacheBackend(path, LEGACY_CACHE_PATH)
+        case "json":
+            return JsonCacheBackend(path)
+        case "remote":
+            return RemoteCacheBackend(
+                CACHE_SERVER, SqliteCacheBackend(path, LEGACY_CACHE_PATH), CACHE_SERVER_POOL, CACHE_SERVER_TIMEOUT
+            )
+    raise ValueError(f"알 수 없는 캐시 저장소 종류입니다: {kind}")
+
+
 class CachedBarcodeCrawler:
-    def __init__(self, fn: BarcodeCrawlerFuncT, path: str = "./crawl_cache.json") -> None:
-        self.path: str = path
+    def __init__(
+            self,
+            fn: BarcodeCrawlerFuncT,
+            backend: CacheBackend,
+            positiveTtl: int = CACHE_POSITIVE_TTL,
+            negativeTtl: int = CACHE_NEGATIVE_TTL,
+            maxEntries: int = CACHE_MAX_ENTRIES,
+            index: CompactIndex | None = None,
+            negative: bool = CACHE_NEGATIVE
+    ) -> None:
         self.crawlerobj = None
         self.fn: BarcodeCrawlerFuncT = fn
-        self.cache: dict[str, Material] = self.loadCache()
-        self.openFn = open  # NameError: name 'open' is not defined / 올바른 타입힌트 모르겠어서 우선 패스.
+        self.backend: CacheBackend = backend
+        self.positiveTtl: int = positiveTtl
+        self.negativeTtl: int = negativeTtl
+        self.negative: bool = negative      # 조회 불가 결과를 저장할지 여부
+        self.maxEntries: int = maxEntries
+        self.index: CompactIndex | None = index     # 저장소에 없을 때 확인할 읽기 전용 제품 목록 색인
+        self.cache: OrderedDict[str, CacheEntry] = OrderedDict()   # 최근에 조회한 항목만 LRU 순서로 메모리에 보관.
+        self.lock: Lock = Lock()
+        self.flight: SingleFlight = SingleFlight("search")   # 같은 바코드를 동시에 조회하면 크롤링은 한 번만 함.
 
-    def loadCache(self) -> dict[str, Material]:
-        """캐시 내용을 파일에서 다시 불러옵니다.
+    def __get__(self, owner, owner_cls):
+        if owner is not None:
+            self.crawlerobj = owner
+        return self
+
+    def open(self) -> None:
+        """
+        캐시 저장소를 미리 엽니다.
+        """
+        with startupTimer.section("cache open"):
+            self.backend.open()
+        if self.index is not None:
+            with startupTimer.section("index open"):
+                self.index.open()
+
+    def fromIndex(self, barcode: str) -> CacheEntry | None:
+        """색인에서 재질을 찾아 메모리 캐시에 넣습니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+
+        Returns:
+            CacheEntry | None: 조회 결과. 색인을 사용하지 않거나 색인에 없으면 None.
+        """
+        if self.index is None:
+            return None
+        mat: Material | None = self.index.get(barcode)
+        if mat is None:
+            return None
+        entry: CacheEntry = CacheEntry(mat, time())   # 색인은 따로 다시 만들어 갱신하므로, 꺼낸 시각부터 유효 기간을 셈.
+        self.remember(barcode, entry)
+        return entry
+
+    def isExpired(self, entry: CacheEntry) -> bool:
+        """조회 결과의 유효 기간이 지났는지 확인합니다.
+
+        Args:
+            entry (CacheEntry): 확인할 조회 결과.
+
+        Returns:
+            bool: 유효 기간이 지났으면 True. 조회 불가 결과를 저장하지 않도록 설정했으면, 이전에 저장된 조회 불가 결과도 True.
+        """
+        if entry.material is None and not self.negative:
+            return True
+        ttl: int = self.positiveTtl if entry.material is not None else self.negativeTtl
+        return ttl > 0 and time() - entry.updatedAt > ttl
+
+    def remember(self, barcode: str, entry: CacheEntry) -> None:
+        """조회 결과를 메모리 캐시에 넣고, 최대 항목 수를 넘으면 가장 오래 안 쓴 항목을 뺍니다.
 
         Args:
-            path (str): 파일의 경로.
+            barcode (str): 바코드 번호 값.
+            entry (CacheEntry): 조회 결과.
+        """
+        with self.lock:
+            self.cache[barcode] = entry
+            self.cache.move_to_end(barcode)
+            while len(self.cache) > self.maxEntries:
+                self.cache.popitem(last=False)
+
+    def lookup(self, barcode: str) -> CacheEntry | None:
+        """캐시에 저장된 유효한 조회 결과를 가져옵니다. 크롤링은 하지 않습니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
 
         Returns:
-            dict[str, Material]: 캐시 파일의 json 내용을 불러온 딕셔너리 객체.
+            CacheEntry | None: 조회 결과. 없거나 유효 기간이 지났으면 None.
         """
+        with metrics.span("cache_lookup"):
+            with self.lock:
+                entry: CacheEntry | None = self.cache.get(barcode)
+                if entry is not None:
+                    self.cache.move_to_end(barcode)
+            tier: str = "memory"
+            if entry is None:
+                tier = "backend"
+                entry = self.backend.get(barcode)
+                if entry is None:
+                    tier = "index"
+                    entry = self.fromIndex(barcode)
+                    if entry is None:
+                        metrics.inc("cache_lookups", result="miss")
+                        return None
+                else:
+                    self.remember(barcode, entry)
+            if self.isExpired(entry):
+                metrics.inc("cache_lookups", result="expired")
+                return None
+            metrics.inc("cache_lookups", result=tier)
+            return entry
+
+    def lookupMany(self, barcodes: Iterable[str]) -> dict[str, CacheEntry]:
+        """여러 바코드의 유효한 조회 결과를 한꺼번에 가져옵니다. 메모리에 없는 바코드는 저장소에 한 번에 요청합니다.
+
+        Args:
+            barcodes (Iterable[str]): 바코드 번호 값 목록.
+
+        Returns:
+            dict[str, CacheEntry]: 바코드 -> 조회 결과. 없거나 유효 기간이 지난 바코드는 빠집니다.
+        """
+        found: dict[str, CacheEntry] = {}
+        missing: list[str] = []
+        with self.lock:
+            for barcode in barcodes:
+                entry: CacheEntry | None = self.cache.get(barcode)
+                if entry is None:
+                    missing.append(barcode)
+                else:
+                    found[barcode] = entry
+        metrics.inc("cache_lookups", len(found), result="memory")
+        if missing:
+            fetched: dict[str, CacheEntry] = self.backend.getMany(missing)
+            metrics.inc("cache_lookups", len(fetched), result="backend")
+            for barcode, entry in fetched.items():
+                self.remember(barcode, entry)
+            found.update(fetched)
+            indexed: int = 0
+            for barcode in missing:
+                if barcode not in fetched and (entry := self.fromIndex(barcode)) is not None:
+                    found[barcode] = entry
+                    indexed += 1
+            metrics.inc("cache_lookups", indexed, result="index")
+            metrics.inc("cache_lookups", len(missing) - len(fetched) - indexed, result="miss")
+        valid: dict[str, CacheEntry] = {barcode: entry for barcode, entry in found.items() if not self.isExpired(entry)}
+        metrics.inc("cache_lookups", len(found) - len(valid), result="expired")
+        return valid
+
+    def get(self, barcode: str) -> Material | None:
+        """캐시에 저장된 재질 정보만 조회합니다. 크롤링은 하지 않습니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+
+        Returns:
+            Material | None: 캐시된 재질. 없거나, 조회 불가한 제품으로 저장되어 있으면 None.
+        """
+        entry: CacheEntry | None = self.lookup(barcode)
+        return None if entry is None else entry.material
+
+    def put(self, barcode: str, result: "LookupResult | None") -> None:
+        """다른 경로로 얻은 조회 결과를 캐시에 저장합니다.
+
+        Args:
+            barcode (str): 바코드 번호 값.
+            result (LookupResult | None): 저장할 조회 결과. 조회 불가한 제품이면 None.
+        """
+        if result is None and not self.negative:
+            return  # 조회 불가 결과는 저장하지 않도록 설정됨.
+        entry: CacheEntry = CacheEntry(None, time()) if result is None else CacheEntry(
+            result.material, time(), result.prdlst_report_no, result.frmlc_mtrqlt
+        )
+        self.remember(barcode, entry)
+        self.backend.put(barcode, entry)     # 항목마다 바로 기록해, 비정상 종료 시에도 조회 결과를 잃지 않음.
+
+    def fetch(self, barcode: str, code: str | None = None) -> Material:
+        """캐시를 거치지 않고 조회한 뒤 결과를 저장합니다.
+
+        Args:
+            barcode (str): 바코드 번호 값. 캐시 키로 사용합니다.
+            code (str | None, optional): 검색할 바코드. 스캐너가 읽은 그대로의 값이며, 없으면 barcode로 검색합니다.
+
+        Raises:
+            ValueError: 조회 불가한 제품인 경우.
+
+        Returns:
+            Material: 제품의 재질.
+        """
+        with self.lock:     # 앞서 같은 바코드를 조회한 작업이 방금 끝났을 수 있음.
+            entry: CacheEntry | None = self.cache.get(barcode)
+        if entry is not None and entry.material is not None and not self.isExpired(entry):
+            return entry.material
         try:
-            with open(self.path, mode="rt", encoding="utf-8") as f:
-                read: dict[str, int] = json.load(f)
-                return {key: Material(value) for key, value in read.items()}
-        except FileNotFoundError:
-            return {}
+            res: LookupResult = self.fn(self.crawlerobj, code or barcode)   # patch self.
+        except ValueError:
+            metrics.inc("not_found", source="lookup")
+            self.put(barcode, None)     # 조회 불가한 제품도 저장해, 유효 기간 동안은 다시 크롤링하지 않음.
+            raise
+        self.put(barcode, res)
+        return res.material
 
-    def saveCache(self):
-        """캐시 내용을 파일에 저장합니다.
+    def crawl(self, barcode: str, code: str | None = None) -> Material:
+        """캐시를 확인하지 않고 조회합니다. 같은 바코드를 이미 조회 중이면 그 결과를 함께 받습니다.
 
         Args:
-            path (str): 파일의 경로.
-            cache (dict[str, Material]): 캐시 파일의 json 내용을 불러온 딕셔너리 객체.
+            barcode (str): 바코드 번호 값. 캐시 키로 사용합니다.
+            code (str | None, optional): 검색할 바코드. 스캐너가 읽은 그대로의 값이며, 없으면 barcode로 검색합니다.
+
+        Raises:
+            ValueError: 조회 불가한 제품인 경우.
+
+        Returns:
+            Material: 제품의 재질.
         """
-        with self.openFn(self.path, mode="wt", encoding="utf-8") as f:
-            json.dump(self.cache, f, ensure_ascii=False, indent=2)
-    
-    def __get__(self, owner, owner_cls):
-        self.crawlerobj = owner
-    
+        return self.flight.do(barcode, lambda: self.fetch(barcode, code))
+
     def __call__(self, barcode: str) -> Material:
-        res: Material | None = self.cache.get(barcode)
-        if res is None:
-            res = self.cache[barcode] = self.fn(self.crawlerobj, barcode)   # patch self.
-        return res
+        key: str | None = normalizeBarcode(barcode)
+        if key is None:
+            metrics.inc("not_found", source="invalid")
+            raise ValueError("올바른 GTIN 바코드가 아닙니다.")   # 캐시에 저장하지 않고 크롤링도 하지 않음.
+        # 자리수를 채운 키는 캐시에만 쓰고, 검색은 읽은 그대로 함. (유통상품지식뱅크는 0을 채운 EAN-8, UPC-A를 찾지 못함)
+        entry: CacheEntry | None = self.lookup(key)
+        if entry is None:
+            return self.crawl(key, barcode.strip())
+        if entry.material is None:
+            metrics.inc("not_found", source="cache")
+            raise ValueError("조회 불가한 제품으로 저장된 바코드입니다.")
+        return entry.material
     
     def __del__(self):
-        self.saveCache()
+        self.backend.close()
 
-def cacheIt(path: str = "./crawl_cache.json") -> Callable[[BarcodeCrawlerFuncT], BarcodeCrawlerFuncT]:
+def cacheIt(path: str = CACHE_PATH, backend: str = CACHE_BACKEND) -> Callable[[BarcodeCrawlerFuncT], BarcodeCrawlerFuncT]:
     """바코드로 제품 재질을 가져오는 함수에 사용하는 데코레이터로, 인자 값에 따른 캐싱을 제공합니다.
+    원형 함수는 LookupResult를 반환하고, 데코레이팅 된 함수는 그 중 재질(Material)만 반환합니다.
 
     Args:
-        path (str, optional): 캐시 내용을 저장할 파일 경로입니다. 기본 값은 "./crawl_cache.json" 입니다.
+        path (str, optional): 캐시 내용을 저장할 파일 경로입니다. 기본 값은 설정의 CACHE_PATH 입니다.
+        backend (str, optional): 캐시 저장소 종류입니다. 기본 값은 설정의 CACHE_BACKEND 입니다.
 
     Returns:
         Callable[[BarcodeCrawlerFuncT], BarcodeCrawlerFuncT]: 바코드로 제품 재질을 가져오는 함수의 데코레이터입니다.
@@ -91,5 +465,7 @@ def cacheIt(path: str = "./crawl_cache.json") -> Callable[[BarcodeCrawlerFuncT],
         Returns:
             BarcodeCrawlerFuncT: 데코레이팅 된 함수입니다.
         """
-        return CachedBarcodeCrawler(fn)
+        return CachedBarcodeCrawler(
+            fn, createCacheBackend(backend, path), index=CompactIndex(CACHE_INDEX_PATH) if CACHE_INDEX_PATH else None
+        )
     return deco
\ No newline at end of file